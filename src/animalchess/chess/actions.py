@@ -0,0 +1,154 @@
+
+from typing import Literal, Iterable
+
+import numpy as np
+import numpy.typing as npt
+
+from .utils import AnimalType, SquareType, AnimalChessBoardMap
+from .utils import BOARD_HEIGHT, BOARD_WIDTH
+from .pieces import river_jumping_movement_set
+
+
+# An action is an animal moving in one of the four directions; for the lion and
+# the tiger, moving towards the river means jumping over it. Action IDs are
+#     (animal_type.value - 1) * NUM_DIRECTIONS + direction
+# and squares are flattened as row * BOARD_WIDTH + col.
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+NUM_DIRECTIONS = len(DIRECTIONS)
+NUM_ANIMAL_TYPES = len(AnimalType)
+NUM_ACTIONS = NUM_ANIMAL_TYPES * NUM_DIRECTIONS
+NUM_SQUARES = BOARD_HEIGHT * BOARD_WIDTH
+NO_SQUARE = -1
+EMPTY_SQUARE = NUM_SQUARES      # padding index of a square that is always empty
+
+SWIMMING_ANIMALS = {AnimalType.RAT}
+JUMPING_ANIMALS = {AnimalType.TIGER, AnimalType.LION}
+
+
+def square_index(position: tuple[int, int]) -> int:
+    return position[0] * BOARD_WIDTH + position[1]
+
+
+def index_square(index: int) -> tuple[int, int]:
+    return divmod(int(index), BOARD_WIDTH)
+
+
+def _build_tables() -> tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+    destinations = np.full((NUM_ANIMAL_TYPES, NUM_SQUARES, NUM_DIRECTIONS), NO_SQUARE, dtype=np.int64)
+    jumps = np.zeros((NUM_ANIMAL_TYPES, NUM_SQUARES, NUM_DIRECTIONS), dtype=bool)
+    jump_paths = np.full((NUM_SQUARES, NUM_DIRECTIONS, max(BOARD_HEIGHT, BOARD_WIDTH)), EMPTY_SQUARE, dtype=np.int64)
+
+    jumping_destinations = {}
+    for (i, j), (new_i, new_j) in river_jumping_movement_set:
+        direction = DIRECTIONS.index((np.sign(new_i - i), np.sign(new_j - j)))
+        jumping_destinations[(i, j), direction] = (new_i, new_j)
+        path = [
+            (i + k * DIRECTIONS[direction][0], j + k * DIRECTIONS[direction][1])
+            for k in range(1, max(abs(new_i - i), abs(new_j - j)))
+        ]
+        jump_paths[square_index((i, j)), direction, :len(path)] = [square_index(position) for position in path]
+
+    for animal_type in AnimalType:
+        for i in range(BOARD_HEIGHT):
+            for j in range(BOARD_WIDTH):
+                for direction, (di, dj) in enumerate(DIRECTIONS):
+                    if animal_type in JUMPING_ANIMALS and ((i, j), direction) in jumping_destinations:
+                        destination = jumping_destinations[(i, j), direction]
+                        jumps[animal_type.value-1, square_index((i, j)), direction] = True
+                    elif 0 <= i + di < BOARD_HEIGHT and 0 <= j + dj < BOARD_WIDTH:
+                        destination = (i + di, j + dj)
+                    else:
+                        continue
+                    destinations[animal_type.value-1, square_index((i, j)), direction] = square_index(destination)
+    return destinations, jumps, jump_paths
+
+
+ACTION_DESTINATIONS, ACTION_JUMPS, JUMP_PATHS = _build_tables()
+_terrain = np.append(AnimalChessBoardMap()._board.ravel(), SquareType.LAND.value)
+_ranks = np.array([animal_type.value for animal_type in AnimalType])
+_can_swim = np.array([animal_type in SWIMMING_ANIMALS for animal_type in AnimalType])
+_animal_indices = np.arange(NUM_ANIMAL_TYPES)
+_trap_values = [SquareType.TRAP0.value, SquareType.TRAP1.value]
+_cave_values = [SquareType.CAVE0.value, SquareType.CAVE1.value]
+
+
+def square_terrain(square: int) -> int:     # the SquareType value of a square index, LAND for EMPTY_SQUARE
+    return int(_terrain[square])
+
+
+def encode_action(animal_type: AnimalType, direction: int) -> int:
+    return (animal_type.value - 1) * NUM_DIRECTIONS + direction
+
+
+def decode_action(action_id: int) -> tuple[AnimalType, int]:
+    animal_index, direction = divmod(int(action_id), NUM_DIRECTIONS)
+    return AnimalType(animal_index + 1), direction
+
+
+def action_destinations(action_ids: npt.ArrayLike, origins: npt.NDArray) -> npt.NDArray:
+    # destination squares of the actions, given the squares of the player's animals
+    # in the order of AnimalType (NO_SQUARE for the dead ones); with origins of shape
+    # (N, NUM_ANIMAL_TYPES), action_ids holds one action per row
+    animal_indices, directions = np.divmod(np.asarray(action_ids), NUM_DIRECTIONS)
+    if origins.ndim == 1:
+        origin_squares = origins[animal_indices]
+    else:
+        origin_squares = np.take_along_axis(origins, animal_indices[..., None], -1)[..., 0]
+    destinations = ACTION_DESTINATIONS[animal_indices, np.maximum(origin_squares, 0), directions]
+    return np.where(origin_squares == NO_SQUARE, NO_SQUARE, destinations)
+
+
+def possession_origins(possession) -> npt.NDArray:
+    origins = np.full(NUM_ANIMAL_TYPES, NO_SQUARE, dtype=np.int64)
+    for piece_info in possession.iterate_living_pieces():
+        origins[piece_info.piece.animal_type.value-1] = square_index(piece_info.position)
+    return origins
+
+
+def compute_legal_move_mask(players_possessions: Iterable, player_id: Literal[0, 1]) -> npt.NDArray:
+    owners = np.full(NUM_SQUARES + 1, -1, dtype=np.int64)
+    ranks = np.zeros(NUM_SQUARES + 1, dtype=np.int64)
+    origins = None
+    for possession_id, possession in enumerate(players_possessions):
+        piece_squares = possession_origins(possession)
+        alive = piece_squares != NO_SQUARE
+        owners[piece_squares[alive]] = possession_id
+        ranks[piece_squares[alive]] = _ranks[alive]
+        if possession_id == player_id:
+            origins = piece_squares
+
+    alive = origins != NO_SQUARE
+    origin_squares = np.where(alive, origins, EMPTY_SQUARE)
+    origin_terrain = _terrain[origin_squares]
+    livable_origin = alive & ((origin_terrain != SquareType.WATER.value) | _can_swim) & ~np.isin(origin_terrain, _cave_values)
+
+    table_squares = np.minimum(origin_squares, NUM_SQUARES - 1)[:, None]
+    destinations = ACTION_DESTINATIONS[_animal_indices[:, None], table_squares, np.arange(NUM_DIRECTIONS)]
+    valid = livable_origin[:, None] & (destinations != NO_SQUARE)
+    destinations = np.where(valid, destinations, EMPTY_SQUARE)
+    terrain = _terrain[destinations]
+
+    # terrain: only the rat swims, and no one enters its own cave
+    valid &= (terrain != SquareType.WATER.value) | _can_swim[:, None]
+    valid &= terrain != _cave_values[player_id]
+
+    # river jumps are blocked by any piece in the water
+    jumps = ACTION_JUMPS[_animal_indices[:, None], table_squares, np.arange(NUM_DIRECTIONS)]
+    paths = JUMP_PATHS[table_squares[:, 0]]
+    valid &= ~jumps | np.all(owners[paths] == -1, axis=-1)
+
+    # occupied destinations: never one's own piece; enemies in one's own trap can always
+    # be eaten, enemies in the other trap never, and elsewhere by the food chain
+    destination_owners = owners[destinations]
+    valid &= destination_owners != player_id
+    attacker_ranks = _ranks[:, None]
+    defender_ranks = ranks[destinations]
+    can_eat = (attacker_ranks >= defender_ranks) & ~((attacker_ranks == AnimalType.ELEPHANT.value) & (defender_ranks == AnimalType.RAT.value))
+    can_eat |= (attacker_ranks == AnimalType.RAT.value) & (defender_ranks == AnimalType.ELEPHANT.value)
+    capture_allowed = np.where(
+        terrain == _trap_values[player_id],
+        True,
+        can_eat & (terrain != _trap_values[1 - player_id])
+    )
+    valid &= (destination_owners == -1) | capture_allowed
+    return valid
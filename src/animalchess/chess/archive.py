@@ -0,0 +1,226 @@
+
+from typing import Optional, Literal, Iterable, Generator, BinaryIO, Self
+from dataclasses import dataclass
+from os import PathLike
+import struct
+
+import numpy as np
+import numpy.typing as npt
+
+from .utils import AnimalType
+from .player import Player
+from .board import AnimalChessBoard
+from .actions import NUM_ACTIONS
+
+
+# Game archive: each move is stored as its action ID (see AnimalChessBoard.move_to_action),
+# which is relative to the position it is played in, in BITS_PER_MOVE bits. Games start
+# from the initial layout. The file holds
+#     MAGIC
+#     blocks of up to games_per_block games, each:
+#         number of games (uint32), the number of moves of each game (uint16), the
+#         winner of each game (int8, -1 for none), the bit-packed moves of all the games
+#     the offset of each block (uint64)
+#     footer: offset of the block offsets, number of games, games per block, MAGIC
+# so that game N is found by reading the block N // games_per_block only.
+
+Move = tuple[AnimalType, tuple[int, int]]
+
+MAGIC = b"ACGA"
+BITS_PER_MOVE = int(NUM_ACTIONS - 1).bit_length()
+MAX_MOVES_PER_GAME = np.iinfo(np.uint16).max
+NO_WINNER = -1
+
+_block_header_struct = struct.Struct("<I")
+_footer_struct = struct.Struct("<QQI4s")
+
+
+def encode_moves(moves: Iterable[Move], player0: Player, player1: Player) -> npt.NDArray[np.uint8]:
+    # the action IDs of the moves, replayed from the initial layout
+    board = AnimalChessBoard(player0, player1)
+    actions = []
+    for animal, destination in moves:
+        player_id = board.current_player_id
+        actions.append(board.move_to_action(animal, destination, player_id))
+        if not board.move_piece(player_id, animal, destination):
+            raise ValueError(f"Illegal move of {animal.name} to {destination} at ply {len(actions)}.")
+    return np.array(actions, dtype=np.uint8)
+
+
+def decode_moves(actions: npt.ArrayLike, player0: Player, player1: Player) -> list[Move]:
+    board = AnimalChessBoard(player0, player1)
+    moves = []
+    for action_id in np.asarray(actions).tolist():
+        player_id = board.current_player_id
+        animal, destination = board.action_to_move(action_id, player_id)
+        if destination is None or not board.move_piece(player_id, animal, destination):
+            raise ValueError(f"Illegal action {action_id} at ply {len(moves) + 1}.")
+        moves.append((animal, destination))
+    return moves
+
+
+def pack_actions(actions: npt.ArrayLike) -> bytes:
+    actions = np.asarray(actions, dtype=np.uint8)
+    if np.any(actions >= NUM_ACTIONS):
+        raise ValueError(f"Action IDs must be less than {NUM_ACTIONS}.")
+    bits = np.unpackbits(actions[:, np.newaxis], axis=1)[:, 8 - BITS_PER_MOVE:]
+    return np.packbits(bits.ravel()).tobytes()
+
+
+def unpack_actions(data: bytes, num_actions: int) -> npt.NDArray[np.uint8]:
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=num_actions * BITS_PER_MOVE)
+    bits = np.pad(bits.reshape(num_actions, BITS_PER_MOVE), ((0, 0), (8 - BITS_PER_MOVE, 0)))
+    return np.packbits(bits, axis=1).ravel()
+
+
+def packed_actions_size(num_actions: int) -> int:
+    return (num_actions * BITS_PER_MOVE + 7) // 8
+
+
+@dataclass
+class ArchivedGame:
+    actions: npt.NDArray[np.uint8]
+    winner: Optional[Literal[0, 1]] = None
+
+    def moves(self, player0: Player, player1: Player) -> list[Move]:
+        return decode_moves(self.actions, player0, player1)
+
+
+def _encode_block(games: list[ArchivedGame]) -> bytes:
+    lengths = np.array([len(game.actions) for game in games], dtype=np.uint16)
+    winners = np.array([NO_WINNER if game.winner is None else game.winner for game in games], dtype=np.int8)
+    actions = np.concatenate([game.actions for game in games]) if len(games) > 0 else np.empty(0, dtype=np.uint8)
+    return (
+        _block_header_struct.pack(len(games))
+        + lengths.astype("<u2").tobytes()
+        + winners.tobytes()
+        + pack_actions(actions)
+    )
+
+
+def _decode_block(data: bytes) -> list[ArchivedGame]:
+    num_games, = _block_header_struct.unpack_from(data)
+    offset = _block_header_struct.size
+    lengths = np.frombuffer(data, dtype="<u2", count=num_games, offset=offset).astype(np.int64)
+    offset += 2 * num_games
+    winners = np.frombuffer(data, dtype=np.int8, count=num_games, offset=offset).tolist()
+    offset += num_games
+    actions = unpack_actions(data[offset:], int(lengths.sum()))
+    return [
+        ArchivedGame(game_actions, None if winner == NO_WINNER else winner)
+        for game_actions, winner in zip(np.split(actions, np.cumsum(lengths)[:-1]), winners)
+    ]
+
+
+class GameArchiveWriter:
+    def __init__(self, path: str | PathLike, games_per_block: int = 1024):
+        if games_per_block <= 0:
+            raise ValueError("games_per_block must be positive.")
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(MAGIC)
+        self._games_per_block = games_per_block
+        self._pending_games: list[ArchivedGame] = []
+        self._block_offsets: list[int] = []
+        self._num_games = 0
+
+    def add_actions(self, actions: npt.ArrayLike, winner: Optional[Literal[0, 1]] = None) -> None:
+        # checked before queuing, as a failure when the block is written would corrupt the file
+        actions = np.asarray(actions)
+        if actions.ndim != 1 or (len(actions) > 0 and (actions.min() < 0 or actions.max() >= NUM_ACTIONS)):
+            raise ValueError(f"Action IDs must be between 0 and {NUM_ACTIONS - 1}.")
+        if len(actions) > MAX_MOVES_PER_GAME:
+            raise ValueError(f"A game has at most {MAX_MOVES_PER_GAME} moves.")
+        if winner not in (None, 0, 1):
+            raise ValueError("The winner must be 0, 1 or None.")
+        actions = actions.astype(np.uint8)
+        self._pending_games.append(ArchivedGame(actions, winner))
+        self._num_games += 1
+        if len(self._pending_games) >= self._games_per_block:
+            self._flush_block()
+
+    def add_game(
+            self,
+            moves: Iterable[Move],
+            player0: Player,
+            player1: Player,
+            winner: Optional[Literal[0, 1]] = None
+    ) -> None:
+        self.add_actions(encode_moves(moves, player0, player1), winner)
+
+    def _flush_block(self) -> None:
+        if len(self._pending_games) == 0:
+            return
+        self._block_offsets.append(self._file.tell())
+        self._file.write(_encode_block(self._pending_games))
+        self._pending_games = []
+
+    def __len__(self) -> int:
+        return self._num_games
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._flush_block()
+        index_offset = self._file.tell()
+        self._file.write(np.array(self._block_offsets, dtype="<u8").tobytes())
+        self._file.write(_footer_struct.pack(index_offset, self._num_games, self._games_per_block, MAGIC))
+        self._file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class GameArchiveReader:
+    def __init__(self, path: str | PathLike):
+        self._file: BinaryIO = open(path, "rb")
+        if self._file.read(len(MAGIC)) != MAGIC:
+            self._file.close()
+            raise ValueError(f"Not a game archive: {path}")
+        self._file.seek(-_footer_struct.size, 2)
+        index_offset, self._num_games, self._games_per_block, magic = _footer_struct.unpack(
+            self._file.read(_footer_struct.size)
+        )
+        if magic != MAGIC:
+            self._file.close()
+            raise ValueError(f"Truncated game archive: {path}")
+        num_blocks = (self._num_games + self._games_per_block - 1) // self._games_per_block
+        self._file.seek(index_offset)
+        offsets = np.frombuffer(self._file.read(8 * num_blocks), dtype="<u8").astype(np.int64)
+        self._block_offsets = offsets.tolist() + [index_offset]
+        self._cached_block_index = None
+        self._cached_block = None
+
+    def _read_block(self, block_index: int) -> list[ArchivedGame]:
+        if block_index != self._cached_block_index:
+            start, end = self._block_offsets[block_index], self._block_offsets[block_index + 1]
+            self._file.seek(start)
+            self._cached_block = _decode_block(self._file.read(end - start))
+            self._cached_block_index = block_index
+        return self._cached_block
+
+    def __len__(self) -> int:
+        return self._num_games
+
+    def __getitem__(self, game_index: int) -> ArchivedGame:
+        if game_index < 0:
+            game_index += self._num_games
+        if game_index < 0 or game_index >= self._num_games:
+            raise IndexError(f"Game {game_index} out of range.")
+        block_index, index_in_block = divmod(game_index, self._games_per_block)
+        return self._read_block(block_index)[index_in_block]
+
+    def iterate_games(self) -> Generator[ArchivedGame, None, None]:
+        for block_index in range(len(self._block_offsets) - 1):
+            yield from self._read_block(block_index)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
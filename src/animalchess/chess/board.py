@@ -1,5 +1,5 @@
 
-from typing import Literal, Generator, Optional, Self
+from typing import Literal, Generator, Optional, Self, Sequence
 from dataclasses import dataclass
 from itertools import product
 import warnings
@@ -12,6 +12,90 @@ from .utils import Piece, AnimalType, AnimalChessBoardMap, SquareType
 from .utils import BOARD_HEIGHT, BOARD_WIDTH
 from .player import Player
 from .pieces import RatPiece, CatPiece, DogPiece, LeopardPiece, WolfPiece, TigerPiece, LionPiece, ElephantPiece
+from .pieces import river_jumping_movement_set
+from .features import allocate_planes, fill_planes
+from .actions import compute_legal_move_mask, possession_origins, encode_action, decode_action, action_destinations
+from .actions import square_index, index_square, ACTION_DESTINATIONS, NO_SQUARE, NUM_DIRECTIONS
+from .actions import ACTION_JUMPS, JUMP_PATHS, EMPTY_SQUARE, SWIMMING_ANIMALS
+from .hashing import compute_hash, piece_key, SIDE_TO_MOVE_KEY, WINNED_KEYS
+from .history import PositionHistory, DrawRules
+from .packing import pack_position, unpack_position
+from .shared import SharedBoardState
+
+
+# squares reachable in one move from each square by some animal, i.e., the four
+# neighbors and the river-jumping destinations
+candidate_destinations = {
+    (i, j): [
+        (new_i, new_j)
+        for new_i, new_j in [(i-1, j), (i+1, j), (i, j-1), (i, j+1)]
+        if 0 <= new_i < BOARD_HEIGHT and 0 <= new_j < BOARD_WIDTH
+    ] + sorted(
+        final_position
+        for initial_position, final_position in river_jumping_movement_set
+        if initial_position == (i, j)
+    )
+    for i, j in product(range(BOARD_HEIGHT), range(BOARD_WIDTH))
+}
+
+
+PIECE_CLASSES = {
+    AnimalType.RAT: RatPiece,
+    AnimalType.CAT: CatPiece,
+    AnimalType.DOG: DogPiece,
+    AnimalType.WOLF: WolfPiece,
+    AnimalType.LEOPARD: LeopardPiece,
+    AnimalType.TIGER: TigerPiece,
+    AnimalType.LION: LionPiece,
+    AnimalType.ELEPHANT: ElephantPiece
+}
+
+INITIAL_POSITIONS = [
+    {
+        AnimalType.LION: (0, 0),
+        AnimalType.TIGER: (0, 6),
+        AnimalType.DOG: (1, 1),
+        AnimalType.CAT: (1, 5),
+        AnimalType.RAT: (2, 0),
+        AnimalType.LEOPARD: (2, 2),
+        AnimalType.WOLF: (2, 4),
+        AnimalType.ELEPHANT: (2, 6)
+    },
+    {
+        AnimalType.LION: (8, 6),
+        AnimalType.TIGER: (8, 0),
+        AnimalType.DOG: (7, 5),
+        AnimalType.CAT: (7, 1),
+        AnimalType.RAT: (6, 6),
+        AnimalType.LEOPARD: (6, 4),
+        AnimalType.WOLF: (6, 2),
+        AnimalType.ELEPHANT: (6, 0)
+    }
+]
+
+
+def validate_positions(positions: Sequence[dict[AnimalType, tuple[int, int]]], winned: Sequence[bool]) -> None:
+    # raises ValueError unless every piece stands where it may: on the board, on its own
+    # square, off the water unless it swims, and out of the caves except the enemy
+    # cave of a player who has won; at most one player has won
+    if winned[0] and winned[1]:
+        raise ValueError("Both players cannot have won.")
+    board_map = AnimalChessBoardMap()
+    own_caves = [SquareType.CAVE0, SquareType.CAVE1]
+    occupied = set()
+    for player_id, player_positions in enumerate(positions):
+        for animal_type, position in player_positions.items():
+            square_type = board_map.get_square_type(*position)
+            if position in occupied:
+                raise ValueError(f"More than one piece on {position}.")
+            occupied.add(position)
+            if square_type == own_caves[player_id]:
+                raise ValueError(f"The {animal_type.name} of player {player_id} is in its own cave.")
+            if square_type == own_caves[1 - player_id]:
+                if not winned[player_id]:
+                    raise ValueError(f"The {animal_type.name} of player {player_id} is in the enemy cave without winning.")
+            elif square_type == SquareType.WATER and animal_type not in SWIMMING_ANIMALS:
+                raise ValueError(f"The {animal_type.name} of player {player_id} cannot stand on water at {position}.")
 
 
 @dataclass
@@ -29,50 +113,64 @@ class PlayerPossession:
             self.initialize_pieces(id)
 
     def initialize_pieces(self, id: Literal[0, 1]) -> None:
-        if id == 0:
-            self._pieces = {
-                AnimalType.LION: PieceInformation(LionPiece(self.player), (0, 0)),
-                AnimalType.TIGER: PieceInformation(TigerPiece(self.player), (0, 6)),
-                AnimalType.DOG: PieceInformation(DogPiece(self.player), (1, 1)),
-                AnimalType.CAT: PieceInformation(CatPiece(self.player), (1, 5)),
-                AnimalType.RAT: PieceInformation(RatPiece(self.player), (2, 0)),
-                AnimalType.LEOPARD: PieceInformation(LeopardPiece(self.player), (2, 2)),
-                AnimalType.WOLF: PieceInformation(WolfPiece(self.player), (2, 4)),
-                AnimalType.ELEPHANT: PieceInformation(ElephantPiece(self.player), (2, 6))
-            }
-        elif id == 1:
-            self._pieces = {
-                AnimalType.LION: PieceInformation(LionPiece(self.player), (8, 6)),
-                AnimalType.TIGER: PieceInformation(TigerPiece(self.player), (8, 0)),
-                AnimalType.DOG: PieceInformation(DogPiece(self.player), (7, 5)),
-                AnimalType.CAT: PieceInformation(CatPiece(self.player), (7, 1)),
-                AnimalType.RAT: PieceInformation(RatPiece(self.player), (6, 6)),
-                AnimalType.LEOPARD: PieceInformation(LeopardPiece(self.player), (6, 4)),
-                AnimalType.WOLF: PieceInformation(WolfPiece(self.player), (6, 2)),
-                AnimalType.ELEPHANT: PieceInformation(ElephantPiece(self.player), (6, 0))
-            }
-        else:
+        if id not in (0, 1):
             raise ValueError("Player ID must be 0 or 1!")
+        self._pieces = {}
+        for animal_type, position in INITIAL_POSITIONS[id].items():
+            self.set_piece_info(animal_type, position)
+
+    def reset_pieces(
+            self,
+            id: Literal[0, 1],
+            positions: Optional[dict[AnimalType, tuple[int, int]]] = None,
+            winned: bool = False
+    ) -> None:
+        # in-place version of initialize_pieces, or of setting the given positions with
+        # the other animals dead, reusing the piece objects
+        if id not in (0, 1):
+            raise ValueError("Player ID must be 0 or 1!")
+        animal_types = INITIAL_POSITIONS[id] if positions is None else AnimalType
+        positions = INITIAL_POSITIONS[id] if positions is None else positions
+        previous_pieces = self._pieces
+        self._pieces = {}
+        for animal_type in animal_types:
+            position = positions.get(animal_type)
+            piece_info = previous_pieces.get(animal_type)
+            if piece_info is None:
+                self.set_piece_info(animal_type, position)
+                piece_info = self._pieces[animal_type]
+            else:
+                piece_info.position = position
+                self._pieces[animal_type] = piece_info
+            if position is None:
+                piece_info.piece.die()
+            else:
+                piece_info.piece.revive()
+        self._winned = winned
 
     def set_piece_info(self, animal_type: AnimalType, position: tuple[int, int]):
-        match animal_type:
-            case AnimalType.RAT:
-                piece = RatPiece(self.player)
-            case AnimalType.CAT:
-                piece = CatPiece(self.player)
-            case AnimalType.DOG:
-                piece = DogPiece(self.player)
-            case AnimalType.LEOPARD:
-                piece = LeopardPiece(self.player)
-            case AnimalType.WOLF:
-                piece = WolfPiece(self.player)
-            case AnimalType.TIGER:
-                piece = TigerPiece(self.player)
-            case AnimalType.LION:
-                piece = LionPiece(self.player)
-            case AnimalType.ELEPHANT:
-                piece = ElephantPiece(self.player)
-        self._pieces[animal_type] = PieceInformation(piece, position)
+        self._pieces[animal_type] = PieceInformation(PIECE_CLASSES[animal_type](self.player), position)
+
+    @classmethod
+    def from_positions(
+            cls,
+            player: Player,
+            positions: dict[AnimalType, tuple[int, int]],
+            winned: bool = False
+    ) -> Self:
+        # the possession of the living pieces at the given positions, the other animals
+        # being dead, built without going through set_piece_info
+        possession = cls.__new__(cls)
+        possession._player = player
+        possession._winned = winned
+        possession._pieces = {}
+        for animal_type, piece_class in PIECE_CLASSES.items():
+            piece = piece_class(player)
+            position = positions.get(animal_type)
+            if position is None:
+                piece.die()
+            possession._pieces[animal_type] = PieceInformation(piece, position)
+        return possession
 
     def get_piece(self, animal: AnimalType) -> PieceInformation:
         return self._pieces[animal]
@@ -99,6 +197,8 @@ class PlayerPossession:
         player_possession.winned = self.winned
         for animal_type, piece_info in self._pieces.items():
             player_possession.set_piece_info(animal_type, piece_info.position)
+            if piece_info.piece.dead:
+                player_possession.get_piece(animal_type).piece.die()
         return player_possession
 
 
@@ -107,11 +207,13 @@ class AnimalChessBoard:
             self,
             player0: Player,
             player1: Player,
-            initial_players_possessions: Optional[list[PlayerPossession]] = None
+            initial_players_possessions: Optional[list[PlayerPossession]] = None,
+            current_player_id: Literal[0, 1] = 0
     ):
         self._map = AnimalChessBoardMap()
         self._player0 = player0
         self._player1 = player1
+        self._current_player_id = current_player_id
         if initial_players_possessions is None:
             self._players_possessions = [
                 PlayerPossession(self._player0, 0),
@@ -121,12 +223,74 @@ class AnimalChessBoard:
             assert len(initial_players_possessions) == 2
             self._players_possessions = initial_players_possessions
         self._initialize_board()
+        self._history = PositionHistory()
+        self._history.push(self._hash)
+        self._shared_possessions = [False, False]
+        self._shared_history = False
+        self._shared_state = None
 
     def _initialize_board(self) -> None:
         self._board = np.empty((BOARD_HEIGHT, BOARD_WIDTH), dtype=object)
+        self._shared_board = False
         for possession in self._players_possessions:
             for animal_piece_info in possession.iterate_living_pieces():
                 self._board[*animal_piece_info.position] = animal_piece_info.piece
+        self._hash = compute_hash(self._players_possessions, self._current_player_id)
+
+    def reset(self, packed: Optional[bytes] = None) -> None:
+        # puts the board back to the initial layout, or to the packed position, with a
+        # new history, reusing the arrays and the pieces it does not share with clones
+        if packed is None:
+            positions, current_player_id, winned = [None, None], 0, [False, False]
+        else:
+            positions, current_player_id, winned = unpack_position(packed)
+            validate_positions(positions, winned)
+        for player_id, player in enumerate([self._player0, self._player1]):
+            if self._shared_possessions[player_id]:
+                self._players_possessions[player_id] = PlayerPossession(player, player_id, reset=False)
+                self._shared_possessions[player_id] = False
+            self._players_possessions[player_id].reset_pieces(player_id, positions[player_id], winned[player_id])
+        if self._shared_board:
+            self._board = np.empty((BOARD_HEIGHT, BOARD_WIDTH), dtype=object)
+            self._shared_board = False
+        else:
+            self._board.fill(None)
+        for possession in self._players_possessions:
+            for piece_info in possession.iterate_living_pieces():
+                self._board[*piece_info.position] = piece_info.piece
+        self._current_player_id = current_player_id
+        self._hash = compute_hash(self._players_possessions, self._current_player_id)
+        if self._shared_history:
+            self._history = PositionHistory()
+            self._shared_history = False
+        else:
+            self._history.clear()
+        self._history.push(self._hash)
+        if self._shared_state is not None:
+            self._shared_state.publish(self)
+
+    # copy-on-write: clones share the board array, the possessions and the history with
+    # their parent, and each is copied by whichever board writes to it first
+
+    def _own_board(self) -> None:
+        if self._shared_board:
+            self._board = self._board.copy()
+            self._shared_board = False
+
+    def _own_possession(self, player_id: Literal[0, 1]) -> PlayerPossession:
+        if self._shared_possessions[player_id]:
+            self._own_board()
+            possession = self._players_possessions[player_id].clone()
+            self._players_possessions[player_id] = possession
+            self._shared_possessions[player_id] = False
+            for piece_info in possession.iterate_living_pieces():
+                self._board[*piece_info.position] = piece_info.piece
+        return self._players_possessions[player_id]
+
+    def _own_history(self) -> None:
+        if self._shared_history:
+            self._history = self._history.copy()
+            self._shared_history = False
 
     def _any_pieces_in_between(
         self,
@@ -141,7 +305,7 @@ class AnimalChessBoard:
                     return True
         elif initial_position[1] == destination_position[1]:
             y = initial_position[1]
-            step = 1 if destination_position[1] > initial_position[1] else -1
+            step = 1 if destination_position[0] > initial_position[0] else -1
             for x in range(initial_position[0]+step, destination_position[0], step):
                 if self._board[x, y] is not None and isinstance(self._board[x, y], Piece):
                     return True
@@ -250,7 +414,74 @@ class AnimalChessBoard:
             animal: AnimalType,
             destination: tuple[int, int]
     ) -> bool:  # success: True; failed: False
-        return self._move_piece_really_or_simulatively(player_id, animal, destination, really=True)
+        destination_piece = self._board[*destination] if self._is_on_board(destination) else None
+        copy_needed = self._shared_board or self._shared_history or self._shared_possessions[player_id] or (
+            destination_piece is not None and self._shared_possessions[1 - player_id]
+        )
+        if copy_needed and self._move_piece_really_or_simulatively(player_id, animal, destination, really=False):
+            self._own_possession(player_id)
+            if destination_piece is not None:
+                self._own_possession(1 - player_id)
+            self._own_board()
+            self._own_history()
+            destination_piece = self._board[*destination]
+
+        possession = self._players_possessions[player_id]
+        initial_position = possession.get_piece(animal).position
+        winned = possession.winned
+
+        success = self._move_piece_really_or_simulatively(player_id, animal, destination, really=True)
+        if success:
+            # update the position hash incrementally
+            self._hash ^= piece_key(player_id, animal, initial_position) ^ piece_key(player_id, animal, destination)
+            if destination_piece is not None:
+                self._hash ^= piece_key(1 - player_id, destination_piece.animal_type, destination)
+            if possession.winned != winned:
+                self._hash ^= WINNED_KEYS[player_id]
+            if self._current_player_id == player_id:
+                self._hash ^= SIDE_TO_MOVE_KEY
+            self._current_player_id = 1 - player_id
+            self._history.push(self._hash, capture=destination_piece is not None)
+            if self._shared_state is not None:
+                self._shared_state.publish(self)
+        return success
+
+    def attach_shared_state(self, shared_state: SharedBoardState) -> None:
+        # publishes the position to the shared state now and after every move or reset
+        self._shared_state = shared_state
+        shared_state.publish(self)
+
+    def detach_shared_state(self) -> None:
+        self._shared_state = None
+
+    @staticmethod
+    def _is_on_board(position: tuple[int, int]) -> bool:
+        return 0 <= position[0] < BOARD_HEIGHT and 0 <= position[1] < BOARD_WIDTH
+
+    @property
+    def position_hash(self) -> int:
+        return self._hash
+
+    @property
+    def history(self) -> PositionHistory:
+        return self._history
+
+    def is_draw(self, rules: Optional[DrawRules] = None) -> bool:
+        return self._history.is_draw(DrawRules() if rules is None else rules)
+
+    @property
+    def current_player_id(self) -> Literal[0, 1]:
+        return self._current_player_id
+
+    @property
+    def winner(self) -> Optional[Literal[0, 1]]:
+        for player_id in (0, 1):
+            if self._players_possessions[player_id].winned:
+                return player_id
+        for player_id in (0, 1):
+            if next(self._players_possessions[1-player_id].iterate_living_pieces(), None) is None:
+                return player_id
+        return None
 
     def get_board_array(self) -> npt.NDArray[str]:
         printboard = np.empty((BOARD_HEIGHT, BOARD_WIDTH), dtype=object)
@@ -262,6 +493,180 @@ class AnimalChessBoard:
                 printboard[i, j] = ""
         return printboard
 
+    def to_planes(
+            self,
+            out: Optional[npt.NDArray] = None,
+            dtype: npt.DTypeLike = np.float32
+    ) -> npt.NDArray:
+        if out is None:
+            out = allocate_planes(dtype=dtype)
+        return fill_planes(self._players_possessions, self._current_player_id, out)
+
+    @staticmethod
+    def batch_to_planes(
+            boards: Sequence[Self],
+            out: Optional[npt.NDArray] = None,
+            dtype: npt.DTypeLike = np.float32
+    ) -> npt.NDArray:
+        if out is None:
+            out = allocate_planes(len(boards), dtype=dtype)
+        elif out.shape[0] < len(boards):
+            raise ValueError("The output array is too small for the batch.")
+        for board, planes in zip(boards, out):
+            fill_planes(board._players_possessions, board._current_player_id, planes)
+        return out
+
+    def legal_move_mask(self, player_id: Optional[Literal[0, 1]] = None) -> npt.NDArray[np.bool_]:
+        # boolean array of shape (number of animal types, number of directions)
+        if player_id is None:
+            player_id = self._current_player_id
+        return compute_legal_move_mask(self._players_possessions, player_id)
+
+    def action_to_move(
+            self,
+            action_id: int,
+            player_id: Optional[Literal[0, 1]] = None
+    ) -> tuple[AnimalType, Optional[tuple[int, int]]]:
+        if player_id is None:
+            player_id = self._current_player_id
+        animal, _ = decode_action(action_id)
+        destination = action_destinations(action_id, possession_origins(self._players_possessions[player_id]))
+        return animal, (None if destination == NO_SQUARE else index_square(destination))
+
+    def move_to_action(
+            self,
+            animal: AnimalType,
+            destination: tuple[int, int],
+            player_id: Optional[Literal[0, 1]] = None
+    ) -> int:
+        if player_id is None:
+            player_id = self._current_player_id
+        position = self._players_possessions[player_id].get_piece(animal).position
+        if position is not None:
+            destinations = ACTION_DESTINATIONS[animal.value-1, square_index(position)]
+            for direction in range(NUM_DIRECTIONS):
+                if destinations[direction] == square_index(destination):
+                    return encode_action(animal, direction)
+        raise ValueError(f"{animal.name} cannot reach {destination} in one move.")
+
+    def _least_valuable_capturer(
+            self,
+            player_id: Literal[0, 1],
+            destination: tuple[int, int],
+            victim: Piece,
+            used: set[AnimalType],
+            occupied: set[int],
+            values: dict[AnimalType, int],
+            animal: Optional[AnimalType] = None
+    ) -> Optional[PieceInformation]:
+        # the least valuable piece of the player, not yet used in the exchange, that can
+        # capture the victim standing on the destination
+        destination_squaretype = self._map.get_square_type(*destination)
+        if destination_squaretype in {SquareType.CAVE0, SquareType.CAVE1}:
+            return None
+        own_trap = SquareType.TRAP0 if player_id == 0 else SquareType.TRAP1
+        enemy_trap = SquareType.TRAP1 if player_id == 0 else SquareType.TRAP0
+        if destination_squaretype == enemy_trap:
+            return None
+        destination_index = square_index(destination)
+
+        capturer = None
+        for piece_info in self._players_possessions[player_id].iterate_living_pieces():
+            piece = piece_info.piece
+            if piece.animal_type in used or (animal is not None and piece.animal_type != animal):
+                continue
+            if capturer is not None and values[piece.animal_type] >= values[capturer.piece.animal_type]:
+                continue
+            if not piece.livable(destination_squaretype):
+                continue
+            if destination_squaretype != own_trap and not piece.can_eat(victim):
+                continue
+            origin = square_index(piece_info.position)
+            animal_index = piece.animal_type.value - 1
+            for direction in range(NUM_DIRECTIONS):
+                if ACTION_DESTINATIONS[animal_index, origin, direction] == destination_index:
+                    break
+            else:
+                continue
+            if ACTION_JUMPS[animal_index, origin, direction] and any(
+                    path_square in occupied for path_square in JUMP_PATHS[origin, direction] if path_square != EMPTY_SQUARE
+            ):
+                continue
+            capturer = piece_info
+        return capturer
+
+    def static_exchange(
+            self,
+            square: tuple[int, int],
+            player_id: Optional[Literal[0, 1]] = None,
+            animal: Optional[AnimalType] = None,
+            values: Optional[dict[AnimalType, int]] = None
+    ) -> int:
+        # Net material won by player_id (by default the side to move) by capturing the
+        # enemy piece on the square, with the given animal or else the least valuable
+        # capturer, after which both sides alternately recapture with their least
+        # valuable capturers as long as it pays off. Material is counted in food-chain
+        # ranks unless values are given; 0 if the first capture is impossible.
+        if player_id is None:
+            player_id = self._current_player_id
+        if values is None:
+            values = {animal_type: animal_type.value for animal_type in AnimalType}
+        victim = self._board[*square]
+        if victim is None or victim.player is self._players_possessions[player_id].player:
+            return 0
+        occupied = {
+            square_index(piece_info.position)
+            for possession in self._players_possessions
+            for piece_info in possession.iterate_living_pieces()
+        }
+        used = [set(), set()]
+
+        gains = [values[victim.animal_type]]
+        side = player_id
+        capturer = self._least_valuable_capturer(side, square, victim, used[side], occupied, values, animal)
+        if capturer is None:
+            return 0
+        while capturer is not None:
+            used[side].add(capturer.piece.animal_type)
+            occupied.discard(square_index(capturer.position))
+            victim = capturer.piece
+            gains.append(values[victim.animal_type] - gains[-1])   # if the capturer is captured in turn
+            side = 1 - side
+            capturer = self._least_valuable_capturer(side, square, victim, used[side], occupied, values)
+
+        # each side stops recapturing when it would lose
+        gains.pop()
+        for index in range(len(gains) - 1, 0, -1):
+            gains[index - 1] = -max(-gains[index - 1], gains[index])
+        return gains[0]
+
+    def to_bytes(self) -> bytes:
+        return pack_position(self._players_possessions, self._current_player_id)
+
+    @classmethod
+    def from_bytes(cls, packed: bytes, player0: Player, player1: Player) -> Self:
+        positions, current_player_id, winned = unpack_position(packed)
+        validate_positions(positions, winned)
+        possessions = [
+            PlayerPossession.from_positions(player, player_positions, player_winned)
+            for player, player_positions, player_winned in zip([player0, player1], positions, winned)
+        ]
+        return cls(player0, player1, possessions, current_player_id=current_player_id)
+
+    def to_notation(self) -> str:
+        from .notation import board_to_notation     # the notation module builds on this one
+        return board_to_notation(self)
+
+    @classmethod
+    def from_notation(cls, notation: str, player0: Player, player1: Player) -> Self:
+        from .notation import board_from_notation
+        return board_from_notation(notation, player0, player1)
+
+    def __reduce__(self) -> tuple:
+        # pickled as the packed position and the names of the players, which are equal
+        # to the originals; the history is not kept
+        return _unpickle_board, (self.to_bytes(), self._player0.name, self._player1.name)
+
     def exhaustively_iterate_available_destinations(
             self,
             player_id: Literal[0, 1],
@@ -271,11 +676,33 @@ class AnimalChessBoard:
             if self._move_piece_really_or_simulatively(player_id, animal, (i, j), really=False):
                 yield (i, j)
 
+    def iterate_legal_moves(
+            self,
+            player_id: Literal[0, 1]
+    ) -> Generator[tuple[AnimalType, tuple[int, int]], None, None]:
+        for piece_info in self._players_possessions[player_id].iterate_living_pieces():
+            animal = piece_info.piece.animal_type
+            for destination in candidate_destinations[piece_info.position]:
+                if self._move_piece_really_or_simulatively(player_id, animal, destination, really=False):
+                    yield animal, destination
+
     def clone(self) -> Self:
-        return AnimalChessBoard(
-            self._player0, self._player1,
-            [
-                self._players_possessions[0].clone(),
-                self._players_possessions[1].clone()
-            ]
-        )
+        board = AnimalChessBoard.__new__(AnimalChessBoard)
+        board._map = self._map
+        board._player0 = self._player0
+        board._player1 = self._player1
+        board._current_player_id = self._current_player_id
+        board._hash = self._hash
+        board._board = self._board
+        board._players_possessions = list(self._players_possessions)
+        board._history = self._history
+        board._shared_state = None     # clones do not publish
+        for shared_board in [self, board]:
+            shared_board._shared_board = True
+            shared_board._shared_possessions = [True, True]
+            shared_board._shared_history = True
+        return board
+
+
+def _unpickle_board(packed: bytes, player0_name: str, player1_name: str) -> AnimalChessBoard:
+    return AnimalChessBoard.from_bytes(packed, Player(player0_name), Player(player1_name))
@@ -0,0 +1,228 @@
+
+from typing import Literal, Optional
+from collections import deque
+
+import numpy as np
+import numpy.typing as npt
+
+from .utils import AnimalType, SquareType, BOARD_HEIGHT, BOARD_WIDTH
+from .board import AnimalChessBoard
+from .actions import (
+    ACTION_DESTINATIONS, ACTION_JUMPS, JUMP_PATHS, NUM_SQUARES, NUM_DIRECTIONS, NO_SQUARE, EMPTY_SQUARE,
+    SWIMMING_ANIMALS, square_index, square_terrain
+)
+
+
+# Shortest number of moves for each animal of each player to enter the enemy cave
+# from every square, on an otherwise empty board: CAVE_DISTANCES[player_id][animal
+# value - 1] is a (BOARD_HEIGHT, BOARD_WIDTH) array, UNREACHABLE where the animal
+# cannot stand.
+UNREACHABLE = np.iinfo(np.int16).max
+ENEMY_CAVE_SQUARES = [
+    square_index((BOARD_HEIGHT - 1, BOARD_WIDTH // 2)),     # cave of player 1
+    square_index((0, BOARD_WIDTH // 2))                     # cave of player 0
+]
+_cave_values = [SquareType.CAVE0.value, SquareType.CAVE1.value]
+_trap_values = [SquareType.TRAP0.value, SquareType.TRAP1.value]
+
+
+def _can_stand(animal: AnimalType, square: int) -> bool:
+    terrain = square_terrain(square)
+    if terrain in _cave_values:
+        return False
+    return terrain != SquareType.WATER.value or animal in SWIMMING_ANIMALS
+
+
+def _moves(player_id: Literal[0, 1], animal: AnimalType) -> list[list[tuple[int, int]]]:
+    # for each square, the (destination, direction) pairs on an empty board
+    animal_index = animal.value - 1
+    moves = [[] for _ in range(NUM_SQUARES)]
+    for square in range(NUM_SQUARES):
+        if not _can_stand(animal, square):
+            continue
+        for direction in range(NUM_DIRECTIONS):
+            destination = int(ACTION_DESTINATIONS[animal_index, square, direction])
+            if destination == NO_SQUARE:
+                continue
+            if destination == ENEMY_CAVE_SQUARES[player_id] or _can_stand(animal, destination):
+                moves[square].append((destination, direction))
+    return moves
+
+
+_MOVES = [[_moves(player_id, animal) for animal in AnimalType] for player_id in (0, 1)]
+
+
+def _static_distances(player_id: Literal[0, 1], animal: AnimalType) -> npt.NDArray[np.int16]:
+    # breadth-first search backwards from the cave; the moves are reversible except
+    # for entering the cave, which only ever ends a path
+    moves = _MOVES[player_id][animal.value - 1]
+    predecessors = [[] for _ in range(NUM_SQUARES)]
+    for square, square_moves in enumerate(moves):
+        for destination, _ in square_moves:
+            predecessors[destination].append(square)
+
+    distances = np.full(NUM_SQUARES, UNREACHABLE, dtype=np.int16)
+    cave = ENEMY_CAVE_SQUARES[player_id]
+    distances[cave] = 0
+    queue = deque([cave])
+    while len(queue) > 0:
+        square = queue.popleft()
+        for predecessor in predecessors[square]:
+            if distances[predecessor] == UNREACHABLE:
+                distances[predecessor] = distances[square] + 1
+                queue.append(predecessor)
+    return distances.reshape(BOARD_HEIGHT, BOARD_WIDTH)
+
+
+CAVE_DISTANCES = [[_static_distances(player_id, animal) for animal in AnimalType] for player_id in (0, 1)]
+for _player_tables in CAVE_DISTANCES:
+    for _table in _player_tables:
+        _table.flags.writeable = False
+
+
+def cave_distance(player_id: Literal[0, 1], animal: AnimalType, position: tuple[int, int]) -> int:
+    return int(CAVE_DISTANCES[player_id][animal.value - 1][position])
+
+
+def _occupancy(board: AnimalChessBoard) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    # owner (-1 if empty) and rank of the piece on each square, plus the padding square
+    owners = np.full(NUM_SQUARES + 1, -1, dtype=np.int64)
+    ranks = np.zeros(NUM_SQUARES + 1, dtype=np.int64)
+    for possession_id, possession in enumerate(board._players_possessions):
+        for piece_info in possession.iterate_living_pieces():
+            square = square_index(piece_info.position)
+            owners[square] = possession_id
+            ranks[square] = piece_info.piece.animal_type.value
+    return owners, ranks
+
+
+def _can_enter(player_id: int, animal: AnimalType, square: int, owners: npt.NDArray, ranks: npt.NDArray) -> bool:
+    # whether the animal may move to the square, capturing whatever stands there
+    owner = owners[square]
+    if owner == -1:
+        return True
+    if owner == player_id:
+        return False
+    terrain = square_terrain(square)
+    if terrain == _trap_values[player_id]:
+        return True
+    if terrain == _trap_values[1 - player_id]:
+        return False
+    rank, defender_rank = animal.value, ranks[square]
+    if rank == AnimalType.RAT.value and defender_rank == AnimalType.ELEPHANT.value:
+        return True
+    if rank == AnimalType.ELEPHANT.value and defender_rank == AnimalType.RAT.value:
+        return False
+    return rank >= defender_rank
+
+
+def _move_allowed(
+        player_id: int,
+        animal: AnimalType,
+        square: int,
+        destination: int,
+        direction: int,
+        owners: npt.NDArray,
+        ranks: npt.NDArray
+) -> bool:
+    if ACTION_JUMPS[animal.value - 1, square, direction]:
+        path = JUMP_PATHS[square, direction]
+        if np.any(owners[path[path != EMPTY_SQUARE]] != -1):
+            return False
+    return _can_enter(player_id, animal, destination, owners, ranks)
+
+
+def _shortest_path_open(
+        player_id: int,
+        animal: AnimalType,
+        origin: int,
+        owners: npt.NDArray,
+        ranks: npt.NDArray
+) -> bool:
+    # whether one of the shortest paths of the static table is free of blockers: the
+    # squares one move closer to the cave are followed level by level, which only
+    # looks at the pieces along those paths
+    static_distances = CAVE_DISTANCES[player_id][animal.value - 1].ravel()
+    moves = _MOVES[player_id][animal.value - 1]
+    frontier = {origin}
+    for distance in range(int(static_distances[origin]), 0, -1):
+        frontier = {
+            destination
+            for square in frontier
+            for destination, direction in moves[square]
+            if static_distances[destination] == distance - 1
+            and _move_allowed(player_id, animal, square, destination, direction, owners, ranks)
+        }
+        if len(frontier) == 0:
+            return False
+    return True
+
+
+def dynamic_cave_distance(
+        board: AnimalChessBoard,
+        player_id: Literal[0, 1],
+        animal: AnimalType,
+        max_distance: Optional[int] = None,
+        occupancy: Optional[tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]] = None
+) -> int:
+    # the number of moves the piece needs to enter the enemy cave if all the other
+    # pieces stood still: it may not move onto its own pieces or onto enemy pieces it
+    # cannot capture, and river jumps are blocked by pieces in the water; UNREACHABLE
+    # if it cannot within max_distance moves. The static distance is corrected for the
+    # pieces in the way: it holds as is next to the cave, as nothing can stand in the
+    # cave, and whenever one of its shortest paths is open; only when they are all
+    # blocked is the detour searched breadth-first.
+    piece_info = board._players_possessions[player_id].get_piece(animal)
+    if piece_info.piece.dead:
+        return UNREACHABLE
+    origin = square_index(piece_info.position)
+    if max_distance is None:
+        max_distance = UNREACHABLE - 1
+    static_distance = int(CAVE_DISTANCES[player_id][animal.value - 1].flat[origin])
+    if static_distance > max_distance:
+        return UNREACHABLE      # the static distance is a lower bound
+    if static_distance <= 1:
+        return static_distance
+
+    owners, ranks = _occupancy(board) if occupancy is None else (occupancy[0].copy(), occupancy[1])
+    owners[origin] = -1
+    if _shortest_path_open(player_id, animal, origin, owners, ranks):
+        return static_distance
+    moves = _MOVES[player_id][animal.value - 1]
+    cave = ENEMY_CAVE_SQUARES[player_id]
+    distances = {origin: 0}
+    queue = deque([origin])
+    while len(queue) > 0:
+        square = queue.popleft()
+        distance = distances[square]
+        if distance >= max_distance:
+            break
+        for destination, direction in moves[square]:
+            if destination in distances:
+                continue
+            if not _move_allowed(player_id, animal, square, destination, direction, owners, ranks):
+                continue
+            if destination == cave:
+                return distance + 1
+            distances[destination] = distance + 1
+            queue.append(destination)
+    return UNREACHABLE
+
+
+def can_reach_cave(board: AnimalChessBoard, player_id: Literal[0, 1], max_moves: int) -> bool:
+    # whether any piece of the player could enter the enemy cave within max_moves of
+    # its own moves; the static tables decide most pieces, and all of them for a
+    # single move, without looking at the other pieces
+    occupancy = None
+    for piece_info in board._players_possessions[player_id].iterate_living_pieces():
+        animal = piece_info.piece.animal_type
+        static_distance = CAVE_DISTANCES[player_id][animal.value - 1][piece_info.position]
+        if static_distance > max_moves:
+            continue
+        if static_distance <= 1:
+            return True
+        if occupancy is None:
+            occupancy = _occupancy(board)
+        if dynamic_cave_distance(board, player_id, animal, max_moves, occupancy) <= max_moves:
+            return True
+    return False
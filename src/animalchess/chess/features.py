@@ -0,0 +1,57 @@
+
+from typing import Literal, Optional, Iterable
+
+import numpy as np
+import numpy.typing as npt
+
+from .utils import AnimalType, SquareType, AnimalChessBoardMap
+from .utils import BOARD_HEIGHT, BOARD_WIDTH
+
+
+# plane layout:
+#   0-7:   pieces of player 0, one plane per animal in the order of AnimalType
+#   8-15:  pieces of player 1
+#   16-20: terrain (water, trap 0, trap 1, cave 0, cave 1)
+#   21:    side to move (all ones if player 1 is to move)
+NUM_ANIMAL_TYPES = len(AnimalType)
+NUM_PIECE_PLANES = 2 * NUM_ANIMAL_TYPES
+TERRAIN_SQUARE_TYPES = [SquareType.WATER, SquareType.TRAP0, SquareType.TRAP1, SquareType.CAVE0, SquareType.CAVE1]
+TERRAIN_PLANES_OFFSET = NUM_PIECE_PLANES
+SIDE_TO_MOVE_PLANE = TERRAIN_PLANES_OFFSET + len(TERRAIN_SQUARE_TYPES)
+NUM_PLANES = SIDE_TO_MOVE_PLANE + 1
+
+_terrain_planes = np.stack([
+    AnimalChessBoardMap()._board == square_type.value
+    for square_type in TERRAIN_SQUARE_TYPES
+])
+
+
+def piece_plane_index(player_id: Literal[0, 1], animal_type: AnimalType) -> int:
+    return player_id * NUM_ANIMAL_TYPES + animal_type.value - 1
+
+
+def allocate_planes(
+        batch_size: Optional[int] = None,
+        dtype: npt.DTypeLike = np.float32
+) -> npt.NDArray:
+    shape = (NUM_PLANES, BOARD_HEIGHT, BOARD_WIDTH)
+    return np.zeros(shape if batch_size is None else (batch_size, *shape), dtype=dtype)
+
+
+def fill_planes(
+        players_possessions: Iterable,
+        current_player_id: Literal[0, 1],
+        out: npt.NDArray
+) -> npt.NDArray:
+    if out.shape != (NUM_PLANES, BOARD_HEIGHT, BOARD_WIDTH):
+        raise ValueError(f"The output array must be of shape {(NUM_PLANES, BOARD_HEIGHT, BOARD_WIDTH)}.")
+
+    out[:NUM_PIECE_PLANES] = 0
+    for player_id, possession in enumerate(players_possessions):
+        offset = player_id * NUM_ANIMAL_TYPES - 1
+        for piece_info in possession.iterate_living_pieces():
+            row, col = piece_info.position
+            out[offset + piece_info.piece.animal_type.value, row, col] = 1
+    out[TERRAIN_PLANES_OFFSET:SIDE_TO_MOVE_PLANE] = _terrain_planes
+    out[SIDE_TO_MOVE_PLANE] = current_player_id
+    return out
@@ -0,0 +1,29 @@
+
+from typing import Literal, Iterable
+
+import numpy as np
+
+from .utils import AnimalType, BOARD_HEIGHT, BOARD_WIDTH
+
+
+# Zobrist keys; the seed is fixed so that hashes agree across processes and runs.
+_rng = np.random.default_rng(0x5EED_A11A)
+PIECE_KEYS = _rng.integers(
+    0, 2**64, size=(2, len(AnimalType), BOARD_HEIGHT, BOARD_WIDTH), dtype=np.uint64, endpoint=False
+).tolist()      # python ints, as XOR on numpy scalars is much slower
+SIDE_TO_MOVE_KEY = int(_rng.integers(0, 2**64, dtype=np.uint64, endpoint=False))
+WINNED_KEYS = _rng.integers(0, 2**64, size=2, dtype=np.uint64, endpoint=False).tolist()
+
+
+def piece_key(player_id: Literal[0, 1], animal_type: AnimalType, position: tuple[int, int]) -> int:
+    return PIECE_KEYS[player_id][animal_type.value-1][position[0]][position[1]]
+
+
+def compute_hash(players_possessions: Iterable, current_player_id: Literal[0, 1]) -> int:
+    position_hash = SIDE_TO_MOVE_KEY if current_player_id == 1 else 0
+    for player_id, possession in enumerate(players_possessions):
+        for piece_info in possession.iterate_living_pieces():
+            position_hash ^= piece_key(player_id, piece_info.piece.animal_type, piece_info.position)
+        if possession.winned:
+            position_hash ^= WINNED_KEYS[player_id]
+    return position_hash
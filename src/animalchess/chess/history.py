@@ -0,0 +1,79 @@
+
+from typing import Optional, Self
+from dataclasses import dataclass
+
+
+@dataclass
+class DrawRules:
+    max_repetitions: Optional[int] = 3      # the same position occurring this many times
+    max_plies_without_capture: Optional[int] = 100
+
+
+class PositionHistory:
+    # Position hashes of the game in a list that grows up to `capacity` entries and is
+    # then used as a ring, so that boards and their copies during a search only hold
+    # as many hashes as they have positions; only the latest `capacity` positions are
+    # considered for repetitions.
+    def __init__(self, capacity: int = 256):
+        self._capacity = capacity
+        self._hashes: list[int] = []
+        self._length = 0
+        self._counts: dict[int, int] = {}
+        self._plies_since_capture = 0
+
+    def push(self, position_hash: int, capture: bool = False) -> None:
+        if self._length < self._capacity:
+            self._hashes.append(position_hash)
+        else:
+            index = self._length % self._capacity
+            evicted_hash = self._hashes[index]
+            if self._counts[evicted_hash] == 1:
+                del self._counts[evicted_hash]
+            else:
+                self._counts[evicted_hash] -= 1
+            self._hashes[index] = position_hash
+        self._counts[position_hash] = self._counts.get(position_hash, 0) + 1
+        self._length += 1
+        self._plies_since_capture = 0 if capture else self._plies_since_capture + 1
+
+    def clear(self) -> None:
+        self._hashes.clear()
+        self._length = 0
+        self._counts.clear()
+        self._plies_since_capture = 0
+
+    def count(self, position_hash: int) -> int:
+        return self._counts.get(position_hash, 0)
+
+    def seen(self, position_hash: int) -> bool:
+        return position_hash in self._counts
+
+    @property
+    def last_hash(self) -> Optional[int]:
+        if self._length == 0:
+            return None
+        return self._hashes[(self._length - 1) % self._capacity]
+
+    @property
+    def plies(self) -> int:     # number of moves made since the first position
+        return max(self._length - 1, 0)
+
+    @property
+    def plies_since_capture(self) -> int:
+        return self._plies_since_capture
+
+    def is_draw(self, rules: DrawRules) -> bool:
+        if rules.max_plies_without_capture is not None and self._plies_since_capture >= rules.max_plies_without_capture:
+            return True
+        if rules.max_repetitions is not None and self._length > 0:
+            return self.count(self.last_hash) >= rules.max_repetitions
+        return False
+
+    def copy(self) -> Self:
+        history = PositionHistory.__new__(PositionHistory)
+        history._capacity = self._capacity
+        history._hashes = self._hashes.copy()     # a list, sized to the game
+        history._length = self._length
+        history._counts = self._counts.copy()
+        history._plies_since_capture = self._plies_since_capture
+        return history
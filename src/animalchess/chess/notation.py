@@ -0,0 +1,141 @@
+
+from typing import Literal
+
+from .utils import AnimalType, BOARD_HEIGHT, BOARD_WIDTH
+from .player import Player
+from .board import AnimalChessBoard, PlayerPossession, validate_positions
+
+
+# Position notation, one rank per board row (row 0 first), separated by "/":
+# player 0 pieces in upper case, player 1 pieces in lower case, digits for runs of
+# empty squares, followed by the side to move and the winner ("-" if none), e.g.
+#     L5T/1D3C1/R1P1W1E/7/7/7/e1w1p1r/1c3d1/t5l 0 -
+
+ANIMAL_LETTERS = {
+    AnimalType.RAT: "r",
+    AnimalType.CAT: "c",
+    AnimalType.DOG: "d",
+    AnimalType.WOLF: "w",
+    AnimalType.LEOPARD: "p",
+    AnimalType.TIGER: "t",
+    AnimalType.LION: "l",
+    AnimalType.ELEPHANT: "e"
+}
+LETTER_ANIMALS = {letter: animal_type for animal_type, letter in ANIMAL_LETTERS.items()}
+FILES = "abcdefg"
+
+STARTING_POSITION_NOTATION = "L5T/1D3C1/R1P1W1E/7/7/7/e1w1p1r/1c3d1/t5l 0 -"
+
+
+def square_to_string(position: tuple[int, int]) -> str:
+    return f"{FILES[position[1]]}{position[0]+1}"
+
+
+def string_to_square(square_string: str) -> tuple[int, int]:
+    if len(square_string) != 2 or square_string[0] not in FILES or not square_string[1].isdigit():
+        raise ValueError(f"Invalid square: {square_string}")
+    row = int(square_string[1]) - 1
+    if row < 0 or row >= BOARD_HEIGHT:
+        raise ValueError(f"Invalid square: {square_string}")
+    return row, FILES.index(square_string[0])
+
+
+def move_to_string(
+        board: AnimalChessBoard,
+        player_id: Literal[0, 1],
+        animal: AnimalType,
+        destination: tuple[int, int]
+) -> str:
+    initial_position = board._players_possessions[player_id].get_piece(animal).position
+    return square_to_string(initial_position) + square_to_string(destination)
+
+
+def string_to_move(
+        board: AnimalChessBoard,
+        player_id: Literal[0, 1],
+        move_string: str
+) -> tuple[AnimalType, tuple[int, int]]:
+    if len(move_string) != 4:
+        raise ValueError(f"Invalid move: {move_string}")
+    initial_position = string_to_square(move_string[:2])
+    destination = string_to_square(move_string[2:])
+    piece = board._board[*initial_position]
+    if piece is None or piece.player is not board._players_possessions[player_id].player:
+        raise ValueError(f"No piece of player {player_id} on {move_string[:2]}")
+    return piece.animal_type, destination
+
+
+def board_to_notation(board: AnimalChessBoard) -> str:
+    ranks = []
+    for i in range(BOARD_HEIGHT):
+        rank = ""
+        empty = 0
+        for j in range(BOARD_WIDTH):
+            piece = board._board[i, j]
+            if piece is None:
+                empty += 1
+                continue
+            if empty > 0:
+                rank += str(empty)
+                empty = 0
+            letter = ANIMAL_LETTERS[piece.animal_type]
+            rank += letter.upper() if piece.player is board._player0 else letter
+        if empty > 0:
+            rank += str(empty)
+        ranks.append(rank)
+
+    winner = "-"
+    for player_id, possession in enumerate(board._players_possessions):
+        if possession.winned:
+            winner = str(player_id)
+    return "/".join(ranks) + f" {board.current_player_id} {winner}"
+
+
+def board_from_notation(
+        notation: str,
+        player0: Player,
+        player1: Player
+) -> AnimalChessBoard:
+    fields = notation.split()
+    if len(fields) != 3:
+        raise ValueError(f"Invalid notation: {notation}")
+    placement, side_to_move, winner = fields
+    if side_to_move not in {"0", "1"} or winner not in {"0", "1", "-"}:
+        raise ValueError(f"Invalid notation: {notation}")
+
+    positions = [{}, {}]
+    ranks = placement.split("/")
+    if len(ranks) != BOARD_HEIGHT:
+        raise ValueError(f"Invalid number of ranks: {placement}")
+    for i, rank in enumerate(ranks):
+        j = 0
+        for character in rank:
+            if character.isdigit():
+                if character == "0":
+                    raise ValueError(f"Invalid rank: {rank}")
+                j += int(character)
+                continue
+            animal_type = LETTER_ANIMALS.get(character.lower())
+            if animal_type is None or j >= BOARD_WIDTH:
+                raise ValueError(f"Invalid rank: {rank}")
+            player_positions = positions[0 if character.isupper() else 1]
+            if animal_type in player_positions:
+                raise ValueError(f"Duplicate piece: {character}")
+            player_positions[animal_type] = (i, j)
+            j += 1
+        if j != BOARD_WIDTH:
+            raise ValueError(f"Invalid rank: {rank}")
+    validate_positions(positions, [winner == "0", winner == "1"])
+
+    # captured pieces are kept as dead pieces, as they would be after being eaten
+    possessions = [
+        PlayerPossession.from_positions(player, player_positions, winner == str(player_id))
+        for player_id, (player, player_positions) in enumerate(zip([player0, player1], positions))
+    ]
+
+    return AnimalChessBoard(
+        player0,
+        player1,
+        initial_players_possessions=possessions,
+        current_player_id=int(side_to_move)
+    )
@@ -0,0 +1,47 @@
+
+from typing import Literal, Iterable
+
+from .utils import AnimalType, BOARD_HEIGHT, BOARD_WIDTH
+
+
+# Packed position: one byte per piece, player 0 first and then player 1, each in the
+# order of AnimalType, holding row * BOARD_WIDTH + col or DEAD, then one byte of flags.
+PACKED_POSITION_SIZE = 2 * len(AnimalType) + 1
+DEAD = 0xFF
+SIDE_TO_MOVE_FLAG = 1
+PLAYER0_WINNED_FLAG = 2
+PLAYER1_WINNED_FLAG = 4
+WINNED_FLAGS = [PLAYER0_WINNED_FLAG, PLAYER1_WINNED_FLAG]
+
+
+def pack_position(players_possessions: Iterable, current_player_id: Literal[0, 1]) -> bytes:
+    packed = bytearray(PACKED_POSITION_SIZE)
+    packed[:-1] = b"\xff" * (PACKED_POSITION_SIZE - 1)
+    flags = SIDE_TO_MOVE_FLAG if current_player_id == 1 else 0
+    for player_id, possession in enumerate(players_possessions):
+        offset = player_id * len(AnimalType) - 1
+        for piece_info in possession.iterate_living_pieces():
+            row, col = piece_info.position
+            packed[offset + piece_info.piece.animal_type.value] = row * BOARD_WIDTH + col
+        if possession.winned:
+            flags |= WINNED_FLAGS[player_id]
+    packed[-1] = flags
+    return bytes(packed)
+
+
+def unpack_position(packed: bytes) -> tuple[list[dict[AnimalType, tuple[int, int]]], Literal[0, 1], list[bool]]:
+    # returns the positions of the living pieces of each player, the side to move
+    # and the winned flags
+    if len(packed) != PACKED_POSITION_SIZE:
+        raise ValueError(f"A packed position has {PACKED_POSITION_SIZE} bytes.")
+    positions = [{}, {}]
+    for index, square in enumerate(packed[:-1]):
+        if square != DEAD:
+            if square >= BOARD_HEIGHT * BOARD_WIDTH:
+                raise ValueError(f"Invalid square byte {square} at offset {index} of a packed position.")
+            player_id, animal_index = divmod(index, len(AnimalType))
+            positions[player_id][AnimalType(animal_index + 1)] = divmod(square, BOARD_WIDTH)
+    flags = packed[-1]
+    if flags & ~(SIDE_TO_MOVE_FLAG | PLAYER0_WINNED_FLAG | PLAYER1_WINNED_FLAG):
+        raise ValueError(f"Invalid flags {flags} of a packed position.")
+    return positions, flags & SIDE_TO_MOVE_FLAG, [bool(flags & winned_flag) for winned_flag in WINNED_FLAGS]
@@ -0,0 +1,50 @@
+
+from typing import Optional, Generator
+from contextlib import contextmanager
+
+from .board import AnimalChessBoard
+from .player import Player
+
+
+class BoardPool:
+    # Released boards are kept and reset in place when acquired again, to the initial
+    # layout or to a packed position, instead of constructing new boards. A released
+    # board must not be used any more, and is detached from its shared state; its
+    # clones remain valid.
+    def __init__(self, player0: Player, player1: Player, max_size: Optional[int] = None):
+        self._player0 = player0
+        self._player1 = player1
+        self._max_size = max_size
+        self._free_boards: list[AnimalChessBoard] = []
+        self._free_board_ids: set[int] = set()
+
+    def acquire(self, packed: Optional[bytes] = None) -> AnimalChessBoard:
+        if len(self._free_boards) == 0:
+            if packed is None:
+                return AnimalChessBoard(self._player0, self._player1)
+            return AnimalChessBoard.from_bytes(packed, self._player0, self._player1)
+        board = self._free_boards.pop()
+        self._free_board_ids.remove(id(board))
+        board.reset(packed)
+        return board
+
+    def release(self, board: AnimalChessBoard) -> None:
+        if board._player0 is not self._player0 or board._player1 is not self._player1:
+            raise ValueError("The board is not of the players of the pool.")
+        if id(board) in self._free_board_ids:
+            raise ValueError("The board has already been released.")
+        board.detach_shared_state()
+        if self._max_size is None or len(self._free_boards) < self._max_size:
+            self._free_boards.append(board)
+            self._free_board_ids.add(id(board))
+
+    @contextmanager
+    def borrow(self, packed: Optional[bytes] = None) -> Generator[AnimalChessBoard, None, None]:
+        board = self.acquire(packed)
+        try:
+            yield board
+        finally:
+            self.release(board)
+
+    def __len__(self) -> int:    # number of boards ready to be acquired
+        return len(self._free_boards)
@@ -0,0 +1,130 @@
+
+from typing import Optional, Literal, Self
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+import time
+
+import numpy as np
+import numpy.typing as npt
+
+from .utils import AnimalType
+from .player import Player
+from .packing import DEAD, PACKED_POSITION_SIZE, SIDE_TO_MOVE_FLAG, WINNED_FLAGS
+
+
+# Layout of the shared block, a single record of SHARED_STATE_DTYPE:
+#     sequence            uint64, odd while the writer is updating the record
+#     position_hash       uint64, see AnimalChessBoard.position_hash
+#     squares             uint8 (2, 8): row * BOARD_WIDTH + col of each piece, by player
+#                         and then in the order of AnimalType, DEAD (0xFF) if captured
+#     dead                bool (2, 8), in the same order
+#     winned              bool (2,)
+#     current_player_id   uint8
+# Readers copy the record and retry until the sequence number is even and unchanged
+# (a seqlock), so that they never see a half-written position. There is one writer.
+# There are no memory fences: the protocol relies on the stores of the writer being
+# seen in program order, as on x86; weaker orderings (e.g. ARM) may show torn reads.
+SHARED_STATE_DTYPE = np.dtype([
+    ("sequence", "<u8"),
+    ("position_hash", "<u8"),
+    ("squares", "u1", (2, len(AnimalType))),
+    ("dead", "?", (2, len(AnimalType))),
+    ("winned", "?", (2,)),
+    ("current_player_id", "u1")
+])
+READ_TIMEOUT = 1.0      # in seconds; a writer that died mid-publish leaves the sequence odd
+
+
+@dataclass
+class SharedBoardSnapshot:
+    sequence: int       # number of positions published before this one, times two
+    position_hash: int
+    squares: npt.NDArray[np.uint8]
+    dead: npt.NDArray[np.bool_]
+    winned: npt.NDArray[np.bool_]
+    current_player_id: Literal[0, 1]
+
+    def to_bytes(self) -> bytes:    # the packed position, see AnimalChessBoard.to_bytes
+        flags = SIDE_TO_MOVE_FLAG if self.current_player_id == 1 else 0
+        for player_id in (0, 1):
+            if self.winned[player_id]:
+                flags |= WINNED_FLAGS[player_id]
+        return self.squares.tobytes() + bytes([flags])
+
+    def to_board(self, player0: Player, player1: Player):
+        from .board import AnimalChessBoard     # the board module publishes through this one
+        return AnimalChessBoard.from_bytes(self.to_bytes(), player0, player1)
+
+
+class SharedBoardState:
+    # The state of a board in a shared memory block, written by the process that owns
+    # the board (see AnimalChessBoard.attach_shared_state) and read by any process that
+    # attaches to it by name. The creator should unlink it when done.
+    def __init__(self, name: Optional[str] = None, create: bool = True):
+        self._memory = shared_memory.SharedMemory(name, create=create, size=SHARED_STATE_DTYPE.itemsize)
+        self._record = np.ndarray((), dtype=SHARED_STATE_DTYPE, buffer=self._memory.buf)
+        if create:
+            self._record[()] = np.zeros((), dtype=SHARED_STATE_DTYPE)
+            self._record["squares"] = DEAD
+            self._record["dead"] = True
+
+    @classmethod
+    def attach(cls, name: str) -> Self:
+        return cls(name, create=False)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    @property
+    def record(self) -> np.ndarray:     # the live record, for zero-copy readers that handle the sequence themselves
+        return self._record
+
+    def publish_packed(self, packed: bytes, position_hash: int) -> None:
+        if len(packed) != PACKED_POSITION_SIZE:
+            raise ValueError(f"A packed position has {PACKED_POSITION_SIZE} bytes.")
+        squares = np.frombuffer(packed, dtype=np.uint8, count=PACKED_POSITION_SIZE - 1).reshape(2, len(AnimalType))
+        flags = packed[-1]
+        record = self._record
+        record["sequence"] += 1
+        record["position_hash"] = position_hash
+        record["squares"] = squares
+        record["dead"] = squares == DEAD
+        record["winned"] = [bool(flags & winned_flag) for winned_flag in WINNED_FLAGS]
+        record["current_player_id"] = flags & SIDE_TO_MOVE_FLAG
+        record["sequence"] += 1
+
+    def publish(self, board) -> None:
+        self.publish_packed(board.to_bytes(), board.position_hash)
+
+    def read(self, timeout: Optional[float] = READ_TIMEOUT) -> SharedBoardSnapshot:
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            sequence = int(self._record["sequence"])
+            if sequence % 2 == 0:
+                record = self._record.copy()
+                if int(self._record["sequence"]) == sequence:
+                    return SharedBoardSnapshot(
+                        sequence,
+                        int(record["position_hash"]),
+                        record["squares"],
+                        record["dead"],
+                        record["winned"],
+                        int(record["current_player_id"])
+                    )
+            if deadline is not None and time.perf_counter() >= deadline:
+                raise TimeoutError("The shared board state kept changing while being read.")
+            time.sleep(0)   # let the writer finish
+
+    def close(self) -> None:
+        self._record = None
+        self._memory.close()
+
+    def unlink(self) -> None:
+        self._memory.unlink()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -36,6 +36,8 @@ class SquareType(Enum):
 
 class AnimalChessBoardMap:    # this is a singleton
     def __init__(self):
+        if hasattr(self, "_board"):     # __init__ runs again at every instantiation of the singleton
+            return
         self._board = np.empty((BOARD_HEIGHT, BOARD_WIDTH), dtype=np.int8)
         self._board.fill(SquareType.LAND.value)
         self._board[0, 2] = SquareType.TRAP0.value
@@ -56,6 +58,9 @@ class AnimalChessBoardMap:    # this is a singleton
             cls._instance = super().__new__(cls)
         return cls._instance
 
+    def __reduce__(self) -> tuple:   # unpickled as the singleton of the receiving process
+        return AnimalChessBoardMap, ()
+
     def get_square_type(self, row: int, col: int) -> SquareType:
         if row < 0 or row >= BOARD_HEIGHT or col < 0 or col >= BOARD_WIDTH:
             raise ValueError("Invalid square position")
@@ -135,6 +140,9 @@ class Piece(ABC):
     def die(self):
         self._dead = True
 
+    def revive(self):   # for boards reset in place
+        self._dead = False
+
     @property
     def player(self) -> Player:
         return self._player
@@ -0,0 +1,144 @@
+
+from typing import Optional, Generator
+from dataclasses import dataclass, field
+from collections import OrderedDict
+
+from .board import AnimalChessBoard
+from .utils import AnimalType
+
+
+Move = tuple[AnimalType, tuple[int, int]]
+
+
+@dataclass(slots=True, eq=False)
+class VariationNode:
+    move: Optional[Move]        # None for the root
+    position_hash: int
+    parent: Optional["VariationNode"] = None
+    children: list["VariationNode"] = field(default_factory=list)     # the first child continues the main line
+    comment: Optional[str] = None
+
+    @property
+    def is_root(self) -> bool:
+        return self.parent is None
+
+    def find_child(self, move: Move) -> Optional["VariationNode"]:
+        for child in self.children:
+            if child.move == move:
+                return child
+        return None
+
+    def path(self) -> list["VariationNode"]:    # from the root to this node
+        nodes = []
+        node = self
+        while node is not None:
+            nodes.append(node)
+            node = node.parent
+        return nodes[::-1]
+
+
+class VariationTree:
+    # Game tree of a main line and sidelines. The nodes only store the move and the
+    # resulting position hash; boards are rebuilt on demand by replaying the moves
+    # from the nearest ancestor whose board is cached. The root board is always kept,
+    # and at most cache_size other boards are cached, the least recently used first
+    # to go.
+    def __init__(self, board: AnimalChessBoard, cache_size: int = 64):
+        self._root = VariationNode(None, board.position_hash)
+        self._root_board = board.clone()
+        self._cache_size = cache_size
+        self._cache: OrderedDict[VariationNode, AnimalChessBoard] = OrderedDict()
+
+    @property
+    def root(self) -> VariationNode:
+        return self._root
+
+    def _cached_board(self, node: VariationNode) -> Optional[AnimalChessBoard]:
+        if node is self._root:
+            return self._root_board
+        board = self._cache.get(node)
+        if board is not None:
+            self._cache.move_to_end(node)
+        return board
+
+    def _cache_board(self, node: VariationNode, board: AnimalChessBoard) -> None:
+        if node is self._root or self._cache_size <= 0:
+            return
+        self._cache[node] = board
+        self._cache.move_to_end(node)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _build_board(self, node: VariationNode) -> AnimalChessBoard:
+        moves = []
+        ancestor = node
+        while (board := self._cached_board(ancestor)) is None:
+            moves.append(ancestor.move)
+            ancestor = ancestor.parent
+        if len(moves) == 0:
+            return board
+        board = board.clone()
+        for move in reversed(moves):
+            board.move_piece(board.current_player_id, *move)
+        self._cache_board(node, board)
+        return board
+
+    def board(self, node: VariationNode) -> AnimalChessBoard:
+        # a copy that the caller may modify
+        return self._build_board(node).clone()
+
+    def add_move(self, node: VariationNode, animal: AnimalType, destination: tuple[int, int]) -> VariationNode:
+        # returns the existing child if the move was already added
+        move = (animal, destination)
+        child = node.find_child(move)
+        if child is not None:
+            return child
+        board = self._build_board(node).clone()
+        if board.winner is not None or not board.move_piece(board.current_player_id, animal, destination):
+            raise ValueError(f"Illegal move: {animal.name} to {destination}")
+        child = VariationNode(move, board.position_hash, node)
+        node.children.append(child)
+        self._cache_board(child, board)
+        return child
+
+    def add_line(self, node: VariationNode, moves: list[Move]) -> VariationNode:
+        for animal, destination in moves:
+            node = self.add_move(node, animal, destination)
+        return node
+
+    def delete_variation(self, node: VariationNode) -> None:
+        # removes the node and all its descendants
+        if node.is_root:
+            raise ValueError("Cannot delete the root of the variation tree.")
+        node.parent.children.remove(node)
+        for descendant in self.iterate_nodes(node):
+            self._cache.pop(descendant, None)
+        node.parent = None
+
+    def promote_variation(self, node: VariationNode) -> None:
+        # makes the node the main continuation of its parent
+        if node.is_root:
+            raise ValueError("Cannot promote the root of the variation tree.")
+        siblings = node.parent.children
+        siblings.remove(node)
+        siblings.insert(0, node)
+
+    def main_line(self, node: Optional[VariationNode] = None) -> list[VariationNode]:
+        # the nodes following the first children from the node (the root by default)
+        node = self._root if node is None else node
+        nodes = [node]
+        while len(node.children) > 0:
+            node = node.children[0]
+            nodes.append(node)
+        return nodes
+
+    def iterate_nodes(self, node: Optional[VariationNode] = None) -> Generator[VariationNode, None, None]:
+        # depth first, main lines before sidelines
+        stack = [self._root if node is None else node]
+        while len(stack) > 0:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.iterate_nodes())
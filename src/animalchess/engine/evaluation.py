@@ -0,0 +1,45 @@
+
+from typing import Literal
+
+import numpy as np
+
+from ..chess.board import AnimalChessBoard
+from ..chess.utils import AnimalType
+from ..chess.distances import CAVE_DISTANCES
+
+
+ANIMAL_VALUES = {
+    AnimalType.RAT: 400,      # the only piece that can swim and eat the elephant
+    AnimalType.CAT: 200,
+    AnimalType.DOG: 300,
+    AnimalType.WOLF: 400,
+    AnimalType.LEOPARD: 500,
+    AnimalType.TIGER: 800,
+    AnimalType.LION: 900,
+    AnimalType.ELEPHANT: 1000
+}
+ADVANCEMENT_WEIGHT = 10
+ADVANCEMENT_HORIZON = 12    # pieces this many moves or more away from the enemy cave get no bonus
+WIN_SCORE = 100000
+
+# advancement bonus of each animal of each player on each square, as nested lists for fast lookups
+_advancement_bonuses = [
+    {
+        animal: (ADVANCEMENT_WEIGHT * np.maximum(ADVANCEMENT_HORIZON - distances[animal.value - 1], 0)).tolist()
+        for animal in AnimalType
+    }
+    for distances in CAVE_DISTANCES
+]
+
+
+def evaluate(board: AnimalChessBoard, player_id: Literal[0, 1]) -> int:
+    # score of the position from the perspective of player_id
+    score = 0
+    for possession_id, possession in enumerate(board._players_possessions):
+        sign = 1 if possession_id == player_id else -1
+        bonuses = _advancement_bonuses[possession_id]
+        for piece_info in possession.iterate_living_pieces():
+            animal = piece_info.piece.animal_type
+            row, col = piece_info.position
+            score += sign * (ANIMAL_VALUES[animal] + bonuses[animal][row][col])
+    return score
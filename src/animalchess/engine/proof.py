@@ -0,0 +1,177 @@
+
+from typing import Optional, Literal
+from dataclasses import dataclass, field
+import time
+
+from ..chess.board import AnimalChessBoard
+from ..chess.utils import AnimalType
+from .stats import SearchStats
+
+
+Move = tuple[AnimalType, tuple[int, int]]
+
+INFINITE_PROOF = 1 << 60
+PROVEN = "proven"
+DISPROVEN = "disproven"
+UNKNOWN = "unknown"
+
+
+@dataclass(eq=False)
+class ProofNode:
+    move: Optional[Move]            # None for the root
+    position_hash: int
+    attacker_to_move: bool          # OR node if True, AND node otherwise
+    parent: Optional["ProofNode"] = None
+    proof: int = 1
+    disproof: int = 1
+    children: Optional[list["ProofNode"]] = None    # None until expanded
+
+    @property
+    def proven(self) -> bool:
+        return self.proof == 0
+
+    @property
+    def disproven(self) -> bool:
+        return self.disproof == 0
+
+    def _update(self) -> None:
+        if self.proven or self.disproven:   # solved, possibly with its subtree freed
+            return
+        if self.attacker_to_move:
+            self.proof = min((child.proof for child in self.children), default=INFINITE_PROOF)
+            self.disproof = min(sum(child.disproof for child in self.children), INFINITE_PROOF)
+        else:
+            self.proof = min(sum(child.proof for child in self.children), INFINITE_PROOF)
+            self.disproof = min((child.disproof for child in self.children), default=INFINITE_PROOF)
+
+
+@dataclass
+class ProofTree:
+    # the moves that prove the win: one reply for the attacker, all replies for the defender
+    move: Optional[Move]
+    children: list["ProofTree"] = field(default_factory=list)
+
+    def main_line(self) -> list[Move]:
+        moves = []
+        tree = self
+        while len(tree.children) > 0:
+            tree = tree.children[0]
+            moves.append(tree.move)
+        return moves
+
+
+@dataclass
+class ProofResult:
+    status: Literal["proven", "disproven", "unknown"]
+    attacker: Literal[0, 1]
+    root: ProofNode
+    nodes: int              # nodes created
+    expansions: int
+
+    def proof_tree(self) -> Optional[ProofTree]:
+        if self.status != PROVEN:
+            return None
+        return _extract_proof_tree(self.root)
+
+
+def _extract_proof_tree(node: ProofNode) -> ProofTree:
+    tree = ProofTree(node.move)
+    if node.children is None:   # a won position
+        return tree
+    if node.attacker_to_move:
+        tree.children.append(_extract_proof_tree(next(child for child in node.children if child.proven)))
+    else:
+        tree.children.extend(_extract_proof_tree(child) for child in node.children)
+    return tree
+
+
+def _subtree_size(node: ProofNode) -> int:
+    if node.children is None:
+        return 1
+    return 1 + sum(_subtree_size(child) for child in node.children)
+
+
+class ProofNumberSearch:
+    # Best-first proof-number search for a forced win of the attacker, by entering the
+    # enemy cave or any other win of AnimalChessBoard.winner, within max_plies plies if
+    # given. A position repeated along a line counts as a failure of the attacker.
+    # Disproven subtrees are freed as the search goes; max_tree_nodes bounds the
+    # nodes held in memory and max_expansions the work.
+    def __init__(
+            self,
+            max_plies: Optional[int] = None,
+            max_expansions: Optional[int] = 100_000,
+            max_tree_nodes: Optional[int] = 1_000_000
+    ):
+        self._max_plies = max_plies
+        self._max_expansions = max_expansions
+        self._max_tree_nodes = max_tree_nodes
+        self._stats = SearchStats()
+
+    @property
+    def stats(self) -> SearchStats:     # of the last solve: the nodes created and the time
+        return self._stats
+
+    def _evaluate(self, node: ProofNode, board: AnimalChessBoard, attacker: int, plies: int, path: set[int]) -> None:
+        # sets the proof numbers of a new node
+        winner = board.winner
+        if winner is not None:
+            node.proof, node.disproof = (0, INFINITE_PROOF) if winner == attacker else (INFINITE_PROOF, 0)
+        elif (self._max_plies is not None and plies >= self._max_plies) or node.position_hash in path:
+            node.proof, node.disproof = INFINITE_PROOF, 0
+
+    def _expand(self, node: ProofNode, board: AnimalChessBoard, attacker: int, plies: int, path: set[int]) -> int:
+        # returns the number of nodes created
+        player_id = board.current_player_id
+        node.children = []
+        for move in board.iterate_legal_moves(player_id):
+            child_board = board.clone()
+            child_board.move_piece(player_id, *move)
+            child = ProofNode(move, child_board.position_hash, child_board.current_player_id == attacker, node)
+            self._evaluate(child, child_board, attacker, plies + 1, path)
+            node.children.append(child)
+        return len(node.children)
+
+    def solve(self, board: AnimalChessBoard, attacker: Optional[Literal[0, 1]] = None) -> ProofResult:
+        start_time = time.perf_counter()
+        self._stats = SearchStats()
+        attacker = board.current_player_id if attacker is None else attacker
+        root = ProofNode(None, board.position_hash, board.current_player_id == attacker)
+        self._evaluate(root, board, attacker, 0, set())
+        num_nodes, tree_nodes, expansions = 1, 1, 0
+
+        while not root.proven and not root.disproven:
+            if self._max_expansions is not None and expansions >= self._max_expansions:
+                break
+            if self._max_tree_nodes is not None and tree_nodes >= self._max_tree_nodes:
+                break
+
+            # descend to the most-proving node, replaying the moves
+            node, node_board, path = root, board.clone(), {root.position_hash}
+            plies = 0
+            while node.children is not None:
+                if node.attacker_to_move:
+                    node = min(node.children, key=lambda child: child.proof)
+                else:
+                    node = min(node.children, key=lambda child: child.disproof)
+                node_board.move_piece(node_board.current_player_id, *node.move)
+                path.add(node.position_hash)
+                plies += 1
+
+            created = self._expand(node, node_board, attacker, plies, path)
+            num_nodes += created
+            tree_nodes += created
+            expansions += 1
+
+            # update the ancestors, freeing the subtrees that cannot be part of a proof
+            while node is not None:
+                node._update()
+                if node.disproven and node.children:
+                    tree_nodes -= _subtree_size(node) - 1
+                    node.children = []
+                node = node.parent
+
+        self._stats.nodes = num_nodes
+        self._stats.time = time.perf_counter() - start_time
+        status = PROVEN if root.proven else DISPROVEN if root.disproven else UNKNOWN
+        return ProofResult(status, attacker, root, num_nodes, expansions)
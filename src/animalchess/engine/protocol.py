@@ -0,0 +1,213 @@
+
+from typing import Optional, TextIO
+import threading
+import sys
+
+from loguru import logger
+
+from ..chess.board import AnimalChessBoard
+from ..chess.player import Player
+from ..chess.notation import board_from_notation, move_to_string, string_to_move
+from .evaluation import WIN_SCORE
+from .search import SearchEngine, SearchLimits, SearchInfo, Move, is_win_score
+
+
+ENGINE_NAME = "animalchess"
+ENGINE_AUTHOR = "Kwan Yuet Stephen Ho"
+
+
+def pv_to_strings(board: AnimalChessBoard, pv: list[Move]) -> list[str]:
+    board = board.clone()
+    move_strings = []
+    for animal, destination in pv:
+        player_id = board.current_player_id
+        move_strings.append(move_to_string(board, player_id, animal, destination))
+        board.move_piece(player_id, animal, destination)
+    return move_strings
+
+
+def format_score(score: int) -> str:
+    if is_win_score(score):
+        plies = WIN_SCORE - abs(score)
+        moves = (plies + 1) // 2
+        return f"mate {moves if score > 0 else -moves}"
+    return f"cp {score}"
+
+
+class EngineProtocol:
+    # UCI-style line protocol:
+    #   uci | isready | ucinewgame
+    #   position (startpos | fen <notation>) [moves <move> ...]
+    #   go [depth <n>] [movetime <ms>] [nodes <n>] [multipv <n>] [infinite]
+    # With infinite, the search runs until stop, which the best move then answers.
+    #   stop | quit
+    # Moves are written as the initial and final squares, e.g. "a3a4".
+    def __init__(
+            self,
+            input_stream: TextIO,
+            output_stream: TextIO,
+            engine: Optional[SearchEngine] = None
+    ):
+        self._input = input_stream
+        self._output = output_stream
+        self._output_lock = threading.Lock()
+        self._engine = SearchEngine() if engine is None else engine
+        self._player0 = Player("player0")
+        self._player1 = Player("player1")
+        self._board = AnimalChessBoard(self._player0, self._player1)
+        self._search_thread: Optional[threading.Thread] = None
+        self._search_stop_event: Optional[threading.Event] = None
+        self._running = True
+        self._commands = {
+            "uci": self._uci,
+            "isready": self._isready,
+            "ucinewgame": self._new_game,
+            "position": self._position,
+            "go": self._go,
+            "stop": self._stop,
+            "quit": self._quit
+        }
+
+    def send(self, line: str) -> None:
+        with self._output_lock:
+            self._output.write(line + "\n")
+            self._output.flush()
+
+    def handle_line(self, line: str) -> bool:    # returns False after "quit"
+        tokens = line.split()
+        if len(tokens) > 0:
+            handler = self._commands.get(tokens[0])
+            if handler is None:
+                self.send(f"info string unknown command {tokens[0]}")
+            else:
+                handler(tokens[1:])
+        return self._running
+
+    def run(self) -> None:
+        for line in self._input:
+            if not self.handle_line(line):
+                break
+        self._stop([])
+
+    def _uci(self, arguments: list[str]) -> None:
+        self.send(f"id name {ENGINE_NAME}")
+        self.send(f"id author {ENGINE_AUTHOR}")
+        self.send("uciok")
+
+    def _isready(self, arguments: list[str]) -> None:
+        self.send("readyok")
+
+    def _new_game(self, arguments: list[str]) -> None:
+        self._stop([])
+        self._engine.new_game()
+        self._board = AnimalChessBoard(self._player0, self._player1)
+
+    def _position(self, arguments: list[str]) -> None:
+        self._stop([])
+        if len(arguments) == 0:
+            self.send("info string missing position")
+            return
+
+        if "moves" in arguments:
+            moves_index = arguments.index("moves")
+            position_arguments, move_strings = arguments[:moves_index], arguments[moves_index+1:]
+        else:
+            position_arguments, move_strings = arguments, []
+
+        if position_arguments[0] == "startpos":
+            board = AnimalChessBoard(self._player0, self._player1)
+        elif position_arguments[0] == "fen":
+            try:
+                board = board_from_notation(" ".join(position_arguments[1:]), self._player0, self._player1)
+            except ValueError as e:
+                self.send(f"info string invalid position: {e}")
+                return
+        else:
+            self.send(f"info string unknown position type {position_arguments[0]}")
+            return
+
+        for move_string in move_strings:
+            player_id = board.current_player_id
+            try:
+                animal, destination = string_to_move(board, player_id, move_string)
+            except ValueError:
+                animal, destination = None, None
+            if animal is None or not board.move_piece(player_id, animal, destination):
+                self.send(f"info string illegal move {move_string}")
+                break
+        self._board = board
+
+    def _parse_limits(self, arguments: list[str]) -> SearchLimits:
+        limits = SearchLimits()
+        tokens = iter(arguments)
+        for token in tokens:
+            if token == "depth":
+                limits.depth = int(next(tokens))
+            elif token == "movetime":
+                limits.movetime = int(next(tokens)) / 1000
+            elif token == "nodes":
+                limits.nodes = int(next(tokens))
+            elif token == "multipv":
+                limits.multipv = int(next(tokens))
+            elif token == "infinite":
+                limits.infinite = True
+        return limits
+
+    def _send_info(self, board: AnimalChessBoard, info: SearchInfo, show_multipv: bool = False) -> None:
+        self.send(
+            f"info depth {info.depth}{f' multipv {info.multipv}' if show_multipv else ''} score {format_score(info.score)} nodes {info.nodes} "
+            f"nps {info.nps} time {int(info.time * 1000)} pv {' '.join(pv_to_strings(board, info.pv))}"
+        )
+
+    def _search(self, board: AnimalChessBoard, limits: SearchLimits, stop_event: threading.Event) -> None:
+        # bestmove is always sent, even if the search fails, so that the GUI does not wait forever
+        result = None
+        try:
+            result = self._engine.search(
+                board,
+                limits,
+                on_info=lambda info: self._send_info(board, info, limits.multipv > 1),
+                stop_event=stop_event
+            )
+            if limits.infinite:
+                stop_event.wait()   # bestmove is only sent after stop, even if the search ended
+        except Exception as e:
+            self.send(f"info string search failed: {e}")
+        finally:
+            if result is None or result.best_move is None:
+                self.send("bestmove (none)")
+            else:
+                self.send(f"bestmove {move_to_string(board, board.current_player_id, *result.best_move)}")
+
+    def _go(self, arguments: list[str]) -> None:
+        self._stop([])
+        try:
+            limits = self._parse_limits(arguments)
+        except (ValueError, StopIteration):
+            self.send("info string invalid search limits")
+            return
+        self._search_stop_event = threading.Event()
+        self._search_thread = threading.Thread(
+            target=self._search,
+            args=(self._board.clone(), limits, self._search_stop_event),
+            daemon=True
+        )
+        self._search_thread.start()
+
+    def _stop(self, arguments: list[str]) -> None:
+        if self._search_thread is not None:
+            self._search_stop_event.set()
+            self._search_thread.join()
+            self._search_thread, self._search_stop_event = None, None
+
+    def _quit(self, arguments: list[str]) -> None:
+        self._running = False
+
+
+def main() -> None:
+    logger.disable("animalchess")     # the rule engine logs every move
+    EngineProtocol(sys.stdin, sys.stdout).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,532 @@
+
+from typing import Optional, Callable, AsyncGenerator
+from dataclasses import dataclass, field
+import asyncio
+import random
+import threading
+import time
+
+from ..chess.board import AnimalChessBoard
+from ..chess.utils import AnimalType, SquareType
+from ..chess.history import DrawRules
+from .evaluation import evaluate, ANIMAL_VALUES, WIN_SCORE
+from .transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from .stats import SearchStats, IterationStats
+from ..chess.distances import can_reach_cave
+
+
+Move = tuple[AnimalType, tuple[int, int]]
+
+MAX_PLY = 128
+INFINITY = WIN_SCORE + MAX_PLY + 1
+DELTA_MARGIN = 200      # positional swing allowed on top of the captured material in delta pruning
+
+
+@dataclass
+class SearchLimits:
+    depth: Optional[int] = None
+    movetime: Optional[float] = None    # in seconds
+    nodes: Optional[int] = None
+    multipv: int = 1    # number of principal variations reported per iteration
+    infinite: bool = False  # the result is only wanted after a stop, however early the search ends
+
+
+@dataclass
+class SearchInfo:
+    depth: int
+    score: int
+    nodes: int
+    time: float     # in seconds
+    pv: list[Move] = field(default_factory=list)
+    multipv: int = 1    # rank of the variation, starting from 1
+
+    @property
+    def nps(self) -> int:
+        return int(self.nodes / self.time) if self.time > 0 else 0
+
+
+@dataclass
+class SearchResult:
+    best_move: Optional[Move]
+    score: int
+    depth: int
+    nodes: int
+    pv: list[Move] = field(default_factory=list)
+
+
+class SearchAborted(Exception):
+    pass
+
+
+def is_win_score(score: int) -> bool:
+    return abs(score) > WIN_SCORE - MAX_PLY
+
+
+def _score_to_table(score: int, ply: int) -> int:
+    # win scores are stored relative to the node, not to the root
+    if is_win_score(score):
+        return score + ply if score > 0 else score - ply
+    return score
+
+
+def _score_from_table(score: int, ply: int) -> int:
+    if is_win_score(score):
+        return score - ply if score > 0 else score + ply
+    return score
+
+
+class SearchEngine:
+    def __init__(
+            self,
+            max_depth: int = 64,
+            draw_rules: Optional[DrawRules] = None,
+            transposition_table: Optional[TranspositionTable] = None,
+            move_order_seed: Optional[int] = None,  # breaks ties in move ordering randomly, for parallel helpers
+            quiescence_depth: int = 8               # plies of captures searched beyond the nominal depth, 0 to disable
+    ):
+        self._max_depth = min(max_depth, MAX_PLY)
+        self._quiescence_depth = quiescence_depth
+        self._move_order_rng = None if move_order_seed is None else random.Random(move_order_seed)
+        self._draw_rules = DrawRules() if draw_rules is None else draw_rules
+        self._transposition_table = TranspositionTable() if transposition_table is None else transposition_table
+        self._stop_event = threading.Event()     # set by stop(), cleared when a search starts
+        self._search_stop_event = None              # the caller's event of the running search
+        self._search_lock = threading.Lock()        # held by the running search, as its state is per engine
+        self._nodes = 0
+        self._deadline = None
+        self._node_limit = None
+        self._previous_pv = []
+        self._stats = SearchStats()
+
+        # pondering
+        self._expected_reply_hash = None    # the position after the best move of the last search
+        self._expected_reply = None
+        self._ponder_thread = None
+        self._ponder_stop_event = None
+        self._ponder_hash = None
+        self._ponder_result = None
+
+    @property
+    def transposition_table(self) -> TranspositionTable:
+        return self._transposition_table
+
+    @property
+    def stats(self) -> SearchStats:     # of the last search
+        return self._stats
+
+    @property
+    def pondering(self) -> bool:
+        return self._ponder_thread is not None
+
+    def stop(self) -> None:     # stops the running search, if any
+        self._stop_event.set()
+
+    def new_game(self) -> None:
+        self.stop_pondering()
+        self._transposition_table.clear()
+        self._expected_reply_hash = None
+        self._expected_reply = None
+
+    def _check_limits(self) -> None:
+        if self._stop_event.is_set() or (self._search_stop_event is not None and self._search_stop_event.is_set()):
+            raise SearchAborted()
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchAborted()
+        if self._node_limit is not None and self._nodes >= self._node_limit:
+            raise SearchAborted()
+
+    def _order_moves(
+            self,
+            board: AnimalChessBoard,
+            moves: list[Move],
+            ply: int,
+            table_move: Optional[Move] = None
+    ) -> list[Move]:
+        pv_move = self._previous_pv[ply] if ply < len(self._previous_pv) else None
+
+        def move_priority(move: Move) -> int:
+            animal, destination = move
+            if move == pv_move:
+                return -4 * WIN_SCORE
+            if move == table_move:
+                return -3 * WIN_SCORE
+            if board._map.get_square_type(*destination) in {SquareType.CAVE0, SquareType.CAVE1}:
+                return -2 * WIN_SCORE
+            victim = board._board[*destination]
+            if victim is not None:
+                return ANIMAL_VALUES[animal] - 10 * ANIMAL_VALUES[victim.animal_type]
+            return 0
+
+        if self._move_order_rng is not None:
+            tie_breaks = {move: self._move_order_rng.random() for move in moves}
+            return sorted(moves, key=lambda move: (move_priority(move), tie_breaks[move]))
+        return sorted(moves, key=move_priority)
+
+    def _negamax(
+            self,
+            board: AnimalChessBoard,
+            depth: int,
+            alpha: int,
+            beta: int,
+            ply: int,
+            excluded_moves: Optional[list[Move]] = None     # root moves already reported
+    ) -> tuple[int, list[Move]]:
+        self._nodes += 1
+        if self._nodes & 255 == 0:
+            self._check_limits()
+
+        player_id = board.current_player_id
+        winner = board.winner
+        if winner is not None:
+            return (WIN_SCORE - ply if winner == player_id else ply - WIN_SCORE), []
+        if ply > 0:
+            # a position repeated within the search is treated as a draw, which prunes cycles
+            history = board.history
+            if history.count(board.position_hash) > 1 or history.is_draw(self._draw_rules):
+                return 0, []
+        if depth <= 0 and self._quiescence_depth > 0:
+            return self._quiescence(board, alpha, beta, ply, self._quiescence_depth)
+        if depth <= 0 or ply >= MAX_PLY:
+            return evaluate(board, player_id), []
+
+        key = board.position_hash
+        entry = self._transposition_table.probe(key)
+        table_move = None
+        if entry is None:
+            self._stats.transposition_misses += 1
+        else:
+            self._stats.transposition_hits += 1
+            table_move = entry.best_move
+            if ply > 0 and entry.depth >= depth:
+                score = _score_from_table(entry.score, ply)
+                pv = [] if table_move is None else [table_move]
+                if entry.flag == EXACT:
+                    return score, pv
+                if entry.flag == LOWER_BOUND and score >= beta:
+                    return score, pv
+                if entry.flag == UPPER_BOUND and score <= alpha:
+                    return score, pv
+
+        moves = self._order_moves(board, list(board.iterate_legal_moves(player_id)), ply, table_move)
+        if excluded_moves:
+            moves = [move for move in moves if move not in excluded_moves]
+        if len(moves) == 0:     # no legal moves: the player loses
+            return ply - WIN_SCORE, []
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_pv = []
+        for move_index, move in enumerate(moves):
+            child = board.clone()
+            child.move_piece(player_id, *move)
+            score, child_pv = self._negamax(child, depth-1, -beta, -alpha, ply+1)
+            score = -score
+            if score > best_score:
+                best_score = score
+                best_pv = [move] + child_pv
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self._stats.record_cutoff(move_index)
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        if not excluded_moves and self._transposition_table.store(
+                key, depth, _score_to_table(best_score, ply), flag, best_pv[0]
+        ):
+            self._stats.transposition_overwrites += 1
+        return best_score, best_pv
+
+    def _quiescence(
+            self,
+            board: AnimalChessBoard,
+            alpha: int,
+            beta: int,
+            ply: int,
+            depth: int
+    ) -> tuple[int, list[Move]]:
+        # Searches captures and cave entries only, so that the leaves are not evaluated
+        # in the middle of an exchange. The side to move may stand pat on the static
+        # evaluation, unless the opponent threatens to enter its cave on the next move,
+        # in which case all the moves are searched. Captures that cannot raise alpha
+        # even with a margin (delta pruning) or that lose material in the exchange on
+        # their square are skipped.
+        self._nodes += 1
+        self._stats.quiescence_nodes += 1
+        if self._nodes & 255 == 0:
+            self._check_limits()
+
+        player_id = board.current_player_id
+        winner = board.winner
+        if winner is not None:
+            return (WIN_SCORE - ply if winner == player_id else ply - WIN_SCORE), []
+        stand_pat = evaluate(board, player_id)
+        if depth <= 0 or ply >= MAX_PLY:
+            return stand_pat, []
+
+        threatened = can_reach_cave(board, 1 - player_id, 1)
+        if threatened:
+            best_score = -INFINITY
+        else:
+            if stand_pat >= beta:
+                return stand_pat, []
+            best_score = stand_pat
+            alpha = max(alpha, stand_pat)
+
+        moves = []
+        for move in self._order_moves(board, list(board.iterate_legal_moves(player_id)), ply):
+            animal, destination = move
+            if board._map.get_square_type(*destination) in {SquareType.CAVE0, SquareType.CAVE1}:
+                return WIN_SCORE - ply - 1, [move]
+            if threatened:
+                moves.append(move)
+                continue
+            victim = board._board[*destination]
+            if victim is None:
+                continue
+            if stand_pat + ANIMAL_VALUES[victim.animal_type] + DELTA_MARGIN <= alpha:
+                continue
+            if board.static_exchange(destination, player_id, animal, ANIMAL_VALUES) < 0:
+                continue
+            moves.append(move)
+        if threatened and len(moves) == 0:
+            return ply - WIN_SCORE, []
+
+        best_pv = []
+        for move in moves:
+            child = board.clone()
+            child.move_piece(player_id, *move)
+            score, child_pv = self._quiescence(child, -beta, -alpha, ply+1, depth-1)
+            score = -score
+            if score > best_score:
+                best_score = score
+                best_pv = [move] + child_pv
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+        return best_score, best_pv
+
+    def _iterative_deepening(
+            self,
+            board: AnimalChessBoard,
+            limits: SearchLimits,
+            on_info: Optional[Callable[[SearchInfo], None]] = None,
+            initial_result: Optional[SearchResult] = None,
+            stop_event: Optional[threading.Event] = None
+    ) -> SearchResult:
+        # one search at a time: the node count, limits and statistics are those of the
+        # engine; use another engine, e.g. through ParallelSearch, to search concurrently
+        if not self._search_lock.acquire(blocking=False):
+            raise ValueError("A search is already running on this engine.")
+        try:
+            return self._locked_iterative_deepening(board, limits, on_info, initial_result, stop_event)
+        finally:
+            self._search_lock.release()
+
+    def _locked_iterative_deepening(
+            self,
+            board: AnimalChessBoard,
+            limits: SearchLimits,
+            on_info: Optional[Callable[[SearchInfo], None]],
+            initial_result: Optional[SearchResult],
+            stop_event: Optional[threading.Event]
+    ) -> SearchResult:
+        # a stop() that came in before the search does not apply to it, unlike the
+        # caller's stop_event, which may be set before the search starts
+        self._stop_event.clear()
+        self._search_stop_event = stop_event
+        start_time = time.perf_counter()
+        self._deadline = None if limits.movetime is None else start_time + limits.movetime
+        self._node_limit = limits.nodes
+        self._nodes = 0
+        self._stats = SearchStats()
+        max_depth = self._max_depth if limits.depth is None else min(limits.depth, self._max_depth)
+
+        if initial_result is None:
+            result = SearchResult(None, 0, 0, 0)
+            self._previous_pv = []
+        else:
+            result = initial_result
+            self._previous_pv = initial_result.pv
+        try:
+            for depth in range(1, max_depth+1):
+                iteration_start_time, iteration_start_nodes = time.perf_counter(), self._nodes
+                try:
+                    self._check_limits()
+                    score, pv = self._negamax(board, depth, -INFINITY, INFINITY, 0)
+                except SearchAborted:
+                    break
+                self._stats.iterations.append(IterationStats(
+                    depth,
+                    self._nodes - iteration_start_nodes,
+                    time.perf_counter() - iteration_start_time
+                ))
+                self._previous_pv = pv
+                if depth >= result.depth:
+                    result = SearchResult(pv[0] if len(pv) > 0 else None, score, depth, self._nodes, pv)
+                if on_info is not None:
+                    on_info(SearchInfo(depth, score, self._nodes, time.perf_counter() - start_time, pv))
+                    if limits.multipv > 1 and len(pv) > 0:
+                        try:
+                            self._report_other_variations(board, depth, limits.multipv, [pv[0]], on_info, start_time)
+                        except SearchAborted:
+                            break
+                if len(pv) == 0 or is_win_score(score):
+                    break
+        finally:
+            self._stop_event.clear()
+            self._search_stop_event = None
+
+        if result.best_move is None:    # stopped before completing the first iteration
+            result.best_move = next(board.iterate_legal_moves(board.current_player_id), None)
+        result.nodes = self._nodes
+        self._stats.nodes = self._nodes
+        self._stats.time = time.perf_counter() - start_time
+        return result
+
+    def _report_other_variations(
+            self,
+            board: AnimalChessBoard,
+            depth: int,
+            multipv: int,
+            excluded_moves: list[Move],
+            on_info: Callable[[SearchInfo], None],
+            start_time: float
+    ) -> None:
+        # the best line without the root moves of the better lines, one at a time
+        for rank in range(2, multipv+1):
+            score, pv = self._negamax(board, depth, -INFINITY, INFINITY, 0, excluded_moves)
+            if len(pv) == 0:
+                return
+            excluded_moves.append(pv[0])
+            on_info(SearchInfo(depth, score, self._nodes, time.perf_counter() - start_time, pv, rank))
+
+    def search(
+            self,
+            board: AnimalChessBoard,
+            limits: Optional[SearchLimits] = None,
+            on_info: Optional[Callable[[SearchInfo], None]] = None,
+            stop_event: Optional[threading.Event] = None    # stops this search only, even if set before it starts
+    ) -> SearchResult:
+        if limits is None:
+            limits = SearchLimits()
+
+        # on a ponder hit, the search starts from the pondered result and the table it
+        # filled; on a miss, the pondered result is discarded
+        ponder_hash = self._ponder_hash
+        ponder_result = self.stop_pondering()
+        if ponder_result is not None and (ponder_hash != board.position_hash or ponder_result.best_move is None):
+            ponder_result = None
+        if ponder_result is not None and limits.depth is not None and ponder_result.depth >= limits.depth:
+            result = ponder_result
+        else:
+            result = self._iterative_deepening(board, limits, on_info, ponder_result, stop_event)
+
+        self._expected_reply_hash, self._expected_reply = None, None
+        if result.best_move is not None:
+            child = board.clone()
+            child.move_piece(board.current_player_id, *result.best_move)
+            self._expected_reply_hash = child.position_hash
+            self._expected_reply = result.pv[1] if len(result.pv) > 1 else None
+        return result
+
+    async def analyze(
+            self,
+            board: AnimalChessBoard,
+            limits: Optional[SearchLimits] = None
+    ) -> AsyncGenerator[SearchInfo, None]:
+        # yields the result of each iteration (each variation with limits.multipv > 1)
+        # as it completes; the search runs on a worker thread and stops as soon as
+        # the generator is closed or the consuming task is cancelled
+        board = board.clone()
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        finished = object()
+        stop_event = threading.Event()
+        errors = []
+
+        def run() -> None:
+            try:
+                self.search(
+                    board,
+                    limits,
+                    on_info=lambda info: loop.call_soon_threadsafe(queue.put_nowait, info),
+                    stop_event=stop_event
+                )
+            except ValueError as e:     # e.g. another search running on the engine
+                errors.append(e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, finished)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        try:
+            while (info := await queue.get()) is not finished:
+                yield info
+        finally:
+            stop_event.set()
+            await asyncio.to_thread(thread.join)
+        if len(errors) > 0:
+            raise errors[0]
+
+    def _guess_reply(self, board: AnimalChessBoard) -> Optional[Move]:
+        # the reply predicted by the last search, or else the best move in the table,
+        # or else the result of a shallow search
+        player_id = board.current_player_id
+        legal_moves = list(board.iterate_legal_moves(player_id))
+        if board.position_hash == self._expected_reply_hash and self._expected_reply in legal_moves:
+            return self._expected_reply
+        entry = self._transposition_table.probe(board.position_hash)
+        if entry is not None and entry.best_move in legal_moves:
+            return entry.best_move
+        if len(legal_moves) == 0:
+            return None
+        stats = self._stats     # of the last search, which the shallow search must not replace
+        try:
+            return self._iterative_deepening(board, SearchLimits(depth=2)).best_move
+        finally:
+            self._stats = stats
+
+    def _ponder(self, board: AnimalChessBoard, stop_event: threading.Event) -> None:
+        self._ponder_result = self._iterative_deepening(board, SearchLimits(), stop_event=stop_event)
+
+    def start_pondering(self, board: AnimalChessBoard) -> Optional[Move]:
+        # board is the position with the opponent to move; the engine plays the guessed
+        # reply and searches the resulting position until stop_pondering or search is
+        # called. Returns the guessed reply, or None if there is nothing to ponder.
+        self.stop_pondering()
+        if board.winner is not None:
+            return None
+        reply = self._guess_reply(board)
+        if reply is None:
+            return None
+        ponder_board = board.clone()
+        ponder_board.move_piece(board.current_player_id, *reply)
+        if ponder_board.winner is not None:
+            return None
+        self._ponder_hash = ponder_board.position_hash
+        self._ponder_stop_event = threading.Event()
+        self._ponder_thread = threading.Thread(
+            target=self._ponder,
+            args=(ponder_board, self._ponder_stop_event),
+            daemon=True
+        )
+        self._ponder_thread.start()
+        return reply
+
+    def stop_pondering(self) -> Optional[SearchResult]:
+        # returns the result of the pondering search, or None if not pondering
+        if self._ponder_thread is None:
+            return None
+        self._ponder_stop_event.set()
+        self._ponder_thread.join()
+        result = self._ponder_result
+        self._ponder_thread, self._ponder_stop_event = None, None
+        self._ponder_hash, self._ponder_result = None, None
+        return result
@@ -0,0 +1,202 @@
+
+from typing import Optional, Callable
+import multiprocessing as mp
+import os
+import copy
+import queue
+import sys
+import threading
+
+from loguru import logger
+
+from ..chess.board import AnimalChessBoard
+from ..chess.player import Player
+from ..chess.history import DrawRules
+from .search import SearchEngine, SearchLimits, SearchInfo, SearchResult
+from .stats import SearchStats
+from .transposition import StripedTranspositionTable
+
+
+HELPER_RESULT_TIMEOUT = 30.0    # in seconds, once the helpers are asked to stop
+
+
+def gil_enabled() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def _process_helper(
+        packed_position: bytes,
+        limits: SearchLimits,
+        max_depth: int,
+        draw_rules: DrawRules,
+        seed: int,
+        stop_event,
+        results
+) -> None:
+    logger.disable("animalchess")     # the rule engine logs every move
+    board = AnimalChessBoard.from_bytes(packed_position, Player("player0"), Player("player1"))
+    engine = SearchEngine(max_depth, draw_rules, move_order_seed=seed)
+    result = engine.search(board, limits, stop_event=stop_event)
+    results.put((result, engine.stats))
+
+
+class ParallelSearch:
+    # Lazy SMP: the main search and num_workers - 1 helpers search the same root, the
+    # helpers with randomly broken ties in move ordering so that they explore different
+    # parts of the tree first. Threads share a striped transposition table, through
+    # which the helpers' results speed up the main search; this scales on free-threaded
+    # builds. With the GIL, the helpers run in processes with their own tables, and only
+    # contribute their results, with the position but not its history.
+    def __init__(
+            self,
+            num_workers: Optional[int] = None,
+            max_depth: int = 64,
+            draw_rules: Optional[DrawRules] = None,
+            transposition_table: Optional[StripedTranspositionTable] = None,
+            use_threads: Optional[bool] = None      # default: threads on free-threaded builds only
+    ):
+        self._num_workers = (os.cpu_count() or 1) if num_workers is None else max(num_workers, 1)
+        self._max_depth = max_depth
+        self._draw_rules = DrawRules() if draw_rules is None else draw_rules
+        self._transposition_table = StripedTranspositionTable() if transposition_table is None else transposition_table
+        self._use_threads = not gil_enabled() if use_threads is None else use_threads
+        self._engine = SearchEngine(max_depth, self._draw_rules, self._transposition_table)
+        self._helpers: list[SearchEngine] = []
+        self._process_stop_event = None
+        self._stats = SearchStats()
+        self._lock = threading.Lock()
+
+    @property
+    def num_workers(self) -> int:
+        return self._num_workers
+
+    @property
+    def use_threads(self) -> bool:
+        return self._use_threads
+
+    @property
+    def transposition_table(self) -> StripedTranspositionTable:
+        return self._transposition_table
+
+    @property
+    def stats(self) -> SearchStats:
+        # of the last search: the counters of the main search and the helpers, with the
+        # time and iterations of the main search
+        return self._stats
+
+    def stop(self) -> None:
+        with self._lock:
+            self._engine.stop()
+            for helper in self._helpers:
+                helper.stop()
+            if self._process_stop_event is not None:
+                self._process_stop_event.set()
+
+    def _search_with_threads(
+            self,
+            board: AnimalChessBoard,
+            limits: SearchLimits,
+            on_info: Optional[Callable[[SearchInfo], None]]
+    ) -> list[tuple[SearchResult, SearchStats]]:
+        helper_limits = SearchLimits(limits.depth, limits.movetime)
+        helper_stop_event = threading.Event()
+        results = []
+        with self._lock:
+            self._helpers = [
+                SearchEngine(self._max_depth, self._draw_rules, self._transposition_table, move_order_seed=seed)
+                for seed in range(1, self._num_workers)
+            ]
+        threads = [
+            threading.Thread(
+                target=lambda helper=helper, root=board.clone():
+                    results.append((helper.search(root, helper_limits, stop_event=helper_stop_event), helper.stats))
+            )
+            for helper in self._helpers
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            main_result = self._engine.search(board, limits, on_info)
+        finally:
+            helper_stop_event.set()
+            for thread in threads:
+                thread.join()
+            with self._lock:
+                self._helpers = []
+        return [(main_result, self._engine.stats)] + results
+
+    def _search_with_processes(
+            self,
+            board: AnimalChessBoard,
+            limits: SearchLimits,
+            on_info: Optional[Callable[[SearchInfo], None]]
+    ) -> list[tuple[SearchResult, SearchStats]]:
+        helper_limits = SearchLimits(limits.depth, limits.movetime)
+        packed_position = board.to_bytes()
+        results = mp.Queue()
+        with self._lock:
+            self._process_stop_event = mp.Event()
+        processes = [
+            mp.Process(
+                target=_process_helper,
+                args=(
+                    packed_position,
+                    helper_limits,
+                    self._max_depth,
+                    self._draw_rules,
+                    seed,
+                    self._process_stop_event,
+                    results
+                ),
+                daemon=True
+            )
+            for seed in range(1, self._num_workers)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            main_result = self._engine.search(board, limits, on_info)
+        finally:
+            self._process_stop_event.set()
+            helper_results = []
+            for _ in processes:
+                try:
+                    helper_results.append(results.get(timeout=HELPER_RESULT_TIMEOUT))
+                except queue.Empty:     # a helper died
+                    break
+            for process in processes:
+                process.join()
+            with self._lock:
+                self._process_stop_event = None
+        return [(main_result, self._engine.stats)] + helper_results
+
+    def search(
+            self,
+            board: AnimalChessBoard,
+            limits: Optional[SearchLimits] = None,
+            on_info: Optional[Callable[[SearchInfo], None]] = None
+    ) -> SearchResult:
+        # the result of the deepest completed search, the main one on ties; on_info
+        # reports the iterations of the main search
+        if limits is None:
+            limits = SearchLimits()
+        if self._num_workers == 1:
+            result = self._engine.search(board, limits, on_info)
+            self._stats = copy.deepcopy(self._engine.stats)
+            return result
+        if self._use_threads:
+            results = self._search_with_threads(board, limits, on_info)
+        else:
+            results = self._search_with_processes(board, limits, on_info)
+
+        best_result = results[0][0]
+        for result, _ in results[1:]:
+            if result.best_move is not None and result.depth > best_result.depth:
+                best_result = result
+        stats = copy.deepcopy(results[0][1])
+        for _, helper_stats in results[1:]:
+            stats.add_counts(helper_stats)
+        self._stats = stats
+        best_result.nodes = stats.nodes
+        return best_result
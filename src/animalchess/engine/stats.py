@@ -0,0 +1,79 @@
+
+from typing import Iterable, TextIO, Any
+from dataclasses import dataclass, field, asdict
+import json
+
+
+@dataclass
+class IterationStats:
+    depth: int
+    nodes: int      # visited in this iteration
+    time: float     # in seconds
+
+
+@dataclass
+class SearchStats:
+    nodes: int = 0
+    quiescence_nodes: int = 0   # of the nodes, those visited in the quiescence search
+    time: float = 0.0       # in seconds
+    transposition_hits: int = 0
+    transposition_misses: int = 0
+    transposition_overwrites: int = 0   # entries of other positions replaced
+    cutoffs: list[int] = field(default_factory=list)    # beta cutoffs by the index of the move that caused it
+    iterations: list[IterationStats] = field(default_factory=list)
+
+    def record_cutoff(self, move_index: int) -> None:
+        if move_index >= len(self.cutoffs):
+            self.cutoffs.extend([0] * (move_index + 1 - len(self.cutoffs)))
+        self.cutoffs[move_index] += 1
+
+    def add_counts(self, other: "SearchStats") -> None:
+        # adds the counters of another search of the same position, e.g. a helper thread;
+        # the time and iterations are kept
+        self.nodes += other.nodes
+        self.quiescence_nodes += other.quiescence_nodes
+        self.transposition_hits += other.transposition_hits
+        self.transposition_misses += other.transposition_misses
+        self.transposition_overwrites += other.transposition_overwrites
+        for move_index, count in enumerate(other.cutoffs):
+            if move_index >= len(self.cutoffs):
+                self.cutoffs.append(0)
+            self.cutoffs[move_index] += count
+
+    @property
+    def nps(self) -> int:
+        return int(self.nodes / self.time) if self.time > 0 else 0
+
+    @property
+    def transposition_hit_rate(self) -> float:
+        probes = self.transposition_hits + self.transposition_misses
+        return self.transposition_hits / probes if probes > 0 else 0.0
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        # how often the first move searched was good enough, a measure of move ordering
+        total = sum(self.cutoffs)
+        return self.cutoffs[0] / total if total > 0 else 0.0
+
+    @property
+    def effective_branching_factor(self) -> float:
+        # ratio of the nodes of the last two completed iterations
+        if len(self.iterations) < 2 or self.iterations[-2].nodes == 0:
+            return 0.0
+        return self.iterations[-1].nodes / self.iterations[-2].nodes
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self) | {
+            "nps": self.nps,
+            "transposition_hit_rate": self.transposition_hit_rate,
+            "first_move_cutoff_rate": self.first_move_cutoff_rate,
+            "effective_branching_factor": self.effective_branching_factor
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+
+def write_json_lines(stats: Iterable[SearchStats], output: TextIO) -> None:
+    for search_stats in stats:
+        output.write(search_stats.to_json() + "\n")
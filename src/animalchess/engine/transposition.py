@@ -0,0 +1,82 @@
+
+from typing import Optional
+from dataclasses import dataclass
+import threading
+
+from ..chess.utils import AnimalType
+
+
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+@dataclass(slots=True)
+class TranspositionEntry:
+    key: int
+    depth: int
+    score: int
+    flag: int
+    best_move: Optional[tuple[AnimalType, tuple[int, int]]]
+
+
+class TranspositionTable:
+    def __init__(self, size: int = 1 << 18):
+        self._size = size
+        self._entries: list[Optional[TranspositionEntry]] = [None] * size
+
+    def probe(self, key: int) -> Optional[TranspositionEntry]:
+        entry = self._entries[key % self._size]
+        if entry is not None and entry.key == key:
+            return entry
+        return None
+
+    def store(
+            self,
+            key: int,
+            depth: int,
+            score: int,
+            flag: int,
+            best_move: Optional[tuple[AnimalType, tuple[int, int]]]
+    ) -> bool:  # whether an entry of another position was replaced
+        index = key % self._size
+        entry = self._entries[index]
+        if entry is None or entry.key != key or depth >= entry.depth:    # keep the deeper result of a position
+            self._entries[index] = TranspositionEntry(key, depth, score, flag, best_move)
+        return entry is not None and entry.key != key
+
+    def clear(self) -> None:
+        self._entries = [None] * self._size
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+
+class StripedTranspositionTable(TranspositionTable):
+    # Shareable between search threads, also on free-threaded builds. Entries are never
+    # modified once stored, so probes read a slot without locking, and stores lock one
+    # of num_stripes locks chosen by the slot.
+    def __init__(self, size: int = 1 << 18, num_stripes: int = 64):
+        super().__init__(size)
+        self._locks = [threading.Lock() for _ in range(num_stripes)]
+
+    def store(
+            self,
+            key: int,
+            depth: int,
+            score: int,
+            flag: int,
+            best_move: Optional[tuple[AnimalType, tuple[int, int]]]
+    ) -> bool:
+        with self._locks[key % self._size % len(self._locks)]:
+            return super().store(key, depth, score, flag, best_move)
+
+    def clear(self) -> None:
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            super().clear()
+        finally:
+            for lock in self._locks:
+                lock.release()
@@ -0,0 +1,151 @@
+
+from typing import Literal, Optional, Self
+from dataclasses import dataclass
+from os import PathLike
+
+import numpy as np
+import numpy.typing as npt
+
+from ..chess.board import AnimalChessBoard
+from ..chess.player import Player
+from ..chess.packing import PACKED_POSITION_SIZE
+from ..chess.actions import NUM_ACTIONS
+
+
+PRIORITY_EPSILON = 1e-6     # the lowest priority, so that every entry can be sampled
+
+
+@dataclass
+class ReplayBatch:
+    indices: npt.NDArray[np.int64]
+    positions: npt.NDArray[np.uint8]        # packed positions, see AnimalChessBoard.to_bytes
+    policies: npt.NDArray[np.float32]
+    outcomes: npt.NDArray[np.float32]
+    weights: npt.NDArray[np.float32]        # importance-sampling weights, all ones for uniform sampling
+
+
+class ReplayBuffer:
+    # Fixed-capacity store of self-play positions. When full, "fifo" overwrites the
+    # oldest entry, and "reservoir" keeps a uniform sample of everything ever added.
+    def __init__(
+            self,
+            capacity: int,
+            num_actions: int = NUM_ACTIONS,
+            eviction: Literal["fifo", "reservoir"] = "fifo",
+            seed: Optional[int] = None
+    ):
+        if eviction not in {"fifo", "reservoir"}:
+            raise ValueError(f"Unknown eviction policy: {eviction}")
+        self._capacity = capacity
+        self._eviction = eviction
+        self._positions = np.zeros((capacity, PACKED_POSITION_SIZE), dtype=np.uint8)
+        self._policies = np.zeros((capacity, num_actions), dtype=np.float32)
+        self._outcomes = np.zeros(capacity, dtype=np.float32)
+        self._priorities = np.zeros(capacity, dtype=np.float32)
+        self._size = 0
+        self._num_added = 0
+        self._rng = np.random.default_rng(seed)
+
+    def _next_index(self) -> Optional[int]:
+        if self._size < self._capacity:
+            return self._size
+        if self._eviction == "fifo":
+            return self._num_added % self._capacity
+        index = int(self._rng.integers(0, self._num_added + 1))
+        return index if index < self._capacity else None
+
+    def add_packed(
+            self,
+            position: bytes,
+            policy: npt.ArrayLike,
+            outcome: float,
+            priority: float = 1.0
+    ) -> Optional[int]:    # the index of the entry, or None if the reservoir rejected it
+        index = self._next_index()
+        self._num_added += 1
+        if index is None:
+            return None
+        self._positions[index] = np.frombuffer(position, dtype=np.uint8)
+        self._policies[index] = policy
+        self._outcomes[index] = outcome
+        self._priorities[index] = priority
+        self._size = max(self._size, index + 1)
+        return index
+
+    def add(
+            self,
+            board: AnimalChessBoard,
+            policy: npt.ArrayLike,
+            outcome: float,
+            priority: float = 1.0
+    ) -> Optional[int]:
+        return self.add_packed(board.to_bytes(), policy, outcome, priority)
+
+    def sample(
+            self,
+            batch_size: int,
+            prioritized: bool = False,
+            alpha: float = 1.0,
+            beta: float = 1.0
+    ) -> ReplayBatch:
+        if self._size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer.")
+        if prioritized:
+            probabilities = np.maximum(self._priorities[:self._size].astype(np.float64), PRIORITY_EPSILON) ** alpha
+            total = probabilities.sum()
+            if total > 0 and np.isfinite(total):
+                probabilities /= total
+            else:   # alpha took every priority to 0 or infinity
+                probabilities = np.full(self._size, 1 / self._size)
+            indices = self._rng.choice(self._size, size=batch_size, p=probabilities)
+            weights = (self._size * probabilities[indices]) ** -beta
+            weights = (weights / weights.max()).astype(np.float32)
+        else:
+            indices = self._rng.integers(0, self._size, size=batch_size)
+            weights = np.ones(batch_size, dtype=np.float32)
+        return ReplayBatch(
+            indices,
+            self._positions[indices],
+            self._policies[indices],
+            self._outcomes[indices],
+            weights
+        )
+
+    def update_priorities(self, indices: npt.ArrayLike, priorities: npt.ArrayLike) -> None:
+        self._priorities[indices] = priorities
+
+    def board(self, index: int, player0: Player, player1: Player) -> AnimalChessBoard:
+        return AnimalChessBoard.from_bytes(self._positions[index].tobytes(), player0, player1)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def save(self, path: str | PathLike) -> None:
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                positions=self._positions[:self._size],
+                policies=self._policies[:self._size],
+                outcomes=self._outcomes[:self._size],
+                priorities=self._priorities[:self._size],
+                metadata=np.array([self._capacity, self._num_added]),
+                eviction=np.array(self._eviction)
+            )
+
+    @classmethod
+    def load(cls, path: str | PathLike, seed: Optional[int] = None) -> Self:
+        with np.load(path) as data:
+            capacity, num_added = data["metadata"]
+            buffer = cls(int(capacity), data["policies"].shape[1], str(data["eviction"]), seed=seed)
+            size = len(data["positions"])
+            buffer._positions[:size] = data["positions"]
+            buffer._policies[:size] = data["policies"]
+            buffer._outcomes[:size] = data["outcomes"]
+            buffer._priorities[:size] = data["priorities"]
+            buffer._size = size
+            buffer._num_added = int(num_added)
+        return buffer
@@ -0,0 +1,287 @@
+
+from typing import Optional, Any
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+import multiprocessing as mp
+import weakref
+
+import numpy as np
+import numpy.typing as npt
+
+from ..chess.board import AnimalChessBoard
+from ..chess.player import Player
+from ..chess.history import DrawRules
+from ..chess.features import allocate_planes, NUM_PLANES
+from ..chess.actions import NUM_ACTIONS
+from ..chess.utils import BOARD_HEIGHT, BOARD_WIDTH
+
+
+WIN_REWARD = 1.0
+ILLEGAL_ACTION_REWARD = -1.0
+
+
+class AnimalChessVectorEnv:
+    # Steps num_envs self-play games in lock-step. Each action is played by the side
+    # to move of its game, and the reward is from the perspective of that player:
+    # WIN_REWARD for entering the enemy cave, capturing all enemy pieces or leaving
+    # the opponent without moves, ILLEGAL_ACTION_REWARD (and the end of the game)
+    # for an illegal action, and 0 otherwise, including draws. Finished games are
+    # reset to the initial layout automatically.
+    def __init__(
+            self,
+            num_envs: int,
+            draw_rules: Optional[DrawRules] = None,
+            observation_dtype: npt.DTypeLike = np.float32,
+            observations: Optional[npt.NDArray] = None,
+            masks: Optional[npt.NDArray[np.bool_]] = None,
+            rewards: Optional[npt.NDArray[np.float32]] = None,
+            dones: Optional[npt.NDArray[np.bool_]] = None
+    ):
+        self._num_envs = num_envs
+        self._draw_rules = DrawRules() if draw_rules is None else draw_rules
+        self._player0 = Player("player0")
+        self._player1 = Player("player1")
+        self._boards = [self._new_board() for _ in range(num_envs)]
+
+        # the output buffers are overwritten at each step
+        self._observations = allocate_planes(num_envs, observation_dtype) if observations is None else observations
+        self._masks = np.zeros((num_envs, NUM_ACTIONS), dtype=bool) if masks is None else masks
+        self._rewards = np.zeros(num_envs, dtype=np.float32) if rewards is None else rewards
+        self._dones = np.zeros(num_envs, dtype=bool) if dones is None else dones
+
+    def _new_board(self) -> AnimalChessBoard:
+        return AnimalChessBoard(self._player0, self._player1)
+
+    def _observe(self, env_id: int, mask: Optional[npt.NDArray[np.bool_]] = None) -> None:
+        board = self._boards[env_id]
+        board.to_planes(out=self._observations[env_id])
+        self._masks[env_id] = (board.legal_move_mask() if mask is None else mask).ravel()
+
+    @property
+    def num_envs(self) -> int:
+        return self._num_envs
+
+    @property
+    def boards(self) -> list[AnimalChessBoard]:
+        return self._boards
+
+    def reset(self) -> tuple[npt.NDArray, npt.NDArray[np.bool_]]:
+        for env_id in range(self._num_envs):
+            self._boards[env_id].reset()
+            self._observe(env_id)
+        self._rewards[:] = 0
+        self._dones[:] = False
+        return self._observations, self._masks
+
+    def _step_env(self, env_id: int, action_id: int) -> dict[str, Any]:
+        board = self._boards[env_id]
+        player_id = board.current_player_id
+        reward, done, info = 0.0, False, {}
+        mask = None     # of the position after the move, computed once for the check and the observation
+
+        legal = 0 <= action_id < NUM_ACTIONS and self._masks[env_id, action_id]
+        if legal:
+            animal, destination = board.action_to_move(action_id)
+            legal = board.move_piece(player_id, animal, destination)
+        if not legal:
+            reward, done = ILLEGAL_ACTION_REWARD, True
+            info["illegal_action"] = True
+            info["winner"] = 1 - player_id
+        elif board.winner is not None:
+            reward, done = (WIN_REWARD if board.winner == player_id else -WIN_REWARD), True
+            info["winner"] = board.winner
+        elif not (mask := board.legal_move_mask()).any():
+            reward, done = WIN_REWARD, True
+            info["winner"] = player_id
+        elif board.is_draw(self._draw_rules):
+            done = True
+            info["winner"] = None
+
+        if done:
+            info["plies"] = board.history.plies
+            board.reset()   # in place; clones taken by the caller are not affected
+            mask = None
+        self._rewards[env_id] = reward
+        self._dones[env_id] = done
+        self._observe(env_id, mask)
+        return info
+
+    def step(
+            self,
+            actions: npt.ArrayLike
+    ) -> tuple[npt.NDArray, npt.NDArray[np.float32], npt.NDArray[np.bool_], npt.NDArray[np.bool_], list[dict[str, Any]]]:
+        actions = np.asarray(actions)
+        if actions.shape != (self._num_envs,):
+            raise ValueError(f"Expected {self._num_envs} actions.")
+        infos = [self._step_env(env_id, int(action_id)) for env_id, action_id in enumerate(actions)]
+        return self._observations, self._rewards, self._dones, self._masks, infos
+
+
+def _shared_array(
+        shared_block: shared_memory.SharedMemory,
+        shape: tuple[int, ...],
+        dtype: npt.DTypeLike
+) -> npt.NDArray:
+    return np.ndarray(shape, dtype=dtype, buffer=shared_block.buf)
+
+
+class _SubprocessVectorEnvBuffers:
+    def __init__(self, blocks: dict[str, shared_memory.SharedMemory], num_envs: int, observation_dtype: npt.DTypeLike):
+        self.observations = _shared_array(blocks["observations"], (num_envs, NUM_PLANES, BOARD_HEIGHT, BOARD_WIDTH), observation_dtype)
+        self.masks = _shared_array(blocks["masks"], (num_envs, NUM_ACTIONS), np.bool_)
+        self.rewards = _shared_array(blocks["rewards"], (num_envs,), np.float32)
+        self.dones = _shared_array(blocks["dones"], (num_envs,), np.bool_)
+        self.actions = _shared_array(blocks["actions"], (num_envs,), np.int64)
+
+    @staticmethod
+    def sizes(num_envs: int, observation_dtype: npt.DTypeLike) -> dict[str, int]:
+        return {
+            "observations": num_envs * NUM_PLANES * BOARD_HEIGHT * BOARD_WIDTH * np.dtype(observation_dtype).itemsize,
+            "masks": num_envs * NUM_ACTIONS,
+            "rewards": num_envs * np.dtype(np.float32).itemsize,
+            "dones": num_envs,
+            "actions": num_envs * np.dtype(np.int64).itemsize
+        }
+
+
+def _worker(
+        connection: Connection,
+        block_names: dict[str, str],
+        num_envs: int,
+        start: int,
+        stop: int,
+        draw_rules: DrawRules,
+        observation_dtype: npt.DTypeLike
+) -> None:
+    blocks = {name: shared_memory.SharedMemory(name=block_name) for name, block_name in block_names.items()}
+    arrays = _SubprocessVectorEnvBuffers(blocks, num_envs, observation_dtype)
+    env = AnimalChessVectorEnv(
+        stop - start,
+        draw_rules=draw_rules,
+        observations=arrays.observations[start:stop],
+        masks=arrays.masks[start:stop],
+        rewards=arrays.rewards[start:stop],
+        dones=arrays.dones[start:stop]
+    )
+    try:
+        while True:
+            command = connection.recv()
+            if command == "reset":
+                env.reset()
+                connection.send(None)
+            elif command == "step":
+                _, _, _, _, infos = env.step(arrays.actions[start:stop])
+                connection.send(infos)
+            elif command == "close":
+                break
+    finally:
+        del env, arrays
+        for block in blocks.values():
+            block.close()
+        connection.close()
+
+
+def _close_workers(
+        connections: list[Connection],
+        processes: list[mp.Process],
+        blocks: dict[str, shared_memory.SharedMemory]
+) -> None:
+    # also run when a SubprocessVectorEnv is garbage collected without being closed, so
+    # that its shared memory blocks are not leaked
+    for connection in connections:
+        try:
+            connection.send("close")
+        except OSError:     # the worker is gone
+            pass
+    for process in processes:
+        process.join()
+    for connection in connections:
+        connection.close()
+    for block in blocks.values():
+        block.close()
+        block.unlink()
+
+
+class SubprocessVectorEnv:
+    # Same interface as AnimalChessVectorEnv, with the games sharded across worker
+    # processes. Observations, masks, rewards and done flags live in shared memory,
+    # and the returned arrays are views that are overwritten at each step.
+    def __init__(
+            self,
+            num_envs: int,
+            num_workers: Optional[int] = None,
+            draw_rules: Optional[DrawRules] = None,
+            observation_dtype: npt.DTypeLike = np.float32
+    ):
+        if num_workers is None:
+            num_workers = mp.cpu_count()
+        num_workers = max(1, min(num_workers, num_envs))
+        self._num_envs = num_envs
+        self._blocks = {
+            name: shared_memory.SharedMemory(create=True, size=max(size, 1))
+            for name, size in _SubprocessVectorEnvBuffers.sizes(num_envs, observation_dtype).items()
+        }
+        self._arrays = _SubprocessVectorEnvBuffers(self._blocks, num_envs, observation_dtype)
+
+        boundaries = np.linspace(0, num_envs, num_workers + 1).astype(int)
+        self._connections = []
+        self._processes = []
+        for start, stop in zip(boundaries[:-1], boundaries[1:]):
+            parent_connection, child_connection = mp.Pipe()
+            process = mp.Process(
+                target=_worker,
+                args=(
+                    child_connection,
+                    {name: block.name for name, block in self._blocks.items()},
+                    num_envs,
+                    start,
+                    stop,
+                    DrawRules() if draw_rules is None else draw_rules,
+                    observation_dtype
+                ),
+                daemon=True
+            )
+            process.start()
+            child_connection.close()
+            self._connections.append(parent_connection)
+            self._processes.append(process)
+        self._finalizer = weakref.finalize(self, _close_workers, self._connections, self._processes, self._blocks)
+
+    @property
+    def num_envs(self) -> int:
+        return self._num_envs
+
+    def reset(self) -> tuple[npt.NDArray, npt.NDArray[np.bool_]]:
+        for connection in self._connections:
+            connection.send("reset")
+        for connection in self._connections:
+            connection.recv()
+        return self._arrays.observations, self._arrays.masks
+
+    def step(
+            self,
+            actions: npt.ArrayLike
+    ) -> tuple[npt.NDArray, npt.NDArray[np.float32], npt.NDArray[np.bool_], npt.NDArray[np.bool_], list[dict[str, Any]]]:
+        actions = np.asarray(actions)
+        if actions.shape != (self._num_envs,):
+            raise ValueError(f"Expected {self._num_envs} actions.")
+        self._arrays.actions[:] = actions
+        for connection in self._connections:
+            connection.send("step")
+        infos = []
+        for connection in self._connections:
+            infos.extend(connection.recv())
+        arrays = self._arrays
+        return arrays.observations, arrays.rewards, arrays.dones, arrays.masks, infos
+
+    def close(self) -> None:
+        if not self._finalizer.alive:
+            return
+        del self._arrays    # the blocks cannot be closed while viewed
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,154 @@
+
+from typing import Literal, Optional, Callable
+from dataclasses import dataclass, field
+from collections import OrderedDict
+import asyncio
+import time
+import uuid
+
+from loguru import logger
+
+from ..chess.board import AnimalChessBoard
+from ..chess.history import DrawRules
+from ..chess.player import Player
+from ..chess.utils import AnimalType
+
+
+class GameNotFoundError(KeyError):
+    pass
+
+
+class NotYourTurnError(ValueError):
+    pass
+
+
+class GameOverError(ValueError):
+    pass
+
+
+@dataclass
+class GameSession:
+    game_id: str
+    board: AnimalChessBoard
+    last_activity: float
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class GameManager:
+    def __init__(
+            self,
+            idle_timeout: float = 600.0,     # in seconds
+            max_games: Optional[int] = None,
+            draw_rules: Optional[DrawRules] = None,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        self._idle_timeout = idle_timeout
+        self._draw_rules = DrawRules() if draw_rules is None else draw_rules
+        self._max_games = max_games
+        self._clock = clock
+        self._games: OrderedDict[str, GameSession] = OrderedDict()    # least recently active first
+        self._eviction_task: Optional[asyncio.Task] = None
+
+    def create_game(
+            self,
+            player0: Player,
+            player1: Player,
+            game_id: Optional[str] = None
+    ) -> str:
+        if game_id is None:
+            game_id = uuid.uuid4().hex
+        elif game_id in self._games:
+            raise ValueError(f"Game {game_id} already exists.")
+
+        if self._max_games is not None and len(self._games) >= self._max_games:
+            # the least recently active games, skipping those with a move in flight
+            evictable_game_ids = [
+                evictable_game_id
+                for evictable_game_id, session in self._games.items()
+                if not session.lock.locked()
+            ][:len(self._games) - self._max_games + 1]
+            if len(self._games) - len(evictable_game_ids) >= self._max_games:
+                raise ValueError("Too many games with moves in progress to make room for a new game.")
+            for evicted_game_id in evictable_game_ids:
+                del self._games[evicted_game_id]
+                logger.info(f"Evicting game {evicted_game_id} to make room.")
+
+        self._games[game_id] = GameSession(
+            game_id,
+            AnimalChessBoard(player0, player1),
+            self._clock()
+        )
+        return game_id
+
+    def _get_session(self, game_id: str) -> GameSession:
+        try:
+            return self._games[game_id]
+        except KeyError:
+            raise GameNotFoundError(game_id)
+
+    def get_board(self, game_id: str) -> AnimalChessBoard:
+        return self._get_session(game_id).board
+
+    def remove_game(self, game_id: str) -> None:
+        self._get_session(game_id)
+        del self._games[game_id]
+
+    async def submit_move(
+            self,
+            game_id: str,
+            player_id: Literal[0, 1],
+            animal: AnimalType,
+            destination: tuple[int, int]
+    ) -> bool:  # success: True; failed: False
+        session = self._get_session(game_id)
+        async with session.lock:
+            board = session.board
+            if board.winner is not None or board.is_draw(self._draw_rules):
+                raise GameOverError(f"Game {game_id} is over.")
+            if board.current_player_id != player_id:
+                raise NotYourTurnError(f"It is not the turn of player {player_id} in game {game_id}.")
+
+            success = board.move_piece(player_id, animal, destination)
+
+            session.last_activity = self._clock()
+            if game_id in self._games:      # may have been evicted while waiting for the lock
+                self._games.move_to_end(game_id)
+            return success
+
+    def evict_idle(self) -> list[str]:
+        deadline = self._clock() - self._idle_timeout
+        evicted_game_ids = []
+        for game_id, session in self._games.items():
+            if session.last_activity > deadline:
+                break
+            if not session.lock.locked():   # skipping the games with a move in flight
+                evicted_game_ids.append(game_id)
+        for game_id in evicted_game_ids:
+            del self._games[game_id]
+        if len(evicted_game_ids) > 0:
+            logger.info(f"Evicted {len(evicted_game_ids)} idle games.")
+        return evicted_game_ids
+
+    async def _evict_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self.evict_idle()
+
+    def start_eviction(self, interval: float = 60.0) -> None:
+        if self._eviction_task is None:
+            self._eviction_task = asyncio.get_running_loop().create_task(self._evict_periodically(interval))
+
+    async def stop_eviction(self) -> None:
+        if self._eviction_task is not None:
+            self._eviction_task.cancel()
+            try:
+                await self._eviction_task
+            except asyncio.CancelledError:
+                pass
+            self._eviction_task = None
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._games
@@ -0,0 +1,81 @@
+
+from typing import Callable, Any
+from dataclasses import dataclass, asdict
+import argparse
+import json
+import time
+
+from loguru import logger
+
+from ..chess.board import AnimalChessBoard
+from ..chess.player import Player
+from ..chess.utils import AnimalType
+from .memory import memory_report, format_memory_report
+
+
+@dataclass
+class Timing:
+    name: str
+    iterations: int
+    seconds: float
+
+    @property
+    def nanoseconds_per_call(self) -> float:
+        return self.seconds * 1e9 / self.iterations
+
+
+def time_calls(name: str, function: Callable[[Any], Any], inputs: list) -> Timing:
+    start_time = time.perf_counter()
+    for argument in inputs:
+        function(argument)
+    return Timing(name, len(inputs), time.perf_counter() - start_time)
+
+
+def run_timings(iterations: int = 10000) -> list[Timing]:
+    player0, player1 = Player("player0"), Player("player1")
+    board = AnimalChessBoard(player0, player1)
+    packed = board.to_bytes()
+    notation = board.to_notation()
+    repeats = [None] * iterations
+    return [
+        time_calls("construct", lambda _: AnimalChessBoard(player0, player1), repeats),
+        time_calls("clone", lambda _: board.clone(), repeats),
+        time_calls(
+            "move_piece",
+            lambda b: b.move_piece(0, AnimalType.RAT, (3, 0)),
+            [board.clone() for _ in range(iterations)]
+        ),
+        time_calls("iterate_legal_moves", lambda _: list(board.iterate_legal_moves(0)), repeats),
+        time_calls("legal_move_mask", lambda _: board.legal_move_mask(0), repeats),
+        time_calls("to_bytes", lambda _: board.to_bytes(), repeats),
+        time_calls("from_bytes", lambda _: AnimalChessBoard.from_bytes(packed, player0, player1), repeats),
+        time_calls("to_notation", lambda _: board.to_notation(), repeats),
+        time_calls("from_notation", lambda _: AnimalChessBoard.from_notation(notation, player0, player1), repeats),
+        time_calls("reset", lambda b: b.reset(packed), [AnimalChessBoard(player0, player1) for _ in range(iterations)])
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time the board operations and report the memory footprint of boards.")
+    parser.add_argument("--iterations", type=int, default=10000, help="calls per timed operation")
+    parser.add_argument("--boards", type=int, default=1000, help="boards in the memory aggregates")
+    parser.add_argument("--json", action="store_true", help="print one JSON object instead of tables")
+    args = parser.parse_args()
+
+    logger.disable("animalchess")     # the rule engine logs every move
+    timings = run_timings(args.iterations)
+    report = memory_report(args.boards)
+    if args.json:
+        print(json.dumps({
+            "timings": {timing.name: timing.nanoseconds_per_call for timing in timings},
+            "memory": asdict(report) | {"boards_per_gb": report.boards_per_gb, "clones_per_gb": report.clones_per_gb}
+        }))
+        return
+    for timing in timings:
+        print(f"{timing.name:<24}{timing.nanoseconds_per_call:>12.0f} ns")
+    print()
+    print(format_memory_report(report))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+
+from typing import Optional, Literal, Iterable, Generator, BinaryIO, TextIO
+from dataclasses import dataclass
+import argparse
+import heapq
+import struct
+import sys
+import tempfile
+
+from loguru import logger
+
+from ..chess.board import AnimalChessBoard
+from ..chess.player import Player
+from ..chess.packing import PACKED_POSITION_SIZE
+from ..chess.notation import string_to_move, board_to_notation
+
+
+@dataclass
+class GameRecord:
+    moves: list[str]                            # e.g. ["a3a4", "g7g6", ...]
+    winner: Optional[Literal[0, 1]] = None      # None for draws and unfinished games
+
+
+@dataclass
+class PositionStatistics:
+    position: bytes     # packed, see AnimalChessBoard.to_bytes
+    count: int
+    player0_wins: int
+    player1_wins: int
+    draws: int
+
+
+def parse_game_line(line: str) -> GameRecord:
+    # "<winner> <move> <move> ...", where the winner is 0, 1 or - for none
+    tokens = line.split()
+    if len(tokens) == 0 or tokens[0] not in {"0", "1", "-"}:
+        raise ValueError(f"Invalid game record: {line}")
+    return GameRecord(tokens[1:], None if tokens[0] == "-" else int(tokens[0]))
+
+
+_record_struct = struct.Struct(f"<{PACKED_POSITION_SIZE}s4Q")
+
+
+def _iterate_run(f: BinaryIO) -> Generator[tuple[bytes, list[int]], None, None]:
+    f.seek(0)
+    while True:
+        record = f.read(_record_struct.size)
+        if len(record) < _record_struct.size:
+            return
+        position, *counts = _record_struct.unpack(record)
+        yield position, counts
+
+
+def _merge_sorted(sources: list[Iterable[tuple[bytes, list[int]]]]) -> Generator[tuple[bytes, list[int]], None, None]:
+    # merges sorted (position, counts) sources, adding up the counts of equal positions
+    current_position, current_counts = None, None
+    for position, counts in heapq.merge(*sources, key=lambda item: item[0]):
+        if position == current_position:
+            current_counts = [total + count for total, count in zip(current_counts, counts)]
+            continue
+        if current_position is not None:
+            yield current_position, current_counts
+        current_position, current_counts = position, counts
+    if current_position is not None:
+        yield current_position, current_counts
+
+
+class PositionCounter:
+    # Counts positions in a dict keyed by the packed position. Whenever it holds more
+    # than max_entries positions, the counts are sorted and spilled to a temporary run
+    # file, and the runs are merged when iterating the statistics. At most max_fan_in
+    # runs are merged at once: whenever max_fan_in runs of the same level exist, they
+    # are merged into one run of the next level, which also bounds the open files.
+    def __init__(
+            self,
+            max_entries: int = 1_000_000,
+            spill_directory: Optional[str] = None,
+            max_fan_in: int = 64
+    ):
+        if max_fan_in < 2:
+            raise ValueError("max_fan_in must be at least 2.")
+        self._max_entries = max_entries
+        self._spill_directory = spill_directory
+        self._max_fan_in = max_fan_in
+        self._counts: dict[bytes, list[int]] = {}
+        self._runs: list[BinaryIO] = []
+        self._run_levels: list[int] = []    # non-increasing along the runs
+
+    def add(self, position: bytes, winner: Optional[Literal[0, 1]]) -> None:
+        counts = self._counts.get(position)
+        if counts is None:
+            counts = self._counts[position] = [0, 0, 0, 0]
+        counts[0] += 1
+        counts[3 if winner is None else winner + 1] += 1
+        if len(self._counts) > self._max_entries:
+            self._spill()
+
+    def add_game(self, record: GameRecord, player0: Player, player1: Player) -> None:
+        board = AnimalChessBoard(player0, player1)
+        self.add(board.to_bytes(), record.winner)
+        for move_string in record.moves:
+            player_id = board.current_player_id
+            try:
+                animal, destination = string_to_move(board, player_id, move_string)
+            except ValueError:
+                animal, destination = None, None
+            if animal is None or not board.move_piece(player_id, animal, destination):
+                logger.warning(f"Illegal move {move_string}; skipping the rest of the game.")
+                return
+            self.add(board.to_bytes(), record.winner)
+
+    def _write_run(self, records: Iterable[tuple[bytes, list[int]]]) -> BinaryIO:
+        run = tempfile.TemporaryFile(dir=self._spill_directory)
+        for position, counts in records:
+            run.write(_record_struct.pack(position, *counts))
+        run.flush()
+        return run
+
+    def _merge_last_runs(self, num_runs: int, level: int) -> None:
+        runs = self._runs[-num_runs:]
+        merged_run = self._write_run(_merge_sorted([_iterate_run(run) for run in runs]))
+        for run in runs:
+            run.close()
+        del self._runs[-num_runs:], self._run_levels[-num_runs:]
+        self._runs.append(merged_run)
+        self._run_levels.append(level)
+
+    def _spill(self) -> None:
+        self._runs.append(self._write_run((position, self._counts[position]) for position in sorted(self._counts)))
+        self._run_levels.append(0)
+        self._counts.clear()
+        while len(self._runs) >= self._max_fan_in and len(set(self._run_levels[-self._max_fan_in:])) == 1:
+            self._merge_last_runs(self._max_fan_in, self._run_levels[-1] + 1)
+
+    @property
+    def num_runs(self) -> int:
+        return len(self._runs)
+
+    def iterate_statistics(self) -> Generator[PositionStatistics, None, None]:
+        # distinct positions in the order of their packed bytes; the smallest runs are
+        # merged first until the runs and the counts in memory fit in one merge
+        while len(self._runs) + 1 > self._max_fan_in:
+            num_runs = min(self._max_fan_in, len(self._runs) + 2 - self._max_fan_in)
+            self._merge_last_runs(num_runs, self._run_levels[-num_runs])
+        sources = [_iterate_run(run) for run in self._runs]
+        sources.append((position, self._counts[position]) for position in sorted(self._counts))
+        for position, counts in _merge_sorted(sources):
+            yield PositionStatistics(position, *counts)
+
+    def close(self) -> None:
+        for run in self._runs:
+            run.close()
+        self._runs, self._run_levels = [], []
+        self._counts.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def count_positions(
+        games: Iterable[GameRecord],
+        output: TextIO,
+        max_entries: int = 1_000_000,
+        spill_directory: Optional[str] = None,
+        max_fan_in: int = 64
+) -> int:
+    # writes "<notation>\t<count>\t<player 0 wins>\t<player 1 wins>\t<draws>" lines,
+    # and returns the number of distinct positions
+    player0, player1 = Player("player0"), Player("player1")
+    num_positions = 0
+    with PositionCounter(max_entries, spill_directory, max_fan_in) as counter:
+        for record in games:
+            counter.add_game(record, player0, player1)
+        for statistics in counter.iterate_statistics():
+            notation = board_to_notation(AnimalChessBoard.from_bytes(statistics.position, player0, player1))
+            output.write(
+                f"{notation}\t{statistics.count}\t{statistics.player0_wins}\t"
+                f"{statistics.player1_wins}\t{statistics.draws}\n"
+            )
+            num_positions += 1
+    return num_positions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Count the distinct positions in a corpus of games.")
+    parser.add_argument("corpus", help="one game per line: <winner: 0, 1 or -> <move> <move> ...")
+    parser.add_argument("--max-entries", type=int, default=1_000_000, help="positions held in memory before spilling")
+    parser.add_argument("--spill-directory", default=None, help="directory for the temporary sorted runs")
+    parser.add_argument("--max-fan-in", type=int, default=64, help="runs merged at once, which bounds the open files")
+    args = parser.parse_args()
+
+    logger.disable("animalchess.chess")     # the rule engine logs every move
+    with open(args.corpus) as f:
+        games = (parse_game_line(line) for line in f if line.strip())
+        count_positions(games, sys.stdout, args.max_entries, args.spill_directory, args.max_fan_in)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+
+from typing import Optional, Literal, Protocol, Iterable
+from dataclasses import dataclass, field, fields
+import argparse
+import multiprocessing as mp
+import sys
+
+import numpy as np
+from loguru import logger
+
+from ..chess.board import AnimalChessBoard, PlayerPossession, candidate_destinations
+from ..chess.player import Player
+from ..chess.utils import AnimalType, SquareType, AnimalChessBoardMap, BOARD_HEIGHT, BOARD_WIDTH
+from ..chess.packing import pack_position, unpack_position, DEAD, PACKED_POSITION_SIZE
+from ..chess.actions import encode_action, NUM_DIRECTIONS, SWIMMING_ANIMALS
+from ..chess.notation import board_to_notation, square_to_string
+
+
+@dataclass
+class FuzzCase:
+    position: bytes     # packed, see AnimalChessBoard.to_bytes
+    player_id: Literal[0, 1]    # not necessarily the side to move
+    animal: AnimalType
+    destination: tuple[int, int]
+
+
+@dataclass
+class MoveOutcome:
+    legal: bool
+    captured: Optional[AnimalType]
+    winner: Optional[Literal[0, 1]]
+    position: Optional[bytes]       # packed position after the move, None if illegal
+    destinations: frozenset[tuple[int, int]] = field(default_factory=frozenset)   # of the animal before the move
+
+
+class RuleEngine(Protocol):
+    # an implementation of the rules to check against the reference; it must be
+    # picklable to run in worker processes
+    def play(self, case: FuzzCase) -> MoveOutcome:
+        ...
+
+
+_player0 = Player("player0")
+_player1 = Player("player1")
+
+
+class ReferenceRules:
+    # AnimalChessBoard.move_piece (and hence _move_piece_really_or_simulatively) and
+    # exhaustively_iterate_available_destinations
+    def play(self, case: FuzzCase) -> MoveOutcome:
+        board = AnimalChessBoard.from_bytes(case.position, _player0, _player1)
+        destinations = frozenset(board.exhaustively_iterate_available_destinations(case.player_id, case.animal))
+        victim = board._board[*case.destination]
+        if not board.move_piece(case.player_id, case.animal, case.destination):
+            return MoveOutcome(False, None, None, None, destinations)
+        captured = None if victim is None else victim.animal_type
+        return MoveOutcome(True, captured, board.winner, board.to_bytes(), destinations)
+
+
+def _pack(
+        positions: list[dict[AnimalType, tuple[int, int]]],
+        current_player_id: Literal[0, 1],
+        winned: list[bool]
+) -> bytes:
+    # through pack_position, so that the cases and outcomes follow the real format
+    possessions = [
+        PlayerPossession.from_positions(player, player_positions, player_winned)
+        for player, player_positions, player_winned in zip([_player0, _player1], positions, winned)
+    ]
+    return pack_position(possessions, current_player_id)
+
+
+ENEMY_CAVES = [(BOARD_HEIGHT - 1, BOARD_WIDTH // 2), (0, BOARD_WIDTH // 2)]
+
+
+class MaskRules:
+    # the vectorized legal-move mask of AnimalChessBoard.legal_move_mask, with the
+    # resulting position computed directly on the packed bytes
+    def play(self, case: FuzzCase) -> MoveOutcome:
+        board = AnimalChessBoard.from_bytes(case.position, _player0, _player1)
+        mask = board.legal_move_mask(case.player_id)
+        destinations = frozenset(
+            board.action_to_move(encode_action(case.animal, direction), case.player_id)[1]
+            for direction in range(NUM_DIRECTIONS)
+            if mask[case.animal.value - 1, direction]
+        )
+        if case.destination not in destinations:
+            return MoveOutcome(False, None, None, None, destinations)
+
+        positions, _, winned = unpack_position(case.position)
+        player_positions, opponent_positions = positions[case.player_id], positions[1 - case.player_id]
+        captured = next((animal for animal, square in opponent_positions.items() if square == case.destination), None)
+        if captured is not None:
+            del opponent_positions[captured]
+        player_positions[case.animal] = case.destination
+        if case.destination == ENEMY_CAVES[case.player_id]:
+            winned[case.player_id] = True
+
+        winner = None
+        if any(winned):
+            winner = winned.index(True)
+        elif len(positions[0]) == 0 or len(positions[1]) == 0:
+            winner = 1 if len(positions[0]) == 0 else 0
+        return MoveOutcome(True, captured, winner, _pack(positions, 1 - case.player_id, winned), destinations)
+
+
+def _livable_squares() -> dict[AnimalType, list[int]]:
+    # square indices, excluding the caves, where each animal may stand
+    board_map = AnimalChessBoardMap()
+    squares = {}
+    for animal in AnimalType:
+        squares[animal] = [
+            row * BOARD_WIDTH + col
+            for row in range(BOARD_HEIGHT)
+            for col in range(BOARD_WIDTH)
+            if board_map.get_square_type(row, col) not in {SquareType.CAVE0, SquareType.CAVE1}
+            and (board_map.get_square_type(row, col) != SquareType.WATER or animal in SWIMMING_ANIMALS)
+        ]
+    return squares
+
+
+def generate_cases(rng: np.random.Generator, num_cases: int) -> list[FuzzCase]:
+    # random positions with a random subset of the pieces on squares where they may
+    # stand, and random moves: a neighbour or jump of the moving piece most of the
+    # time, any square otherwise, by either player and possibly with a dead piece
+    livable_squares = _livable_squares()
+    animals = list(AnimalType)
+    presence = rng.random((num_cases, 2, len(animals))) < rng.random((num_cases, 1, 1))
+    flags = rng.integers(0, 2, size=num_cases)
+    player_ids = rng.integers(0, 2, size=num_cases)
+    moving_animals = rng.integers(0, len(animals), size=num_cases)
+    near_moves = rng.random(num_cases) < 0.8
+    random_squares = rng.integers(0, BOARD_HEIGHT * BOARD_WIDTH, size=num_cases)
+
+    cases = []
+    for case_index in range(num_cases):
+        positions = [{}, {}]
+        occupied = set()
+        for player_id in (0, 1):
+            for animal_index in rng.permutation(len(animals)):
+                if not presence[case_index, player_id, animal_index]:
+                    continue
+                squares = [square for square in livable_squares[animals[animal_index]] if square not in occupied]
+                square = squares[rng.integers(len(squares))]
+                occupied.add(square)
+                positions[player_id][animals[animal_index]] = divmod(square, BOARD_WIDTH)
+        packed = _pack(positions, int(flags[case_index]), [False, False])
+
+        player_id = int(player_ids[case_index])
+        animal = animals[moving_animals[case_index]]
+        origin = positions[player_id].get(animal)
+        if near_moves[case_index] and origin is not None:
+            neighbours = candidate_destinations[origin]
+            destination = neighbours[rng.integers(len(neighbours))]
+        else:
+            destination = divmod(int(random_squares[case_index]), BOARD_WIDTH)
+        cases.append(FuzzCase(packed, player_id, animal, destination))
+    return cases
+
+
+def compare_outcomes(reference: MoveOutcome, candidate: MoveOutcome) -> list[str]:
+    # names of the fields that differ
+    return [
+        outcome_field.name
+        for outcome_field in fields(MoveOutcome)
+        if getattr(reference, outcome_field.name) != getattr(candidate, outcome_field.name)
+    ]
+
+
+def check_case(case: FuzzCase, candidate: RuleEngine, reference: Optional[RuleEngine] = None) -> list[str]:
+    reference = ReferenceRules() if reference is None else reference
+    try:
+        candidate_outcome = candidate.play(case)
+    except Exception as e:
+        return [f"exception: {e!r}"]
+    return compare_outcomes(reference.play(case), candidate_outcome)
+
+
+def shrink_case(case: FuzzCase, candidate: RuleEngine, reference: Optional[RuleEngine] = None) -> FuzzCase:
+    # removes the other pieces and the flags one at a time as long as the outcomes
+    # still differ
+    reference = ReferenceRules() if reference is None else reference
+    moving_index = case.player_id * len(AnimalType) + case.animal.value - 1
+    improved = True
+    while improved:
+        improved = False
+        packed = case.position
+        simplifications = [
+            packed[:index] + bytes([DEAD]) + packed[index+1:]
+            for index in range(PACKED_POSITION_SIZE - 1)
+            if index != moving_index and packed[index] != DEAD
+        ]
+        if packed[-1] != 0:
+            simplifications.append(packed[:-1] + b"\x00")
+        for simplified in simplifications:
+            simplified_case = FuzzCase(simplified, case.player_id, case.animal, case.destination)
+            if len(check_case(simplified_case, candidate, reference)) > 0:
+                case, improved = simplified_case, True
+                break
+    return case
+
+
+@dataclass
+class FuzzFailure:
+    case: FuzzCase      # shrunk
+    differences: list[str]
+
+
+@dataclass
+class FuzzReport:
+    num_cases: int
+    failures: list[FuzzFailure] = field(default_factory=list)
+
+
+def _fuzz_chunk(arguments: tuple[RuleEngine, int, int, int]) -> tuple[int, list[FuzzFailure]]:
+    candidate, seed, chunk_index, num_cases = arguments
+    rng = np.random.default_rng([seed, chunk_index])
+    reference = ReferenceRules()
+    failures = []
+    for case in generate_cases(rng, num_cases):
+        differences = check_case(case, candidate, reference)
+        if len(differences) > 0:
+            shrunk_case = shrink_case(case, candidate, reference)
+            failures.append(FuzzFailure(shrunk_case, check_case(shrunk_case, candidate, reference)))
+    return num_cases, failures
+
+
+def _initialize_worker() -> None:
+    logger.disable("animalchess")   # the rule engine logs every move
+
+
+def fuzz(
+        candidate: RuleEngine,
+        num_cases: int,
+        seed: int = 0,
+        num_workers: Optional[int] = None,
+        chunk_size: int = 10000,
+        max_failures: Optional[int] = 100
+) -> FuzzReport:
+    # the cases are generated in chunks from (seed, chunk index), so that a run is
+    # reproducible whatever the number of workers
+    chunks = [
+        (candidate, seed, chunk_index, min(chunk_size, num_cases - start))
+        for chunk_index, start in enumerate(range(0, num_cases, chunk_size))
+    ]
+    report = FuzzReport(0)
+
+    def collect(results: Iterable[tuple[int, list[FuzzFailure]]]) -> None:
+        for chunk_num_cases, failures in results:
+            report.num_cases += chunk_num_cases
+            report.failures.extend(failures)
+            if max_failures is not None and len(report.failures) >= max_failures:
+                return
+
+    if num_workers == 1:
+        collect(map(_fuzz_chunk, chunks))
+    else:
+        with mp.Pool(num_workers, initializer=_initialize_worker) as pool:
+            collect(pool.imap_unordered(_fuzz_chunk, chunks))
+    return report
+
+
+def describe_case(case: FuzzCase) -> str:
+    board = AnimalChessBoard.from_bytes(case.position, _player0, _player1)
+    return (
+        f"{board_to_notation(board)}: player {case.player_id} moves "
+        f"{case.animal.name} to {square_to_string(case.destination)}"
+    )
+
+
+CANDIDATES = {"mask": MaskRules, "reference": ReferenceRules}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare a rule engine against the reference rules on random cases.")
+    parser.add_argument("--candidate", choices=sorted(CANDIDATES), default="mask")
+    parser.add_argument("--cases", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="number of processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--max-failures", type=int, default=100)
+    args = parser.parse_args()
+
+    _initialize_worker()
+    report = fuzz(CANDIDATES[args.candidate](), args.cases, args.seed, args.workers, args.chunk_size, args.max_failures)
+    for failure in report.failures:
+        print(f"{describe_case(failure.case)} ({', '.join(failure.differences)})")
+    print(f"{report.num_cases} cases, {len(report.failures)} failures")
+    sys.exit(1 if len(report.failures) > 0 else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+
+from typing import Any, Callable, Iterable, Optional
+from dataclasses import dataclass
+import sys
+import tracemalloc
+
+from ..chess.board import AnimalChessBoard
+from ..chess.player import Player
+from ..chess.utils import AnimalType
+
+
+@dataclass
+class BoardFootprint:
+    # bytes held by boards, counting every object once even when boards share it;
+    # the map singleton, the players and the enum members are not counted
+    board_objects: int = 0          # the AnimalChessBoard instances and their attributes
+    board_arrays: int = 0           # the object arrays of pieces
+    possessions: int = 0            # the PlayerPossession instances and their dicts
+    piece_informations: int = 0     # the PieceInformation instances and their positions
+    pieces: int = 0                 # the Piece instances
+    histories: int = 0              # the PositionHistory instances, rings and counts
+
+    @property
+    def total(self) -> int:
+        return (
+            self.board_objects + self.board_arrays + self.possessions
+            + self.piece_informations + self.pieces + self.histories
+        )
+
+
+class _SizeCounter:
+    def __init__(self):
+        self._seen: set[int] = set()
+
+    def sizeof(self, *objects: Any) -> int:
+        # shallow sizes, including the instance dicts
+        size = 0
+        for obj in objects:
+            if obj is None or id(obj) in self._seen:
+                continue
+            self._seen.add(id(obj))
+            size += sys.getsizeof(obj)
+            instance_dict = getattr(obj, "__dict__", None)
+            if instance_dict is not None and id(instance_dict) not in self._seen:
+                self._seen.add(id(instance_dict))
+                size += sys.getsizeof(instance_dict)
+        return size
+
+
+def _add_board(counter: _SizeCounter, footprint: BoardFootprint, board: AnimalChessBoard) -> None:
+    footprint.board_objects += counter.sizeof(
+        board,
+        board._hash,
+        board._players_possessions,
+        board._shared_possessions
+    )
+    footprint.board_arrays += counter.sizeof(board._board)
+    for possession in board._players_possessions:
+        footprint.possessions += counter.sizeof(possession, possession._pieces)
+        for piece_info in possession._pieces.values():
+            footprint.piece_informations += counter.sizeof(piece_info, piece_info.position)
+            footprint.pieces += counter.sizeof(piece_info.piece)
+    history = board._history
+    footprint.histories += counter.sizeof(history, history._hashes, history._counts, *history._counts)
+
+
+def board_footprint(board: AnimalChessBoard) -> BoardFootprint:
+    return boards_footprint([board])
+
+
+def boards_footprint(boards: Iterable[AnimalChessBoard]) -> BoardFootprint:
+    # the aggregate footprint; the state shared by copy-on-write clones is counted once
+    counter = _SizeCounter()
+    footprint = BoardFootprint()
+    for board in boards:
+        _add_board(counter, footprint, board)
+    return footprint
+
+
+def measure_allocations(function: Callable[[Any], Any], inputs: list) -> float:
+    # bytes still allocated per call after calling the function on each input, with
+    # the results kept alive, as traced by tracemalloc
+    results = [None] * len(inputs)
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for index, argument in enumerate(inputs):
+            results[index] = function(argument)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return (after - before) / max(len(inputs), 1)
+
+
+@dataclass
+class MemoryReport:
+    num_boards: int
+    board: BoardFootprint                   # one board in the initial layout
+    boards: BoardFootprint                  # num_boards independently constructed boards
+    clones: BoardFootprint                  # a board and num_boards - 1 clones of it
+    construction_allocation: float         # bytes per AnimalChessBoard(...)
+    clone_allocation: float                 # bytes per clone()
+    first_move_allocation: float            # bytes per move_piece on a fresh clone
+    move_allocation: float                  # bytes per move_piece once the clone owns its state
+
+    @property
+    def boards_per_gb(self) -> float:
+        return self.num_boards * (1 << 30) / self.boards.total
+
+    @property
+    def clones_per_gb(self) -> float:
+        return self.num_boards * (1 << 30) / self.clones.total
+
+
+def memory_report(num_boards: int = 1000, player0: Optional[Player] = None, player1: Optional[Player] = None) -> MemoryReport:
+    player0 = Player("player0") if player0 is None else player0
+    player1 = Player("player1") if player1 is None else player1
+    board = AnimalChessBoard(player0, player1)
+
+    construction_allocation = measure_allocations(lambda _: AnimalChessBoard(player0, player1), [None] * num_boards)
+    boards = [AnimalChessBoard(player0, player1) for _ in range(num_boards)]
+    clone_allocation = measure_allocations(lambda _: board.clone(), [None] * num_boards)
+    clones = [board] + [board.clone() for _ in range(num_boards - 1)]
+
+    # player 0 moves the rat forward, then player 1 moves the rat forward
+    fresh_clones = [board.clone() for _ in range(num_boards)]
+    first_move_allocation = measure_allocations(lambda b: b.move_piece(0, AnimalType.RAT, (3, 0)), fresh_clones)
+    move_allocation = measure_allocations(lambda b: b.move_piece(1, AnimalType.RAT, (5, 6)), fresh_clones)
+
+    return MemoryReport(
+        num_boards,
+        board_footprint(board),
+        boards_footprint(boards),
+        boards_footprint(clones),
+        construction_allocation,
+        clone_allocation,
+        first_move_allocation,
+        move_allocation
+    )
+
+
+def format_memory_report(report: MemoryReport) -> str:
+    lines = [f"{'component':<24}{'1 board':>12}{f'{report.num_boards} boards':>16}{f'{report.num_boards} clones':>16}"]
+    for name in BoardFootprint.__dataclass_fields__:
+        lines.append(
+            f"{name:<24}{getattr(report.board, name):>12}"
+            f"{getattr(report.boards, name):>16}{getattr(report.clones, name):>16}"
+        )
+    lines.append(f"{'total':<24}{report.board.total:>12}{report.boards.total:>16}{report.clones.total:>16}")
+    lines.append(f"boards per GB: {report.boards_per_gb:.0f} (clones: {report.clones_per_gb:.0f})")
+    lines.append(
+        f"allocated bytes per construction: {report.construction_allocation:.0f}, "
+        f"clone: {report.clone_allocation:.0f}, first move of a clone: {report.first_move_allocation:.0f}, "
+        f"later move: {report.move_allocation:.0f}"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,113 @@
+
+import unittest
+from random import Random
+
+import numpy as np
+from loguru import logger
+
+from animalchess.chess.board import AnimalChessBoard, PlayerPossession
+from animalchess.chess.player import Player
+from animalchess.chess.utils import AnimalType
+from animalchess.chess.actions import NUM_ACTIONS, NUM_DIRECTIONS, NO_SQUARE, encode_action, decode_action
+from animalchess.chess.actions import action_destinations, possession_origins, square_index
+
+
+class TestLegalMoveMask(unittest.TestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+        self.player0 = Player("Alice")
+        self.player1 = Player("Bob")
+
+    def tearDown(self):
+        logger.enable("animalchess")
+
+    def assert_mask_matches_reference(self, board: AnimalChessBoard, player_id: int):
+        mask = board.legal_move_mask(player_id)
+        self.assertEqual(mask.shape, (len(AnimalType), NUM_DIRECTIONS))
+        mask_moves = {board.action_to_move(action_id, player_id) for action_id in np.flatnonzero(mask)}
+        self.assertEqual(mask_moves, set(board.iterate_legal_moves(player_id)))
+
+    def test_random_games(self):
+        rng = Random(42)
+        for _ in range(5):
+            board = AnimalChessBoard(self.player0, self.player1)
+            for _ in range(80):
+                if board.winner is not None:
+                    break
+                player_id = board.current_player_id
+                self.assert_mask_matches_reference(board, 1 - player_id)
+                self.assert_mask_matches_reference(board, player_id)
+                moves = list(board.iterate_legal_moves(player_id))
+                if len(moves) == 0:
+                    break
+                self.assertTrue(board.move_piece(player_id, *rng.choice(moves)))
+
+    def test_blocked_jumps(self):
+        player0_possession = PlayerPossession(self.player0, 0, reset=False)
+        player1_possession = PlayerPossession(self.player1, 1, reset=False)
+        player0_possession.set_piece_info(AnimalType.LION, (2, 1))
+        player0_possession.set_piece_info(AnimalType.TIGER, (4, 0))
+        player1_possession.set_piece_info(AnimalType.RAT, (4, 1))
+        board = AnimalChessBoard(
+            self.player0,
+            self.player1,
+            initial_players_possessions=[player0_possession, player1_possession]
+        )
+        self.assertFalse(board.move_piece(0, AnimalType.LION, (6, 1)))
+        self.assertFalse(board.move_piece(0, AnimalType.TIGER, (4, 3)))
+        self.assert_mask_matches_reference(board, 0)
+        self.assert_mask_matches_reference(board, 1)
+
+    def test_traps(self):
+        player0_possession = PlayerPossession(self.player0, 0, reset=False)
+        player1_possession = PlayerPossession(self.player1, 1, reset=False)
+        player0_possession.set_piece_info(AnimalType.CAT, (0, 1))
+        player0_possession.set_piece_info(AnimalType.ELEPHANT, (8, 1))
+        player1_possession.set_piece_info(AnimalType.ELEPHANT, (0, 2))
+        player1_possession.set_piece_info(AnimalType.RAT, (8, 2))
+        board = AnimalChessBoard(
+            self.player0,
+            self.player1,
+            initial_players_possessions=[player0_possession, player1_possession]
+        )
+        mask = board.legal_move_mask(0)
+        self.assertTrue(mask[AnimalType.CAT.value-1, 3])          # eats the elephant in its own trap
+        self.assertFalse(mask[AnimalType.ELEPHANT.value-1, 3])    # the rat is safe in the other trap
+        self.assert_mask_matches_reference(board, 0)
+        self.assert_mask_matches_reference(board, 1)
+
+
+class TestActionEncoding(unittest.TestCase):
+    def setUp(self):
+        self.board = AnimalChessBoard(Player("Alice"), Player("Bob"))
+
+    def test_round_trip(self):
+        for action_id in range(NUM_ACTIONS):
+            animal_type, direction = decode_action(action_id)
+            self.assertEqual(encode_action(animal_type, direction), action_id)
+
+    def test_moves(self):
+        action_id = self.board.move_to_action(AnimalType.RAT, (3, 0), 0)
+        self.assertEqual(self.board.action_to_move(action_id, 0), (AnimalType.RAT, (3, 0)))
+        with self.assertRaises(ValueError):
+            self.board.move_to_action(AnimalType.RAT, (4, 0), 0)
+
+        # the lion on the river bank jumps
+        self.board._players_possessions[0].get_piece(AnimalType.LION).position = (2, 1)
+        self.assertEqual(self.board.action_to_move(encode_action(AnimalType.LION, 1), 0), (AnimalType.LION, (6, 1)))
+
+    def test_vectorized_destinations(self):
+        origins = np.stack([
+            possession_origins(self.board._players_possessions[0]),
+            possession_origins(self.board._players_possessions[1])
+        ])
+        action_ids = np.array([encode_action(AnimalType.RAT, 1), encode_action(AnimalType.RAT, 0)])
+        destinations = action_destinations(action_ids, origins)
+        np.testing.assert_array_equal(destinations, [square_index((3, 0)), square_index((5, 6))])
+
+        origins[0, AnimalType.RAT.value-1] = NO_SQUARE
+        self.assertEqual(action_destinations(action_ids, origins)[0], NO_SQUARE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+
+import asyncio
+import unittest
+
+from loguru import logger
+
+from animalchess.chess.board import AnimalChessBoard
+from animalchess.chess.player import Player
+from animalchess.engine.search import SearchEngine, SearchLimits
+
+
+class TestAnalysis(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+        self.board = AnimalChessBoard(Player("Alice"), Player("Bob"))
+        self.engine = SearchEngine()
+
+    def tearDown(self):
+        logger.enable("animalchess")
+
+    async def test_progressive_depths(self):
+        infos = [info async for info in self.engine.analyze(self.board, SearchLimits(depth=3))]
+        self.assertEqual([info.depth for info in infos], [1, 2, 3])
+        legal_moves = set(self.board.iterate_legal_moves(0))
+        for info in infos:
+            self.assertIn(info.pv[0], legal_moves)
+            self.assertGreater(info.nodes, 0)
+            self.assertGreaterEqual(info.nps, 0)
+
+    async def test_multipv(self):
+        infos = [info async for info in self.engine.analyze(self.board, SearchLimits(depth=2, multipv=3))]
+        self.assertEqual([(info.depth, info.multipv) for info in infos], [(d, r) for d in [1, 2] for r in [1, 2, 3]])
+        for depth in [1, 2]:
+            lines = [info for info in infos if info.depth == depth]
+            self.assertEqual(len({info.pv[0] for info in lines}), 3)
+            scores = [info.score for info in lines]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+
+    async def test_cancellation(self):
+        received = []
+
+        async def consume():
+            async for info in self.engine.analyze(self.board):
+                received.append(info)
+
+        task = asyncio.create_task(consume())
+        while len(received) == 0:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        # the engine is stopped and ready for the next search
+        result = self.engine.search(self.board, SearchLimits(depth=2))
+        self.assertEqual(result.depth, 2)
+
+    async def test_engine_busy(self):
+        analysis = self.engine.analyze(self.board)
+        await anext(analysis)
+        with self.assertRaises(ValueError):
+            [info async for info in self.engine.analyze(self.board, SearchLimits(depth=1))]
+        await analysis.aclose()
+        self.assertEqual(self.engine.search(self.board, SearchLimits(depth=1)).depth, 1)
+
+    async def test_close_early(self):
+        analysis = self.engine.analyze(self.board)
+        info = await anext(analysis)
+        self.assertEqual(info.depth, 1)
+        await analysis.aclose()
+        result = self.engine.search(self.board, SearchLimits(depth=1))
+        self.assertEqual(result.depth, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
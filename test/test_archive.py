@@ -0,0 +1,111 @@
+
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+from loguru import logger
+
+from animalchess.chess.board import AnimalChessBoard
+from animalchess.chess.player import Player
+from animalchess.chess.utils import AnimalType
+from animalchess.chess.actions import NUM_ACTIONS, encode_action
+from animalchess.chess.archive import (
+    GameArchiveWriter, GameArchiveReader, encode_moves, decode_moves, pack_actions, unpack_actions,
+    packed_actions_size, BITS_PER_MOVE
+)
+
+
+class TestGameArchive(unittest.TestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+        self.player0 = Player("Alice")
+        self.player1 = Player("Bob")
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "games.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+        logger.enable("animalchess")
+
+    def random_game(self, rng: random.Random, max_plies: int = 60):
+        board = AnimalChessBoard(self.player0, self.player1)
+        moves = []
+        while len(moves) < max_plies and board.winner is None:
+            legal_moves = list(board.iterate_legal_moves(board.current_player_id))
+            if len(legal_moves) == 0:
+                break
+            move = rng.choice(legal_moves)
+            board.move_piece(board.current_player_id, *move)
+            moves.append(move)
+        return moves, board.winner
+
+    def test_pack_actions(self):
+        self.assertEqual(BITS_PER_MOVE, 5)
+        actions = np.random.default_rng(0).integers(0, NUM_ACTIONS, size=101).astype(np.uint8)
+        data = pack_actions(actions)
+        self.assertEqual(len(data), packed_actions_size(101))
+        np.testing.assert_array_equal(unpack_actions(data, 101), actions)
+        self.assertEqual(len(unpack_actions(b"", 0)), 0)
+        with self.assertRaises(ValueError):
+            pack_actions([NUM_ACTIONS])
+
+    def test_encode_moves(self):
+        moves = [(AnimalType.RAT, (3, 0)), (AnimalType.RAT, (5, 6)), (AnimalType.LION, (1, 0))]
+        actions = encode_moves(moves, self.player0, self.player1)
+        self.assertEqual(actions.dtype, np.uint8)
+        self.assertEqual(decode_moves(actions, self.player0, self.player1), moves)
+        with self.assertRaises(ValueError):
+            encode_moves([(AnimalType.RAT, (3, 0)), (AnimalType.RAT, (4, 0))], self.player0, self.player1)
+        with self.assertRaises(ValueError):
+            decode_moves([encode_action(AnimalType.LION, 0)], self.player0, self.player1)     # off the board
+
+    def test_round_trip(self):
+        rng = random.Random(0)
+        games = [self.random_game(rng) for _ in range(25)] + [([], None)]
+        with GameArchiveWriter(self.path, games_per_block=4) as writer:
+            for moves, winner in games:
+                writer.add_game(moves, self.player0, self.player1, winner)
+            self.assertEqual(len(writer), len(games))
+
+        with GameArchiveReader(self.path) as reader:
+            self.assertEqual(len(reader), len(games))
+            for index in [17, 3, 25, 0, 18, -1]:
+                moves, winner = games[index]
+                self.assertEqual(reader[index].moves(self.player0, self.player1), moves)
+                self.assertEqual(reader[index].winner, winner)
+            self.assertEqual([len(game.actions) for game in reader.iterate_games()], [len(moves) for moves, _ in games])
+            with self.assertRaises(IndexError):
+                reader[len(games)]
+
+        # the moves take five bits each
+        num_moves = sum(len(moves) for moves, _ in games)
+        self.assertLess(os.path.getsize(self.path), num_moves * BITS_PER_MOVE // 8 + 4 * len(games) + 200)
+
+    def test_invalid_games(self):
+        with GameArchiveWriter(self.path, games_per_block=2) as writer:
+            writer.add_actions([0, 1], 0)
+            for actions, winner in [([NUM_ACTIONS], None), ([-1], None), ([0], 2)]:
+                with self.assertRaises(ValueError):
+                    writer.add_actions(actions, winner)
+            self.assertEqual(len(writer), 1)
+        with GameArchiveReader(self.path) as reader:
+            self.assertEqual(len(reader), 1)
+            self.assertEqual(reader[0].actions.tolist(), [0, 1])
+
+    def test_empty_archive(self):
+        GameArchiveWriter(self.path).close()
+        with GameArchiveReader(self.path) as reader:
+            self.assertEqual(len(reader), 0)
+            self.assertEqual(list(reader.iterate_games()), [])
+
+    def test_invalid_file(self):
+        with open(self.path, "wb") as f:
+            f.write(b"a3a4 g7g6\n")
+        with self.assertRaises(ValueError):
+            GameArchiveReader(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,11 @@
 
 import unittest
+import pickle
+import multiprocessing as mp
 from animalchess.chess.board import AnimalChessBoard, PlayerPossession
 from animalchess.chess.player import Player
 from animalchess.chess.utils import AnimalType, AnimalChessBoardMap, SquareType
+from animalchess.chess.notation import board_from_notation
 
 
 class TestPlayerPossession(unittest.TestCase):
@@ -374,6 +377,7 @@ class TestAnimalChessBoard(unittest.TestCase):
 
         # Player 0 should have won
         self.assertTrue(board._players_possessions[0].winned)
+        self.assertEqual(board.winner, 0)
 
     def test_player1_win_condition(self):
         player0_possession = PlayerPossession(self.player0, 0, reset=False)
@@ -410,6 +414,74 @@ class TestAnimalChessBoard(unittest.TestCase):
         success = board.move_piece(0, AnimalType.RAT, (2, 1))
         self.assertFalse(success)
 
+    def test_current_player_id(self):
+        self.assertEqual(self.board.current_player_id, 0)
+        self.assertTrue(self.board.move_piece(0, AnimalType.RAT, (2, 1)))
+        self.assertEqual(self.board.current_player_id, 1)
+        self.assertFalse(self.board.move_piece(1, AnimalType.RAT, (8, 8)))
+        self.assertEqual(self.board.current_player_id, 1)
+        self.assertTrue(self.board.move_piece(1, AnimalType.RAT, (5, 6)))
+        self.assertEqual(self.board.current_player_id, 0)
+        self.assertEqual(self.board.clone().current_player_id, 0)
+
+    def test_winner_by_capturing_all(self):
+        player0_possession = PlayerPossession(self.player0, 0, reset=False)
+        player1_possession = PlayerPossession(self.player1, 1, reset=False)
+        player0_possession.set_piece_info(AnimalType.LION, (4, 0))
+        player1_possession.set_piece_info(AnimalType.CAT, (5, 0))
+        board = AnimalChessBoard(
+            self.player0,
+            self.player1,
+            initial_players_possessions=[player0_possession, player1_possession]
+        )
+        self.assertIsNone(board.winner)
+        self.assertTrue(board.move_piece(0, AnimalType.LION, (5, 0)))
+        self.assertEqual(board.winner, 0)
+
+    def test_pickle(self):
+        self.assertTrue(self.board.move_piece(0, AnimalType.RAT, (3, 0)))
+        data = pickle.dumps(self.board)
+        self.assertLess(len(data), 128)     # the packed position and the names of the players
+
+        board = pickle.loads(data)
+        self.assertEqual(board.to_bytes(), self.board.to_bytes())
+        self.assertEqual(board.position_hash, self.board.position_hash)
+        self.assertEqual(board.current_player_id, 1)
+        self.assertEqual(board.get_board_array().tolist(), self.board.get_board_array().tolist())
+        self.assertEqual(board.history.plies, 0)    # the history is not pickled
+        self.assertIs(board._map, AnimalChessBoardMap())
+        self.assertIs(pickle.loads(pickle.dumps(board._board[0, 0]))._map, AnimalChessBoardMap())
+
+        # captured pieces and the winner
+        board = board_from_notation("7/7/7/7/7/7/7/7/3D3 1 0", self.player0, self.player1)
+        unpickled_board = pickle.loads(pickle.dumps(board))
+        self.assertEqual(unpickled_board.to_bytes(), board.to_bytes())
+        self.assertEqual(unpickled_board.winner, 0)
+        self.assertTrue(unpickled_board._players_possessions[1].get_piece(AnimalType.CAT).piece.dead)
+
+    def test_invalid_bytes(self):
+        packed = self.board.to_bytes()
+        for corrupted in [
+            packed[:-1],
+            bytes([63]) + packed[1:],                           # off the board
+            packed[:-1] + bytes([8]),                           # unknown flag
+            packed[:-1] + bytes([6]),                           # both players have won
+            bytes([packed[1]]) + packed[1:],                    # two pieces on the same square
+            packed[:1] + bytes([3 * 7 + 1]) + packed[2:],       # a cat on water
+            packed[:1] + bytes([3]) + packed[2:]                # a cat in its own cave
+        ]:
+            with self.assertRaises(ValueError):
+                AnimalChessBoard.from_bytes(corrupted, self.player0, self.player1)
+            with self.assertRaises(ValueError):
+                self.board.clone().reset(corrupted)
+
+    def test_multiprocessing_queue(self):
+        queue = mp.get_context("spawn").Queue()
+        queue.put(self.board)
+        board = queue.get(timeout=10)
+        self.assertEqual(board.to_bytes(), self.board.to_bytes())
+        self.assertEqual(set(board.iterate_legal_moves(0)), set(self.board.iterate_legal_moves(0)))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -5,7 +5,7 @@ from itertools import product
 
 from animalchess.chess.utils import AnimalType, BOARD_HEIGHT, BOARD_WIDTH
 from animalchess.chess.player import Player
-from animalchess.chess.board import AnimalChessBoard
+from animalchess.chess.board import AnimalChessBoard, PlayerPossession
 
 
 class TestCloneBoard(unittest.TestCase):
@@ -42,6 +42,11 @@ class TestCloneBoard(unittest.TestCase):
         self.assertIs(board._player0, cloned_board._player0)
         self.assertIs(board._player1, cloned_board._player1)
         self.assertIsNot(board._players_possessions[0], cloned_board._players_possessions[1])
+
+        # clones are copy-on-write: the state is shared until it is written to
+        for player_id in [0, 1]:
+            self.assertIs(board._players_possessions[player_id], cloned_board._players_possessions[player_id])
+            cloned_board._own_possession(player_id)
         for player_id in [0, 1]:
             for animal_type, piece_info in board._players_possessions[player_id]._pieces.items():
                 self.assertIsNot(
@@ -67,6 +72,53 @@ class TestCloneBoard(unittest.TestCase):
             else:
                 self.assertIsNone(cloned_board._board[i, j])
 
+    def test_copy_on_write(self):
+        player0 = Player("Alice")
+        player1 = Player("Bob")
+        player0_possession = PlayerPossession(player0, 0, reset=False)
+        player1_possession = PlayerPossession(player1, 1, reset=False)
+        player0_possession.set_piece_info(AnimalType.LION, (2, 1))
+        player0_possession.set_piece_info(AnimalType.RAT, (0, 6))
+        player1_possession.set_piece_info(AnimalType.TIGER, (6, 1))
+        player1_possession.set_piece_info(AnimalType.CAT, (8, 6))
+        board = AnimalChessBoard(player0, player1, [player0_possession, player1_possession])
+
+        # a simple move copies the board and the mover's possession only
+        cloned_board = board.clone()
+        self.assertIs(board._board, cloned_board._board)
+        self.assertTrue(cloned_board.move_piece(0, AnimalType.RAT, (0, 5)))
+        self.assertIsNot(board._board, cloned_board._board)
+        self.assertIsNot(board._players_possessions[0], cloned_board._players_possessions[0])
+        self.assertIs(board._players_possessions[1], cloned_board._players_possessions[1])
+        self.assertEqual(board._players_possessions[0].get_piece(AnimalType.RAT).position, (0, 6))
+        self.assertIsNone(board._board[0, 5])
+        self.assertEqual(board.history.plies, 0)
+        self.assertEqual(cloned_board.history.plies, 1)
+
+        # a capture in a clone leaves the parent's pieces alive
+        cloned_board = board.clone()
+        self.assertTrue(cloned_board.move_piece(0, AnimalType.LION, (6, 1)))
+        self.assertTrue(cloned_board._players_possessions[1].get_piece(AnimalType.TIGER).piece.dead)
+        self.assertFalse(board._players_possessions[1].get_piece(AnimalType.TIGER).piece.dead)
+        self.assertEqual(board._board[6, 1].animal_type, AnimalType.TIGER)
+        self.assertEqual(board._players_possessions[0].get_piece(AnimalType.LION).position, (2, 1))
+
+        # moves in the parent do not leak into the clone either
+        self.assertTrue(board.move_piece(0, AnimalType.RAT, (1, 6)))
+        self.assertEqual(cloned_board._players_possessions[0].get_piece(AnimalType.RAT).position, (0, 6))
+        self.assertEqual(cloned_board._board[0, 6].animal_type, AnimalType.RAT)
+        self.assertIsNone(cloned_board._board[1, 6])
+
+    def test_clone_keeps_captured_pieces(self):
+        board = AnimalChessBoard(Player("Alice"), Player("Bob"))
+        board._players_possessions[1].get_piece(AnimalType.RAT).piece.die()
+        board._players_possessions[1].get_piece(AnimalType.RAT).position = None
+        board._initialize_board()
+
+        cloned_board = board.clone()
+        self.assertTrue(cloned_board._players_possessions[1].get_piece(AnimalType.RAT).piece.dead)
+        self.assertIsNone(cloned_board._board[6, 6])
+
 
 if __name__ == '__main__':
     unittest.main()
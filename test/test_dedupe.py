@@ -0,0 +1,83 @@
+
+import io
+import unittest
+
+from loguru import logger
+
+from animalchess.chess.board import AnimalChessBoard
+from animalchess.chess.player import Player
+from animalchess.chess.notation import STARTING_POSITION_NOTATION
+from animalchess.tools.dedupe import PositionCounter, GameRecord, parse_game_line, count_positions
+
+
+class TestPositionCounter(unittest.TestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+        self.player0 = Player("player0")
+        self.player1 = Player("player1")
+        self.games = [
+            GameRecord(["a1a2", "g9g8", "a2a1", "g8g9", "a1a2"], 0),
+            GameRecord(["a1a2", "g9g8"], 1),
+            GameRecord(["g3g4"], None)
+        ]
+
+    def tearDown(self):
+        logger.enable("animalchess")
+
+    def collect(self, max_entries: int, max_fan_in: int = 64) -> tuple[dict[bytes, tuple[int, ...]], int]:
+        with PositionCounter(max_entries=max_entries, max_fan_in=max_fan_in) as counter:
+            for record in self.games:
+                counter.add_game(record, self.player0, self.player1)
+            statistics = {
+                item.position: (item.count, item.player0_wins, item.player1_wins, item.draws)
+                for item in counter.iterate_statistics()
+            }
+            return statistics, counter.num_runs
+
+    def test_counts(self):
+        statistics, num_runs = self.collect(max_entries=1000)
+        self.assertEqual(num_runs, 0)
+        start = AnimalChessBoard(self.player0, self.player1).to_bytes()
+        self.assertEqual(statistics[start], (4, 2, 1, 1))
+        self.assertEqual(len(statistics), 5)
+
+    def test_spilling_gives_the_same_counts(self):
+        in_memory_statistics, _ = self.collect(max_entries=1000)
+        spilled_statistics, num_runs = self.collect(max_entries=2)
+        self.assertGreater(num_runs, 0)
+        self.assertEqual(spilled_statistics, in_memory_statistics)
+
+    def test_bounded_fan_in(self):
+        in_memory_statistics, _ = self.collect(max_entries=1000)
+        self.games = self.games * 5
+        in_memory_statistics = {position: tuple(5 * count for count in counts) for position, counts in in_memory_statistics.items()}
+        for max_fan_in in [2, 3]:
+            spilled_statistics, num_runs = self.collect(max_entries=1, max_fan_in=max_fan_in)
+            self.assertLess(num_runs, max_fan_in)
+            self.assertEqual(spilled_statistics, in_memory_statistics)
+
+        with PositionCounter(max_entries=1, max_fan_in=3) as counter:
+            for record in self.games:
+                counter.add_game(record, self.player0, self.player1)
+                self.assertLessEqual(counter.num_runs, 2 * 4)    # at most max_fan_in - 1 runs per level
+        with self.assertRaises(ValueError):
+            PositionCounter(max_fan_in=1)
+
+    def test_sorted_output(self):
+        output = io.StringIO()
+        lines = ["0 a1a2 g9g8 a2a1 g8g9 a1a2", "1 a1a2 g9g8", "- g3g4"]
+        num_positions = count_positions((parse_game_line(line) for line in lines), output, max_entries=3)
+        rows = [line.split("\t") for line in output.getvalue().splitlines()]
+        self.assertEqual(num_positions, 5)
+        self.assertIn([STARTING_POSITION_NOTATION, "4", "2", "1", "1"], rows)
+
+    def test_illegal_move_stops_the_game(self):
+        with PositionCounter() as counter:
+            counter.add_game(GameRecord(["a1a3", "g9g8"]), self.player0, self.player1)
+            self.assertEqual(len(list(counter.iterate_statistics())), 1)
+        with self.assertRaises(ValueError):
+            parse_game_line("x a1a2")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+
+import unittest
+from collections import deque
+
+from loguru import logger
+
+from animalchess.chess.player import Player
+from animalchess.chess.utils import AnimalType, BOARD_HEIGHT, BOARD_WIDTH
+from animalchess.chess.notation import board_from_notation, ANIMAL_LETTERS
+from animalchess.chess.distances import (
+    CAVE_DISTANCES, UNREACHABLE, cave_distance, dynamic_cave_distance, can_reach_cave
+)
+
+
+class TestCaveDistances(unittest.TestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+        self.player0 = Player("Alice")
+        self.player1 = Player("Bob")
+
+    def tearDown(self):
+        logger.enable("animalchess")
+
+    def board(self, notation: str):
+        return board_from_notation(notation, self.player0, self.player1)
+
+    def single_piece_board(self, animal: AnimalType, position: tuple[int, int]):
+        rows = []
+        for row in range(BOARD_HEIGHT):
+            if row == position[0]:
+                letter = ANIMAL_LETTERS[animal].upper()
+                cells = [str(position[1]) if position[1] > 0 else "", letter, str(BOARD_WIDTH - 1 - position[1]) if position[1] < BOARD_WIDTH - 1 else ""]
+                rows.append("".join(cells))
+            else:
+                rows.append(str(BOARD_WIDTH))
+        return self.board("/".join(rows) + " 0 -")
+
+    def reference_distance(self, animal: AnimalType, position: tuple[int, int], board=None) -> int:
+        # breadth-first search with the reference rules, player 0 moving alone
+        if board is None:
+            board = self.single_piece_board(animal, position)
+        queue = deque([(board, 0)])
+        seen = {position}
+        while len(queue) > 0:
+            board, distance = queue.popleft()
+            for destination in board.exhaustively_iterate_available_destinations(0, animal):
+                if destination == (8, 3):
+                    return distance + 1
+                if destination in seen:
+                    continue
+                seen.add(destination)
+                child = board.clone()
+                child.move_piece(0, animal, destination)
+                queue.append((child, distance + 1))
+        return UNREACHABLE
+
+    def test_static_tables_match_reference_rules(self):
+        for animal in [AnimalType.RAT, AnimalType.DOG, AnimalType.LION]:
+            for position in [(0, 0), (2, 1), (4, 0), (6, 5), (7, 3), (8, 6)]:
+                self.assertEqual(
+                    cave_distance(0, animal, position),
+                    self.reference_distance(animal, position),
+                    f"{animal.name} at {position}"
+                )
+
+    def test_static_tables(self):
+        self.assertEqual(cave_distance(0, AnimalType.DOG, (7, 3)), 1)
+        self.assertEqual(cave_distance(1, AnimalType.DOG, (1, 3)), 1)
+        self.assertEqual(cave_distance(0, AnimalType.DOG, (4, 1)), UNREACHABLE)     # water
+        self.assertEqual(cave_distance(0, AnimalType.RAT, (4, 1)), 6)
+        self.assertEqual(cave_distance(0, AnimalType.RAT, (0, 3)), UNREACHABLE)     # own cave
+        # the lion jumps over the river
+        self.assertLess(cave_distance(0, AnimalType.LION, (2, 1)), cave_distance(0, AnimalType.DOG, (2, 1)))
+        self.assertFalse(CAVE_DISTANCES[0][0].flags.writeable)
+
+    def test_dynamic_blocking(self):
+        board = self.board("7/7/1L5/7/7/7/7/7/7 0 -")
+        self.assertEqual(dynamic_cave_distance(board, 0, AnimalType.LION), cave_distance(0, AnimalType.LION, (2, 1)))
+
+        # rats in the water block the jumps, whoever they belong to
+        board = self.board("7/7/1L5/7/1rR4/7/7/7/7 0 -")
+        self.assertGreater(dynamic_cave_distance(board, 0, AnimalType.LION), cave_distance(0, AnimalType.LION, (2, 1)))
+
+        # the dog cannot pass the elephant guarding the trap, nor its own pieces
+        board = self.board("7/7/7/7/7/7/7/1WDe3/2C1c2 0 -")
+        self.assertEqual(cave_distance(0, AnimalType.DOG, (7, 2)), 2)
+        self.assertEqual(dynamic_cave_distance(board, 0, AnimalType.DOG), UNREACHABLE)
+        self.assertEqual(dynamic_cave_distance(board, 0, AnimalType.CAT), 1)
+
+        # weaker enemy pieces are captured on the way, stronger ones block it
+        self.assertEqual(cave_distance(0, AnimalType.DOG, (5, 3)), 3)
+        board = self.board("7/7/7/7/7/3D3/3c3/7/7 0 -")
+        self.assertEqual(dynamic_cave_distance(board, 0, AnimalType.DOG), 3)
+        board = self.board("7/7/7/7/7/3D3/3w3/7/7 0 -")
+        self.assertGreater(dynamic_cave_distance(board, 0, AnimalType.DOG), 3)
+        self.assertEqual(dynamic_cave_distance(board, 0, AnimalType.DOG, max_distance=5), UNREACHABLE)
+
+    def test_corrected_distances_match_reference_rules(self):
+        for notation in [
+            "L5T/1D3C1/R1P1W1E/7/7/7/e1w1p1r/1c3d1/t5l 0 -",
+            "7/7/1L5/7/1rR4/7/7/7/7 0 -",
+            "7/7/7/7/7/3D3/2cwe2/7/7 0 -",
+            "7/7/7/7/7/W2D3/2wPe2/2t1l2/7 0 -"
+        ]:
+            board = self.board(notation)
+            for piece_info in board._players_possessions[0].iterate_living_pieces():
+                animal = piece_info.piece.animal_type
+                self.assertEqual(
+                    dynamic_cave_distance(board, 0, animal),
+                    self.reference_distance(animal, piece_info.position, board),
+                    f"{animal.name} in {notation}"
+                )
+
+    def test_can_reach_cave(self):
+        board = self.board("7/7/7/7/7/7/3D3/7/7 0 -")
+        self.assertFalse(can_reach_cave(board, 0, 1))
+        self.assertTrue(can_reach_cave(board, 0, 2))
+        self.assertFalse(can_reach_cave(board, 1, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
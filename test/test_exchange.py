@@ -0,0 +1,85 @@
+
+import unittest
+
+from loguru import logger
+
+from animalchess.chess.player import Player
+from animalchess.chess.utils import AnimalType
+from animalchess.chess.notation import board_from_notation
+from animalchess.engine.evaluation import ANIMAL_VALUES
+
+
+class TestStaticExchange(unittest.TestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+        self.player0 = Player("Alice")
+        self.player1 = Player("Bob")
+
+    def tearDown(self):
+        logger.enable("animalchess")
+
+    def board(self, notation: str):
+        return board_from_notation(notation, self.player0, self.player1)
+
+    def test_undefended_capture(self):
+        board = self.board("7/7/7/7/7/7/2W4/2c4/7 0 -")
+        self.assertEqual(board.static_exchange((7, 2)), AnimalType.CAT.value)
+
+    def test_losing_recapture(self):
+        # the wolf takes the cat, the tiger takes the wolf
+        board = self.board("7/7/7/7/7/7/2W4/2c4/2t4 0 -")
+        self.assertEqual(board.static_exchange((7, 2)), AnimalType.CAT.value - AnimalType.WOLF.value)
+        # the dog cannot defend the wolf, so the tiger gains a wolf
+        board = self.board("7/7/7/7/7/7/2W4/2c4/2t4 1 -")
+        self.assertEqual(board.static_exchange((6, 2)), 0)
+        board = self.board("7/7/7/7/7/t6/W6/D6/7 1 -")
+        self.assertEqual(board.static_exchange((6, 0)), AnimalType.WOLF.value)
+
+    def test_least_valuable_attacker_first(self):
+        # the dog takes first, and the wolf does not recapture as it would be taken in turn
+        board = self.board("7/7/7/7/7/3w3/2DdW2/7/7 0 -")
+        self.assertEqual(board.static_exchange((6, 3)), AnimalType.DOG.value)
+        # taking with the wolf first loses it
+        self.assertEqual(
+            board.static_exchange((6, 3), animal=AnimalType.WOLF),
+            AnimalType.DOG.value - AnimalType.WOLF.value
+        )
+
+    def test_traps(self):
+        # any enemy in the own trap may be captured
+        board = self.board("7/2Ce3/7/7/7/7/7/7/7 0 -")
+        self.assertEqual(board.static_exchange((1, 3)), AnimalType.ELEPHANT.value)
+        # nothing in the enemy trap may be captured
+        board = self.board("7/7/7/7/7/7/7/2Ec3/7 0 -")
+        self.assertEqual(board.static_exchange((7, 3)), 0)
+
+    def test_rat_and_elephant(self):
+        board = self.board("7/7/7/7/7/7/Re5/7/7 0 -")
+        self.assertEqual(board.static_exchange((6, 1)), AnimalType.ELEPHANT.value)
+        board = self.board("7/7/7/7/7/7/Er5/7/7 0 -")
+        self.assertEqual(board.static_exchange((6, 1)), 0)
+
+    def test_blocked_jump(self):
+        # the lion jumps across the river unless a rat swims in the way
+        board = self.board("7/7/1L5/7/7/7/1w5/7/7 0 -")
+        self.assertEqual(board.static_exchange((6, 1)), AnimalType.WOLF.value)
+        board = self.board("7/7/1L5/7/1r5/7/1w5/7/7 0 -")
+        self.assertEqual(board.static_exchange((6, 1)), 0)
+
+    def test_values(self):
+        board = self.board("7/7/7/7/7/7/2W4/2c4/2t4 0 -")
+        self.assertEqual(
+            board.static_exchange((7, 2), values=ANIMAL_VALUES),
+            ANIMAL_VALUES[AnimalType.CAT] - ANIMAL_VALUES[AnimalType.WOLF]
+        )
+
+    def test_no_capture(self):
+        board = self.board("7/7/7/7/7/7/2W4/2c4/7 0 -")
+        self.assertEqual(board.static_exchange((6, 2)), 0)
+        self.assertEqual(board.static_exchange((5, 2)), 0)
+        board = self.board("7/7/7/7/7/7/2C4/2w4/7 0 -")
+        self.assertEqual(board.static_exchange((7, 2)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
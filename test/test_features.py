@@ -0,0 +1,50 @@
+
+import unittest
+
+import numpy as np
+
+from animalchess.chess.board import AnimalChessBoard
+from animalchess.chess.player import Player
+from animalchess.chess.utils import AnimalType, BOARD_HEIGHT, BOARD_WIDTH
+from animalchess.chess.features import NUM_PLANES, SIDE_TO_MOVE_PLANE, TERRAIN_PLANES_OFFSET, piece_plane_index
+
+
+class TestPlanes(unittest.TestCase):
+    def setUp(self):
+        self.board = AnimalChessBoard(Player("Alice"), Player("Bob"))
+
+    def test_starting_position(self):
+        planes = self.board.to_planes()
+        self.assertEqual(planes.shape, (NUM_PLANES, BOARD_HEIGHT, BOARD_WIDTH))
+        self.assertEqual(planes.dtype, np.float32)
+        self.assertEqual(planes[piece_plane_index(0, AnimalType.LION), 0, 0], 1)
+        self.assertEqual(planes[piece_plane_index(1, AnimalType.RAT), 6, 6], 1)
+        self.assertEqual(planes[:TERRAIN_PLANES_OFFSET].sum(), 16)
+        self.assertEqual(planes[TERRAIN_PLANES_OFFSET].sum(), 12)    # water
+        self.assertEqual(planes[SIDE_TO_MOVE_PLANE].sum(), 0)
+
+    def test_write_into_buffer(self):
+        out = np.full((NUM_PLANES, BOARD_HEIGHT, BOARD_WIDTH), 7, dtype=np.uint8)
+        self.board.move_piece(0, AnimalType.RAT, (3, 0))
+        planes = self.board.to_planes(out=out)
+        self.assertIs(planes, out)
+        self.assertEqual(out[piece_plane_index(0, AnimalType.RAT), 3, 0], 1)
+        self.assertEqual(out[piece_plane_index(0, AnimalType.RAT), 2, 0], 0)
+        self.assertTrue(np.all(out[SIDE_TO_MOVE_PLANE] == 1))
+        self.assertEqual(out[:TERRAIN_PLANES_OFFSET].sum(), 16)
+
+        with self.assertRaises(ValueError):
+            self.board.to_planes(out=np.zeros((3, BOARD_HEIGHT, BOARD_WIDTH)))
+
+    def test_batch(self):
+        other_board = self.board.clone()
+        other_board.move_piece(0, AnimalType.LION, (1, 0))
+        out = np.zeros((4, NUM_PLANES, BOARD_HEIGHT, BOARD_WIDTH), dtype=np.float32)
+        AnimalChessBoard.batch_to_planes([self.board, other_board], out=out)
+        np.testing.assert_array_equal(out[0], self.board.to_planes())
+        np.testing.assert_array_equal(out[1], other_board.to_planes())
+        self.assertEqual(out[2:].sum(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
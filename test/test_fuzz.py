@@ -0,0 +1,68 @@
+
+import unittest
+
+import numpy as np
+from loguru import logger
+
+from animalchess.chess.utils import AnimalType
+from animalchess.chess.packing import DEAD
+from animalchess.tools.fuzz import (
+    FuzzCase, MoveOutcome, MaskRules, ReferenceRules, generate_cases, check_case, shrink_case, fuzz
+)
+
+
+class NoCaptureRules(MaskRules):
+    # forgets to report captures
+    def play(self, case: FuzzCase) -> MoveOutcome:
+        outcome = super().play(case)
+        outcome.captured = None
+        return outcome
+
+
+class TestFuzz(unittest.TestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+
+    def tearDown(self):
+        logger.enable("animalchess")
+
+    def test_generated_cases(self):
+        cases = generate_cases(np.random.default_rng(0), 200)
+        self.assertEqual(len(cases), 200)
+        outcomes = [ReferenceRules().play(case) for case in cases]
+        self.assertTrue(any(outcome.legal for outcome in outcomes))
+        self.assertTrue(any(not outcome.legal for outcome in outcomes))
+        self.assertTrue(any(outcome.captured is not None for outcome in outcomes))
+
+    def test_mask_rules_agree_with_reference(self):
+        report = fuzz(MaskRules(), 500, seed=1, num_workers=1, chunk_size=100)
+        self.assertEqual(report.num_cases, 500)
+        self.assertEqual(report.failures, [])
+
+    def test_detects_and_shrinks_counterexamples(self):
+        report = fuzz(NoCaptureRules(), 500, seed=1, num_workers=1, max_failures=3)
+        self.assertGreaterEqual(len(report.failures), 1)
+        for failure in report.failures:
+            self.assertEqual(failure.differences, ["captured"])
+            # only the moving piece and its victim are left
+            living_pieces = [square for square in failure.case.position[:-1] if square != DEAD]
+            self.assertEqual(len(living_pieces), 2)
+            self.assertEqual(shrink_case(failure.case, NoCaptureRules()), failure.case)
+
+    def test_check_case(self):
+        # player 0's rat next to player 1's elephant
+        position = bytearray([DEAD] * 16 + [0])
+        position[AnimalType.RAT.value - 1] = 4 * 7
+        position[8 + AnimalType.ELEPHANT.value - 1] = 4 * 7 - 7
+        case = FuzzCase(bytes(position), 0, AnimalType.RAT, (3, 0))
+        self.assertEqual(check_case(case, MaskRules()), [])
+        self.assertEqual(check_case(case, NoCaptureRules()), ["captured"])
+
+    def test_worker_processes(self):
+        report = fuzz(MaskRules(), 200, seed=2, num_workers=2, chunk_size=50)
+        self.assertEqual(report.num_cases, 200)
+        self.assertEqual(report.failures, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
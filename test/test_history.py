@@ -0,0 +1,107 @@
+
+import unittest
+
+from animalchess.chess.board import AnimalChessBoard, PlayerPossession
+from animalchess.chess.player import Player
+from animalchess.chess.utils import AnimalType
+from animalchess.chess.hashing import compute_hash
+from animalchess.chess.history import PositionHistory, DrawRules
+
+
+class TestPositionHistory(unittest.TestCase):
+    def test_counts(self):
+        history = PositionHistory(capacity=4)
+        for position_hash in [1, 2, 1, 3]:
+            history.push(position_hash)
+        self.assertEqual(history.count(1), 2)
+        self.assertTrue(history.seen(3))
+        self.assertFalse(history.seen(4))
+        self.assertEqual(history.last_hash, 3)
+        self.assertEqual(history.plies, 3)
+
+        # the ring drops the oldest positions
+        history.push(4)
+        history.push(5)
+        self.assertEqual(history.count(1), 1)
+        self.assertFalse(history.seen(2))
+        self.assertEqual(history.count(5), 1)
+
+    def test_ring_grows_up_to_capacity(self):
+        history = PositionHistory(capacity=20)
+        self.assertEqual(len(history._hashes), 0)
+        for position_hash in range(1, 51):
+            history.push(position_hash)
+            self.assertEqual(history.last_hash, position_hash)
+            self.assertTrue(history.seen(position_hash))
+        self.assertEqual(len(history._hashes), 20)
+        self.assertEqual(sorted(history._counts), list(range(31, 51)))
+        self.assertFalse(history.seen(30))
+
+        # a copy holds only the hashes of the game so far
+        history = PositionHistory()
+        history.push(1)
+        self.assertEqual(len(history.copy()._hashes), 1)
+
+    def test_draw_rules(self):
+        history = PositionHistory()
+        for position_hash in [1, 2, 1, 2, 1]:
+            history.push(position_hash)
+        self.assertTrue(history.is_draw(DrawRules(max_repetitions=3)))
+        self.assertFalse(history.is_draw(DrawRules(max_repetitions=4)))
+
+        history.push(3, capture=True)
+        history.push(4)
+        self.assertEqual(history.plies_since_capture, 1)
+        self.assertTrue(history.is_draw(DrawRules(max_repetitions=None, max_plies_without_capture=1)))
+
+
+class TestBoardHistory(unittest.TestCase):
+    def setUp(self):
+        self.player0 = Player("Alice")
+        self.player1 = Player("Bob")
+
+    def test_incremental_hash(self):
+        board = AnimalChessBoard(self.player0, self.player1)
+        initial_hash = board.position_hash
+        for player_id, animal_type, destination in [
+            (0, AnimalType.LION, (1, 0)),
+            (1, AnimalType.LION, (7, 6)),
+            (0, AnimalType.LION, (0, 0)),
+            (1, AnimalType.LION, (8, 6))
+        ]:
+            self.assertTrue(board.move_piece(player_id, animal_type, destination))
+            self.assertEqual(board.position_hash, compute_hash(board._players_possessions, board.current_player_id))
+        self.assertEqual(board.position_hash, initial_hash)
+        self.assertEqual(board.history.count(initial_hash), 2)
+
+        board.move_piece(0, AnimalType.LION, (1, 0))
+        board.move_piece(1, AnimalType.LION, (7, 6))
+        board.move_piece(0, AnimalType.LION, (0, 0))
+        self.assertFalse(board.is_draw())
+        board.move_piece(1, AnimalType.LION, (8, 6))
+        self.assertTrue(board.is_draw())
+
+    def test_capture_resets_counter(self):
+        player0_possession = PlayerPossession(self.player0, 0, reset=False)
+        player1_possession = PlayerPossession(self.player1, 1, reset=False)
+        player0_possession.set_piece_info(AnimalType.LION, (4, 0))
+        player1_possession.set_piece_info(AnimalType.CAT, (5, 0))
+        player1_possession.set_piece_info(AnimalType.DOG, (8, 6))
+        board = AnimalChessBoard(
+            self.player0,
+            self.player1,
+            initial_players_possessions=[player0_possession, player1_possession]
+        )
+        self.assertTrue(board.move_piece(0, AnimalType.LION, (5, 0)))
+        self.assertEqual(board.history.plies_since_capture, 0)
+        self.assertEqual(board.position_hash, compute_hash(board._players_possessions, board.current_player_id))
+
+        cloned_board = board.clone()
+        self.assertEqual(cloned_board.position_hash, board.position_hash)
+        self.assertTrue(cloned_board.move_piece(1, AnimalType.DOG, (8, 5)))
+        self.assertEqual(cloned_board.history.plies, 2)
+        self.assertEqual(board.history.plies, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
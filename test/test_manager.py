@@ -0,0 +1,99 @@
+
+import unittest
+
+from animalchess.chess.player import Player
+from animalchess.chess.utils import AnimalType
+from animalchess.server.manager import GameManager, GameNotFoundError, NotYourTurnError, GameOverError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestGameManager(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.manager = GameManager(idle_timeout=10.0, clock=self.clock)
+        self.player0 = Player("Alice")
+        self.player1 = Player("Bob")
+
+    async def test_turn_enforcement(self):
+        game_id = self.manager.create_game(self.player0, self.player1)
+        self.assertEqual(self.manager.get_board(game_id).current_player_id, 0)
+
+        with self.assertRaises(NotYourTurnError):
+            await self.manager.submit_move(game_id, 1, AnimalType.RAT, (5, 6))
+
+        self.assertTrue(await self.manager.submit_move(game_id, 0, AnimalType.LION, (1, 0)))
+        self.assertEqual(self.manager.get_board(game_id).current_player_id, 1)
+
+        # an invalid move does not pass the turn
+        self.assertFalse(await self.manager.submit_move(game_id, 1, AnimalType.RAT, (3, 3)))
+        self.assertEqual(self.manager.get_board(game_id).current_player_id, 1)
+        self.assertTrue(await self.manager.submit_move(game_id, 1, AnimalType.RAT, (5, 6)))
+
+    async def test_game_over(self):
+        game_id = self.manager.create_game(self.player0, self.player1)
+        self.manager.get_board(game_id)._players_possessions[0].winned = True
+        with self.assertRaises(GameOverError):
+            await self.manager.submit_move(game_id, 0, AnimalType.LION, (1, 0))
+
+    async def test_unknown_game(self):
+        with self.assertRaises(GameNotFoundError):
+            await self.manager.submit_move("nonexistent", 0, AnimalType.LION, (1, 0))
+
+    async def test_idle_eviction(self):
+        game_id0 = self.manager.create_game(self.player0, self.player1, game_id="game0")
+        self.clock.now = 5.0
+        game_id1 = self.manager.create_game(self.player0, self.player1, game_id="game1")
+        self.clock.now = 12.0
+        await self.manager.submit_move(game_id0, 0, AnimalType.LION, (1, 0))
+
+        self.clock.now = 16.0
+        self.assertEqual(self.manager.evict_idle(), [game_id1])
+        self.assertIn(game_id0, self.manager)
+        self.assertNotIn(game_id1, self.manager)
+
+        self.clock.now = 30.0
+        self.assertEqual(self.manager.evict_idle(), [game_id0])
+        self.assertEqual(len(self.manager), 0)
+
+    async def test_max_games(self):
+        manager = GameManager(max_games=2, clock=self.clock)
+        game_ids = [manager.create_game(self.player0, self.player1) for _ in range(3)]
+        self.assertEqual(len(manager), 2)
+        self.assertNotIn(game_ids[0], manager)
+        self.assertIn(game_ids[2], manager)
+
+    async def test_busy_games_are_not_evicted(self):
+        manager = GameManager(idle_timeout=10.0, max_games=2, clock=self.clock)
+        game_ids = [manager.create_game(self.player0, self.player1) for _ in range(2)]
+        lock = manager._games[game_ids[0]].lock
+        await lock.acquire()
+
+        # the least recently active game has a move in flight, so the next one goes
+        game_id2 = manager.create_game(self.player0, self.player1)
+        self.assertIn(game_ids[0], manager)
+        self.assertNotIn(game_ids[1], manager)
+
+        self.clock.now = 30.0
+        self.assertEqual(manager.evict_idle(), [game_id2])
+        self.assertIn(game_ids[0], manager)
+
+        # no room can be made while every game has a move in flight
+        game_id3 = manager.create_game(self.player0, self.player1)
+        await manager._games[game_id3].lock.acquire()
+        with self.assertRaises(ValueError):
+            manager.create_game(self.player0, self.player1)
+        self.assertEqual(len(manager), 2)
+
+        lock.release()
+        self.assertEqual(manager.evict_idle(), [game_ids[0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
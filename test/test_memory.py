@@ -0,0 +1,68 @@
+
+import unittest
+
+from loguru import logger
+
+from animalchess.chess.board import AnimalChessBoard
+from animalchess.chess.player import Player
+from animalchess.chess.utils import AnimalType
+from animalchess.tools.memory import board_footprint, boards_footprint, measure_allocations, memory_report, format_memory_report
+from animalchess.tools.benchmark import run_timings
+
+
+class TestMemory(unittest.TestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+        self.player0 = Player("Alice")
+        self.player1 = Player("Bob")
+
+    def tearDown(self):
+        logger.enable("animalchess")
+
+    def test_board_footprint(self):
+        board = AnimalChessBoard(self.player0, self.player1)
+        footprint = board_footprint(board)
+        for value in [
+            footprint.board_objects, footprint.board_arrays, footprint.possessions,
+            footprint.piece_informations, footprint.pieces, footprint.histories
+        ]:
+            self.assertGreater(value, 0)
+
+        # independent boards only share constants such as the initial positions, and
+        # clones only add their own objects
+        # (measured together, as the size of instance dictionaries changes as CPython
+        # shares their keys between instances)
+        other_board = AnimalChessBoard(self.player0, self.player1)
+        footprint, other_footprint = board_footprint(board), board_footprint(other_board)
+        self.assertEqual(boards_footprint([board, other_board]).pieces, footprint.pieces + other_footprint.pieces)
+        self.assertLessEqual(boards_footprint([board, other_board]).total, footprint.total + other_footprint.total)
+        clones_footprint = boards_footprint([board, board.clone()])
+        self.assertEqual(clones_footprint.pieces, footprint.pieces)
+        self.assertLess(clones_footprint.total, 2 * footprint.total)
+
+        # a move on a clone copies the state it modifies
+        clone = board.clone()
+        clone.move_piece(0, AnimalType.RAT, (3, 0))
+        self.assertGreater(boards_footprint([board, clone]).pieces, footprint.pieces)
+
+    def test_measure_allocations(self):
+        self.assertGreaterEqual(measure_allocations(lambda _: bytearray(1000), [None] * 10), 1000)
+
+    def test_memory_report(self):
+        report = memory_report(20, self.player0, self.player1)
+        self.assertEqual(report.num_boards, 20)
+        self.assertEqual(report.boards.pieces, 20 * report.board.pieces)
+        self.assertGreater(report.clones_per_gb, report.boards_per_gb)
+        self.assertGreater(report.construction_allocation, report.clone_allocation)
+        self.assertIn("boards per GB", format_memory_report(report))
+
+    def test_timings(self):
+        timings = run_timings(5)
+        self.assertIn("clone", [timing.name for timing in timings])
+        for timing in timings:
+            self.assertEqual(timing.iterations, 5)
+            self.assertGreater(timing.nanoseconds_per_call, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
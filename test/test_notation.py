@@ -0,0 +1,100 @@
+
+import unittest
+
+from animalchess.chess.board import AnimalChessBoard, PlayerPossession
+from animalchess.chess.player import Player
+from animalchess.chess.utils import AnimalType
+from animalchess.chess.notation import board_to_notation, board_from_notation, STARTING_POSITION_NOTATION
+from animalchess.chess.notation import square_to_string, string_to_square, move_to_string, string_to_move
+
+
+class TestNotation(unittest.TestCase):
+    def setUp(self):
+        self.player0 = Player("Alice")
+        self.player1 = Player("Bob")
+
+    def test_starting_position(self):
+        board = AnimalChessBoard(self.player0, self.player1)
+        self.assertEqual(board_to_notation(board), STARTING_POSITION_NOTATION)
+
+    def test_squares(self):
+        self.assertEqual(square_to_string((0, 0)), "a1")
+        self.assertEqual(square_to_string((8, 6)), "g9")
+        self.assertEqual(string_to_square("d4"), (3, 3))
+        for square_string in ["h1", "a0", "a", "a10"]:
+            with self.assertRaises(ValueError):
+                string_to_square(square_string)
+
+    def test_moves(self):
+        board = AnimalChessBoard(self.player0, self.player1)
+        self.assertEqual(move_to_string(board, 0, AnimalType.RAT, (3, 0)), "a3a4")
+        self.assertEqual(string_to_move(board, 0, "a3a4"), (AnimalType.RAT, (3, 0)))
+        with self.assertRaises(ValueError):
+            string_to_move(board, 1, "a3a4")   # not a piece of player 1
+
+    def test_round_trip(self):
+        board = AnimalChessBoard(self.player0, self.player1)
+        self.assertTrue(board.move_piece(0, AnimalType.LION, (1, 0)))
+        self.assertTrue(board.move_piece(1, AnimalType.RAT, (5, 6)))
+        self.assertTrue(board.move_piece(0, AnimalType.RAT, (3, 0)))
+
+        notation = board_to_notation(board)
+        self.assertEqual(notation, "6T/LD3C1/2P1W1E/R6/7/6r/e1w1p2/1c3d1/t5l 1 -")
+        restored_board = board_from_notation(notation, self.player0, self.player1)
+        self.assertEqual(board_to_notation(restored_board), notation)
+        self.assertEqual(restored_board.current_player_id, 1)
+        self.assertEqual(restored_board._players_possessions[0].get_piece(AnimalType.RAT).position, (3, 0))
+
+    def test_captured_pieces(self):
+        board = board_from_notation("L6/7/7/7/7/7/7/7/6c 0 -", self.player0, self.player1)
+        self.assertTrue(board._players_possessions[0].get_piece(AnimalType.RAT).piece.dead)
+        self.assertFalse(board._players_possessions[1].get_piece(AnimalType.CAT).piece.dead)
+        self.assertIsNone(board.winner)
+
+    def test_winner(self):
+        board = board_from_notation("7/7/7/7/7/7/7/7/3R3 1 0", self.player0, self.player1)
+        self.assertTrue(board._players_possessions[0].winned)
+        self.assertEqual(board_to_notation(board), "7/7/7/7/7/7/7/7/3R3 1 0")
+
+    def test_invalid_notation(self):
+        for notation in [
+            "7/7/7 0 -",
+            "8/7/7/7/7/7/7/7/7 0 -",
+            "x6/7/7/7/7/7/7/7/7 0 -",
+            "LL5/7/7/7/7/7/7/7/7 0 -",
+            "7/7/7/7/7/7/7/7/7 2 -",
+            "7/7/7/7/7/7/7/7/7 0",
+            "07/7/7/7/7/7/7/7/7 0 -",
+            "7/7/7/7/1C5/7/7/7/7 0 -",     # on water
+            "3L3/7/7/7/7/7/7/7/7 0 -",     # in the own cave
+            "7/7/7/7/7/7/7/7/3L3 0 -",     # in the enemy cave without having won
+            "7/7/7/7/7/7/7/7/3L3 0 1"
+        ]:
+            with self.assertRaises(ValueError):
+                board_from_notation(notation, self.player0, self.player1)
+
+    def test_board_methods(self):
+        board = AnimalChessBoard(self.player0, self.player1)
+        self.assertTrue(board.move_piece(0, AnimalType.RAT, (3, 0)))
+        notation = board.to_notation()
+        self.assertEqual(notation, board_to_notation(board))
+        restored_board = AnimalChessBoard.from_notation(notation, self.player0, self.player1)
+        self.assertEqual(restored_board.to_bytes(), board.to_bytes())
+        self.assertEqual(restored_board.position_hash, board.position_hash)
+        self.assertEqual(set(restored_board.iterate_legal_moves(1)), set(board.iterate_legal_moves(1)))
+
+    def test_possession_from_positions(self):
+        possession = PlayerPossession.from_positions(self.player1, {AnimalType.CAT: (7, 1), AnimalType.LION: (8, 6)}, True)
+        self.assertEqual(list(possession._pieces), list(AnimalType))
+        self.assertEqual(
+            [piece_info.piece.animal_type for piece_info in possession.iterate_living_pieces()],
+            [AnimalType.CAT, AnimalType.LION]
+        )
+        self.assertIs(possession.get_piece(AnimalType.CAT).piece.player, self.player1)
+        self.assertTrue(possession.get_piece(AnimalType.RAT).piece.dead)
+        self.assertIsNone(possession.get_piece(AnimalType.RAT).position)
+        self.assertTrue(possession.winned)
+
+
+if __name__ == '__main__':
+    unittest.main()
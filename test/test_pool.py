@@ -0,0 +1,110 @@
+
+import unittest
+
+from loguru import logger
+
+from animalchess.chess.board import AnimalChessBoard
+from animalchess.chess.player import Player
+from animalchess.chess.utils import AnimalType
+from animalchess.chess.notation import board_from_notation
+from animalchess.chess.pool import BoardPool
+
+
+class TestBoardPool(unittest.TestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+        self.player0 = Player("Alice")
+        self.player1 = Player("Bob")
+        self.pool = BoardPool(self.player0, self.player1)
+
+    def tearDown(self):
+        logger.enable("animalchess")
+
+    def play(self, board: AnimalChessBoard) -> None:
+        # the rats advance and player 0's rat eats player 1's elephant
+        board.move_piece(0, AnimalType.RAT, (3, 0))
+        board.move_piece(1, AnimalType.RAT, (5, 6))
+        board.move_piece(0, AnimalType.RAT, (4, 0))
+        board.move_piece(1, AnimalType.RAT, (4, 6))
+        board.move_piece(0, AnimalType.RAT, (5, 0))
+        board.move_piece(1, AnimalType.RAT, (3, 6))
+        self.assertTrue(board.move_piece(0, AnimalType.RAT, (6, 0)))
+        self.assertTrue(board._players_possessions[1].get_piece(AnimalType.ELEPHANT).piece.dead)
+
+    def assertSameBoard(self, board: AnimalChessBoard, expected: AnimalChessBoard) -> None:
+        self.assertEqual(board.to_bytes(), expected.to_bytes())
+        self.assertEqual(board.position_hash, expected.position_hash)
+        self.assertEqual(board.get_board_array().tolist(), expected.get_board_array().tolist())
+        self.assertEqual(board.history.plies, 0)
+        self.assertEqual(board.history.count(board.position_hash), 1)
+        for player_id in [0, 1]:
+            self.assertEqual(list(board.iterate_legal_moves(player_id)), list(expected.iterate_legal_moves(player_id)))
+
+    def test_reuses_objects(self):
+        board = self.pool.acquire()
+        board_array = board._board
+        elephant = board._players_possessions[1].get_piece(AnimalType.ELEPHANT).piece
+        self.play(board)
+        self.pool.release(board)
+        self.assertEqual(len(self.pool), 1)
+
+        reset_board = self.pool.acquire()
+        self.assertIs(reset_board, board)
+        self.assertEqual(len(self.pool), 0)
+        self.assertIs(reset_board._board, board_array)
+        self.assertIs(reset_board._players_possessions[1].get_piece(AnimalType.ELEPHANT).piece, elephant)
+        self.assertFalse(elephant.dead)
+        self.assertSameBoard(reset_board, AnimalChessBoard(self.player0, self.player1))
+
+    def test_reset_to_position(self):
+        packed = board_from_notation("7/1D5/7/7/7/7/R6/e6/c6 1 -", self.player0, self.player1).to_bytes()
+        expected = AnimalChessBoard.from_bytes(packed, self.player0, self.player1)
+        board = self.pool.acquire()
+        self.play(board)
+        self.pool.release(board)
+        with self.pool.borrow(packed) as borrowed_board:
+            self.assertIs(borrowed_board, board)
+            self.assertSameBoard(borrowed_board, expected)
+            self.assertEqual(borrowed_board.current_player_id, 1)
+        self.assertEqual(len(self.pool), 1)
+
+    def test_reset_keeps_clones(self):
+        board = self.pool.acquire()
+        self.play(board)
+        clone = board.clone()
+        packed = clone.to_bytes()
+        self.pool.release(board)
+        self.pool.acquire().move_piece(0, AnimalType.LION, (1, 0))
+        self.assertEqual(clone.to_bytes(), packed)
+        self.assertEqual(clone.history.plies, 7)
+
+    def test_acquire_from_empty_pool(self):
+        packed = board_from_notation("7/1D5/7/7/7/7/R6/e6/c6 1 -", self.player0, self.player1).to_bytes()
+        self.assertEqual(self.pool.acquire(packed).to_bytes(), packed)
+        self.assertSameBoard(self.pool.acquire(), AnimalChessBoard(self.player0, self.player1))
+
+    def test_release(self):
+        pool = BoardPool(self.player0, self.player1, max_size=1)
+        pool.release(pool.acquire())
+        pool.release(AnimalChessBoard(self.player0, self.player1))
+        self.assertEqual(len(pool), 1)
+        with self.assertRaises(ValueError):
+            pool.release(AnimalChessBoard(Player("Carol"), self.player1))
+
+    def test_double_release(self):
+        board = self.pool.acquire()
+        self.pool.release(board)
+        with self.assertRaises(ValueError):
+            self.pool.release(board)
+        self.assertEqual(len(self.pool), 1)
+        self.assertIsNot(self.pool.acquire(), self.pool.acquire())
+
+        # once acquired again, it may be released again
+        board = self.pool.acquire()
+        self.pool.release(board)
+        self.assertIs(self.pool.acquire(), board)
+        self.pool.release(board)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+
+import unittest
+
+from loguru import logger
+
+from animalchess.chess.player import Player
+from animalchess.chess.utils import AnimalType
+from animalchess.chess.notation import board_from_notation
+from animalchess.engine.proof import ProofNumberSearch, PROVEN, DISPROVEN, UNKNOWN
+
+
+class TestProofNumberSearch(unittest.TestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+        self.player0 = Player("Alice")
+        self.player1 = Player("Bob")
+
+    def tearDown(self):
+        logger.enable("animalchess")
+
+    def board(self, notation: str):
+        return board_from_notation(notation, self.player0, self.player1)
+
+    def test_cave_entry_in_one(self):
+        # player 0's dog next to the enemy cave
+        board = self.board("7/7/7/7/7/7/7/3D3/4c2 0 -")
+        result = ProofNumberSearch(max_plies=1).solve(board)
+        self.assertEqual(result.status, PROVEN)
+        self.assertEqual(result.proof_tree().main_line(), [(AnimalType.DOG, (8, 3))])
+
+    def test_stats(self):
+        board = self.board("7/1c5/7/7/7/7/7/2D4/7 0 -")
+        search = ProofNumberSearch(max_plies=3)
+        result = search.solve(board)
+        self.assertEqual(search.stats.nodes, result.nodes)
+        self.assertGreater(search.stats.time, 0.0)
+
+        search.solve(self.board("7/7/7/7/7/7/7/3D3/4c2 0 -"))
+        self.assertLess(search.stats.nodes, result.nodes)
+
+    def test_forced_win_in_three(self):
+        # the dog reaches the trap next to the cave, and the far away cat cannot stop it
+        board = self.board("7/1c5/7/7/7/7/7/2D4/7 0 -")
+        result = ProofNumberSearch(max_plies=3).solve(board)
+        self.assertEqual(result.status, PROVEN)
+        tree = result.proof_tree()
+        self.assertEqual(len(tree.children), 1)
+        first_move = tree.children[0]
+        self.assertEqual(first_move.move, (AnimalType.DOG, (8, 2)))
+        # every reply of the cat is answered by entering the cave
+        self.assertGreater(len(first_move.children), 1)
+        for reply in first_move.children:
+            self.assertEqual([child.move for child in reply.children], [(AnimalType.DOG, (8, 3))])
+
+        self.assertEqual(ProofNumberSearch(max_plies=2).solve(board).status, DISPROVEN)
+
+    def test_defender_wins(self):
+        # player 1 enters the cave of player 0 before player 0 gets anywhere
+        board = self.board("7/3r3/7/7/7/7/7/7/D6 0 -")
+        self.assertEqual(ProofNumberSearch(max_plies=5).solve(board, attacker=0).status, DISPROVEN)
+        self.assertEqual(ProofNumberSearch(max_plies=1).solve(board, attacker=1).status, DISPROVEN)
+        self.assertEqual(ProofNumberSearch(max_plies=2).solve(board, attacker=1).status, PROVEN)
+
+    def test_limits(self):
+        board = self.board("L5T/1D3C1/R1P1W1E/7/7/7/e1w1p1r/1c3d1/t5l 0 -")
+        result = ProofNumberSearch(max_expansions=10).solve(board)
+        self.assertEqual(result.status, UNKNOWN)
+        self.assertEqual(result.expansions, 10)
+        self.assertIsNone(result.proof_tree())
+
+        result = ProofNumberSearch(max_expansions=None, max_tree_nodes=100).solve(board)
+        self.assertEqual(result.status, UNKNOWN)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+
+import io
+import time
+import unittest
+
+from loguru import logger
+
+from animalchess.engine.protocol import EngineProtocol
+from animalchess.engine.search import SearchEngine
+
+
+class TestEngineProtocol(unittest.TestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+
+    def tearDown(self):
+        logger.enable("animalchess")
+
+    def run_commands(self, commands: list[str]) -> list[str]:
+        output = io.StringIO()
+        EngineProtocol(io.StringIO("\n".join(commands) + "\n"), output).run()
+        return output.getvalue().splitlines()
+
+    def test_handshake(self):
+        lines = self.run_commands(["uci", "isready", "quit"])
+        self.assertEqual(lines[-2:], ["uciok", "readyok"])
+
+    def test_search(self):
+        lines = self.run_commands(["position startpos moves a3a4 g7g6", "go depth 2", "isready"])
+        info_lines = [line for line in lines if line.startswith("info depth")]
+        self.assertEqual(len(info_lines), 2)
+        self.assertIn(" pv ", info_lines[-1])
+        self.assertTrue(lines[-1].startswith("bestmove "))
+
+    def test_multipv(self):
+        lines = self.run_commands(["position startpos", "go depth 1 multipv 3", "isready"])
+        self.assertEqual(
+            [line.split()[:5] for line in lines if line.startswith("info depth")],
+            [["info", "depth", "1", "multipv", str(rank)] for rank in [1, 2, 3]]
+        )
+
+    def test_infinite(self):
+        output = io.StringIO()
+        protocol = EngineProtocol(io.StringIO(), output)
+        protocol.handle_line("position fen 7/7/7/7/7/7/7/2D4/7 0 -")   # a won position, which ends the search at once
+        protocol.handle_line("go infinite")
+        time.sleep(0.2)
+        self.assertFalse(any(line.startswith("bestmove") for line in output.getvalue().splitlines()))
+        protocol.handle_line("stop")
+        self.assertTrue(output.getvalue().splitlines()[-1].startswith("bestmove "))
+
+    def test_fen_and_winning_move(self):
+        lines = self.run_commands(["position fen 7/7/7/7/7/7/7/3D3/4c2 0 -", "go depth 2"])
+        self.assertTrue(lines[0].startswith("info depth 1 score mate 1 "))
+        self.assertEqual(lines[-1], "bestmove d8d9")
+
+    def test_invalid_position(self):
+        lines = self.run_commands(["position fen L5T/1D3C1/R1P1W1E/7/1c5/7/e1w1p1r/5d1/t5l 0 -", "go depth 1"])
+        self.assertTrue(lines[0].startswith("info string invalid position"))
+        self.assertTrue(lines[-1].startswith("bestmove "))   # from the previous position
+
+    def test_failed_search(self):
+        class FailingEngine(SearchEngine):
+            def search(self, *args, **kwargs):
+                raise ValueError("failure")
+
+        output = io.StringIO()
+        EngineProtocol(io.StringIO("go depth 1\n"), output, FailingEngine()).run()
+        lines = output.getvalue().splitlines()
+        self.assertIn("info string search failed: failure", lines)
+        self.assertEqual(lines[-1], "bestmove (none)")
+
+    def test_illegal_move(self):
+        lines = self.run_commands(["position startpos moves a3a5", "quit"])
+        self.assertEqual(lines, ["info string illegal move a3a5"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from loguru import logger
+
+from animalchess.chess.board import AnimalChessBoard, PlayerPossession
+from animalchess.chess.player import Player
+from animalchess.chess.utils import AnimalType
+from animalchess.chess.notation import board_to_notation
+from animalchess.chess.packing import PACKED_POSITION_SIZE
+from animalchess.chess.actions import NUM_ACTIONS
+from animalchess.rl.replay import ReplayBuffer
+
+
+class TestPacking(unittest.TestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+        self.player0 = Player("Alice")
+        self.player1 = Player("Bob")
+
+    def tearDown(self):
+        logger.enable("animalchess")
+
+    def test_round_trip(self):
+        player0_possession = PlayerPossession(self.player0, 0, reset=False)
+        player1_possession = PlayerPossession(self.player1, 1, reset=False)
+        player0_possession.set_piece_info(AnimalType.LION, (4, 0))
+        player0_possession.set_piece_info(AnimalType.RAT, (7, 3))
+        player1_possession.set_piece_info(AnimalType.CAT, (5, 0))
+        player1_possession.set_piece_info(AnimalType.DOG, (8, 6))
+        board = AnimalChessBoard(self.player0, self.player1, [player0_possession, player1_possession])
+        board.move_piece(0, AnimalType.LION, (5, 0))
+        board.move_piece(1, AnimalType.DOG, (8, 5))
+        board.move_piece(0, AnimalType.RAT, (8, 3))
+
+        packed = board.to_bytes()
+        self.assertEqual(len(packed), PACKED_POSITION_SIZE)
+        restored_board = AnimalChessBoard.from_bytes(packed, self.player0, self.player1)
+        self.assertEqual(board_to_notation(restored_board), board_to_notation(board))
+        self.assertEqual(restored_board.position_hash, board.position_hash)
+        self.assertEqual(restored_board.winner, 0)
+        self.assertTrue(restored_board._players_possessions[1].get_piece(AnimalType.CAT).piece.dead)
+
+
+class TestReplayBuffer(unittest.TestCase):
+    def setUp(self):
+        self.player0 = Player("Alice")
+        self.player1 = Player("Bob")
+        self.board = AnimalChessBoard(self.player0, self.player1)
+
+    def test_fifo(self):
+        buffer = ReplayBuffer(3, seed=0)
+        for outcome in range(5):
+            buffer.add(self.board, np.full(NUM_ACTIONS, outcome), float(outcome))
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(sorted(buffer._outcomes.tolist()), [2.0, 3.0, 4.0])
+
+        batch = buffer.sample(8)
+        self.assertEqual(batch.positions.shape, (8, PACKED_POSITION_SIZE))
+        self.assertTrue(np.all(batch.weights == 1))
+        restored_board = buffer.board(int(batch.indices[0]), self.player0, self.player1)
+        self.assertEqual(restored_board.to_bytes(), self.board.to_bytes())
+
+    def test_reservoir(self):
+        buffer = ReplayBuffer(10, eviction="reservoir", seed=0)
+        stored = [buffer.add(self.board, np.zeros(NUM_ACTIONS), float(outcome)) for outcome in range(100)]
+        self.assertEqual(len(buffer), 10)
+        self.assertTrue(any(index is None for index in stored))
+        self.assertGreater(buffer._outcomes.max(), 9.0)
+
+    def test_prioritized(self):
+        buffer = ReplayBuffer(4, seed=0)
+        for priority in [0.0, 0.0, 1.0, 0.0]:
+            buffer.add(self.board, np.zeros(NUM_ACTIONS), 0.0, priority=priority)
+        batch = buffer.sample(16, prioritized=True)
+        self.assertTrue(np.all(batch.indices == 2))
+
+        buffer.update_priorities([2, 3], [0.0, 1.0])
+        self.assertTrue(np.all(buffer.sample(16, prioritized=True).indices == 3))
+
+        # all zero priorities, or zeros after alpha, fall back to uniform sampling
+        buffer.update_priorities([0, 1, 2, 3], [0.0, 0.0, 0.0, 0.0])
+        for alpha in [1.0, 1000.0]:
+            batch = buffer.sample(64, prioritized=True, alpha=alpha)
+            self.assertEqual(set(batch.indices.tolist()), {0, 1, 2, 3})
+            self.assertTrue(np.all(np.isfinite(batch.weights)))
+
+    def test_save_and_load(self):
+        buffer = ReplayBuffer(5, seed=0)
+        for outcome in range(3):
+            buffer.add(self.board, np.full(NUM_ACTIONS, 0.5), float(outcome), priority=outcome + 1.0)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "buffer.npz")
+            buffer.save(path)
+            loaded_buffer = ReplayBuffer.load(path)
+        self.assertEqual(len(loaded_buffer), 3)
+        self.assertEqual(loaded_buffer.capacity, 5)
+        np.testing.assert_array_equal(loaded_buffer._positions[:3], buffer._positions[:3])
+        np.testing.assert_array_equal(loaded_buffer._priorities[:3], [1.0, 2.0, 3.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
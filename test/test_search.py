@@ -0,0 +1,202 @@
+
+import unittest
+import threading
+import time
+
+from loguru import logger
+
+from animalchess.chess.board import AnimalChessBoard, PlayerPossession
+from animalchess.chess.player import Player
+from animalchess.chess.utils import AnimalType
+from animalchess.chess.notation import board_from_notation
+from animalchess.engine.evaluation import WIN_SCORE
+from animalchess.engine.search import SearchEngine, SearchLimits, is_win_score
+from animalchess.engine.transposition import TranspositionTable, EXACT, LOWER_BOUND
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+        self.player0 = Player("Alice")
+        self.player1 = Player("Bob")
+        self.engine = SearchEngine()
+
+    def tearDown(self):
+        logger.enable("animalchess")
+
+    def test_legal_moves_match_exhaustive_iteration(self):
+        board = AnimalChessBoard(self.player0, self.player1)
+        for player_id in [0, 1]:
+            moves = set(board.iterate_legal_moves(player_id))
+            exhaustive_moves = {
+                (animal_type, destination)
+                for animal_type in AnimalType
+                for destination in board.exhaustively_iterate_available_destinations(player_id, animal_type)
+            }
+            self.assertEqual(moves, exhaustive_moves)
+
+    def test_finds_cave_entry(self):
+        player0_possession = PlayerPossession(self.player0, 0, reset=False)
+        player1_possession = PlayerPossession(self.player1, 1, reset=False)
+        player0_possession.set_piece_info(AnimalType.DOG, (7, 2))
+        player1_possession.set_piece_info(AnimalType.CAT, (1, 1))
+        board = AnimalChessBoard(
+            self.player0,
+            self.player1,
+            initial_players_possessions=[player0_possession, player1_possession]
+        )
+
+        # the dog stands on the enemy trap next to the cave
+        result = self.engine.search(board, SearchLimits(depth=3))
+        self.assertEqual(result.best_move, (AnimalType.DOG, (8, 2)))
+        self.assertTrue(is_win_score(result.score))
+        self.assertEqual(result.score, WIN_SCORE - 3)
+
+    def test_captures_hanging_piece(self):
+        player0_possession = PlayerPossession(self.player0, 0, reset=False)
+        player1_possession = PlayerPossession(self.player1, 1, reset=False)
+        player0_possession.set_piece_info(AnimalType.LION, (4, 0))
+        player0_possession.set_piece_info(AnimalType.CAT, (0, 6))
+        player1_possession.set_piece_info(AnimalType.TIGER, (5, 0))
+        player1_possession.set_piece_info(AnimalType.CAT, (8, 6))
+        board = AnimalChessBoard(
+            self.player0,
+            self.player1,
+            initial_players_possessions=[player0_possession, player1_possession]
+        )
+        result = self.engine.search(board, SearchLimits(depth=2))
+        self.assertEqual(result.best_move, (AnimalType.LION, (5, 0)))
+
+    def test_quiescence_avoids_defended_capture(self):
+        # the wolf may take the cat, but the tiger then takes the wolf
+        board = board_from_notation("7/1D5/7/7/7/7/W6/c6/t6 0 -", self.player0, self.player1)
+        capture = (AnimalType.WOLF, (7, 0))
+
+        horizon_engine = SearchEngine(quiescence_depth=0)
+        self.assertEqual(horizon_engine.search(board, SearchLimits(depth=1)).best_move, capture)
+        self.assertEqual(horizon_engine.stats.quiescence_nodes, 0)
+
+        result = self.engine.search(board, SearchLimits(depth=1))
+        self.assertNotEqual(result.best_move, capture)
+        self.assertGreater(self.engine.stats.quiescence_nodes, 0)
+
+    def test_quiescence_takes_defended_capture_when_winning(self):
+        # the cat recaptures, but losing the rat for the elephant still wins material
+        board = board_from_notation("7/1D5/7/7/7/7/R6/e6/c6 0 -", self.player0, self.player1)
+        result = self.engine.search(board, SearchLimits(depth=1))
+        self.assertEqual(result.best_move, (AnimalType.RAT, (7, 0)))
+
+    def test_limits(self):
+        board = AnimalChessBoard(self.player0, self.player1)
+        infos = []
+        result = self.engine.search(board, SearchLimits(depth=2), on_info=infos.append)
+        self.assertEqual(result.depth, 2)
+        self.assertEqual([info.depth for info in infos], [1, 2])
+        self.assertIn(result.best_move, set(board.iterate_legal_moves(0)))
+
+        result = self.engine.search(board, SearchLimits(nodes=300))
+        self.assertIsNotNone(result.best_move)
+        self.assertLess(result.nodes, 600)
+
+    def test_stop_between_searches(self):
+        board = AnimalChessBoard(self.player0, self.player1)
+        self.engine.stop()
+        self.assertEqual(self.engine.search(board, SearchLimits(depth=3)).depth, 3)
+
+        # the caller's stop event applies even if it is set before the search starts
+        stop_event = threading.Event()
+        stop_event.set()
+        result = self.engine.search(board, SearchLimits(depth=3), stop_event=stop_event)
+        self.assertEqual(result.depth, 0)
+        self.assertIsNotNone(result.best_move)
+        self.assertEqual(self.engine.search(board, SearchLimits(depth=3)).depth, 3)
+
+    def test_one_search_at_a_time(self):
+        board = AnimalChessBoard(self.player0, self.player1)
+        started, stop_event, results = threading.Event(), threading.Event(), []
+        thread = threading.Thread(
+            target=lambda: results.append(
+                self.engine.search(board, SearchLimits(), on_info=lambda info: started.set(), stop_event=stop_event)
+            )
+        )
+        thread.start()
+        started.wait(10)
+        with self.assertRaises(ValueError):
+            self.engine.search(board, SearchLimits(depth=1))
+        stop_event.set()
+        thread.join()
+
+        # the rejected search left the state of the running one alone
+        self.assertEqual(self.engine.stats.nodes, results[0].nodes)
+        self.assertEqual(self.engine.stats.iterations[-1].depth, results[0].depth)
+        self.assertEqual(self.engine.search(board, SearchLimits(depth=2)).depth, 2)
+
+    def test_guessing_the_reply_keeps_the_stats(self):
+        board = AnimalChessBoard(self.player0, self.player1)
+        self.engine.search(board, SearchLimits(depth=2))
+        stats = self.engine.stats
+        # a position the search has not seen, so that the reply comes from a shallow search
+        other_board = board_from_notation("7/1c5/7/7/7/7/7/2D4/7 1 -", self.player0, self.player1)
+        self.assertIsNone(self.engine.transposition_table.probe(other_board.position_hash))
+        self.assertIsNotNone(self.engine._guess_reply(other_board))
+        self.assertIsNotNone(self.engine.transposition_table.probe(other_board.position_hash))
+        self.assertIs(self.engine.stats, stats)
+
+    def test_transposition_table(self):
+        table = TranspositionTable(size=16)
+        self.assertIsNone(table.probe(3))
+        table.store(3, 2, 10, EXACT, (AnimalType.RAT, (3, 6)))
+        table.store(3, 1, 20, LOWER_BOUND, None)   # shallower results do not replace
+        entry = table.probe(3)
+        self.assertEqual((entry.depth, entry.score, entry.flag), (2, 10, EXACT))
+        self.assertIsNone(table.probe(19))         # same slot, different key
+        table.store(19, 1, 30, EXACT, None)
+        self.assertIsNone(table.probe(3))
+        self.assertEqual(table.probe(19).score, 30)
+
+    def test_ponder_hit(self):
+        board = AnimalChessBoard(self.player0, self.player1)
+        result = self.engine.search(board, SearchLimits(depth=2))
+        board.move_piece(0, *result.best_move)
+
+        reply = self.engine.start_pondering(board)
+        self.assertIn(reply, set(board.iterate_legal_moves(1)))
+        self.assertTrue(self.engine.pondering)
+        time.sleep(0.5)
+
+        board.move_piece(1, *reply)
+        result = self.engine.search(board, SearchLimits(depth=1))
+        self.assertFalse(self.engine.pondering)
+        self.assertGreaterEqual(result.depth, 1)
+        self.assertIn(result.best_move, set(board.iterate_legal_moves(0)))
+
+    def test_ponder_miss(self):
+        board = AnimalChessBoard(self.player0, self.player1)
+        result = self.engine.search(board, SearchLimits(depth=2))
+        board.move_piece(0, *result.best_move)
+
+        reply = self.engine.start_pondering(board)
+        time.sleep(0.2)
+        other_move = next(move for move in board.iterate_legal_moves(1) if move != reply)
+        board.move_piece(1, *other_move)
+        result = self.engine.search(board, SearchLimits(depth=1))
+        self.assertEqual(result.depth, 1)
+        self.assertIn(result.best_move, set(board.iterate_legal_moves(0)))
+
+    def test_stop_pondering(self):
+        board = AnimalChessBoard(self.player0, self.player1)
+        self.assertIsNone(self.engine.stop_pondering())
+        reply = self.engine.start_pondering(board)
+        self.assertIsNotNone(reply)
+        time.sleep(0.2)
+        result = self.engine.stop_pondering()
+        self.assertFalse(self.engine.pondering)
+        self.assertIsNotNone(result.best_move)
+
+        # the stop request of pondering does not leak into the next search
+        result = self.engine.search(board, SearchLimits(depth=2))
+        self.assertEqual(result.depth, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+
+import multiprocessing as mp
+import unittest
+
+import numpy as np
+from loguru import logger
+
+from animalchess.chess.board import AnimalChessBoard
+from animalchess.chess.player import Player
+from animalchess.chess.utils import AnimalType
+from animalchess.chess.pool import BoardPool
+from animalchess.chess.shared import SharedBoardState, SHARED_STATE_DTYPE
+
+
+def _read_shared_state(name: str, sequence: int, results) -> None:
+    state = SharedBoardState.attach(name)
+    try:
+        snapshot = state.read()
+        while snapshot.sequence < sequence:
+            snapshot = state.read()
+        results.put((snapshot.to_bytes(), snapshot.position_hash))
+    finally:
+        state.close()
+
+
+class TestSharedBoardState(unittest.TestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+        self.player0 = Player("Alice")
+        self.player1 = Player("Bob")
+        self.state = SharedBoardState()
+
+    def tearDown(self):
+        self.state.close()
+        self.state.unlink()
+        logger.enable("animalchess")
+
+    def test_publishes_moves(self):
+        board = AnimalChessBoard(self.player0, self.player1)
+        board.attach_shared_state(self.state)
+        self.assertEqual(self.state.read().to_bytes(), board.to_bytes())
+
+        reader = SharedBoardState.attach(self.state.name)
+        self.assertTrue(board.move_piece(0, AnimalType.RAT, (3, 0)))
+        self.assertFalse(board.move_piece(1, AnimalType.RAT, (8, 8)))
+        snapshot = reader.read()
+        self.assertEqual(snapshot.sequence, 4)
+        self.assertEqual(snapshot.to_bytes(), board.to_bytes())
+        self.assertEqual(snapshot.position_hash, board.position_hash)
+        self.assertEqual(snapshot.current_player_id, 1)
+        self.assertEqual(snapshot.squares[0, AnimalType.RAT.value - 1], 3 * 7 + 0)
+        self.assertFalse(snapshot.dead.any())
+        restored_board = snapshot.to_board(self.player0, self.player1)
+        self.assertEqual(restored_board.position_hash, board.position_hash)
+
+        # clones do not publish, and resets do
+        board.clone().move_piece(1, AnimalType.RAT, (5, 6))
+        self.assertEqual(reader.read().sequence, 4)
+        board.reset()
+        self.assertEqual(reader.read().to_bytes(), AnimalChessBoard(self.player0, self.player1).to_bytes())
+
+        board.detach_shared_state()
+        board.move_piece(0, AnimalType.RAT, (3, 0))
+        self.assertEqual(reader.read().sequence, 6)
+        reader.close()
+
+    def test_released_board_is_detached(self):
+        pool = BoardPool(self.player0, self.player1)
+        board = pool.acquire()
+        board.attach_shared_state(self.state)
+        board.move_piece(0, AnimalType.RAT, (3, 0))
+        pool.release(board)
+        next_board = pool.acquire()
+        self.assertIs(next_board, board)
+        next_board.move_piece(0, AnimalType.RAT, (3, 0))
+        self.assertEqual(self.state.read().sequence, 4)
+
+    def test_captures_and_wins(self):
+        board = AnimalChessBoard.from_notation("7/7/7/7/7/7/R6/e6/7 0 -", self.player0, self.player1)
+        board.attach_shared_state(self.state)
+        self.assertTrue(board.move_piece(0, AnimalType.RAT, (7, 0)))
+        snapshot = self.state.read()
+        self.assertTrue(snapshot.dead[1].all())
+        self.assertEqual(snapshot.squares[1, AnimalType.ELEPHANT.value - 1], 0xFF)
+        self.assertEqual(snapshot.to_bytes(), board.to_bytes())
+
+    def test_layout(self):
+        self.assertEqual(self.state.record.dtype, SHARED_STATE_DTYPE)
+        self.assertEqual(self.state.record["squares"].shape, (2, len(AnimalType)))
+        self.assertTrue(self.state.read().dead.all())
+
+    def test_torn_read(self):
+        self.state.record["sequence"] = 1   # a write in progress
+        with self.assertRaises(TimeoutError):
+            self.state.read(timeout=0.01)
+        with self.assertRaises(TimeoutError):
+            self.state.read()   # bounded by default
+
+    def test_other_process(self):
+        board = AnimalChessBoard(self.player0, self.player1)
+        board.attach_shared_state(self.state)
+        context = mp.get_context("spawn")
+        results = context.Queue()
+        process = context.Process(target=_read_shared_state, args=(self.state.name, 4, results))
+        process.start()
+        board.move_piece(0, AnimalType.RAT, (3, 0))
+        packed, position_hash = results.get(timeout=30)
+        process.join()
+        self.assertEqual(packed, board.to_bytes())
+        self.assertEqual(position_hash, board.position_hash)
+        np.testing.assert_array_equal(self.state.read().squares, np.frombuffer(packed[:-1], dtype=np.uint8).reshape(2, -1))
+
+
+if __name__ == '__main__':
+    unittest.main()
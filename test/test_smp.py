@@ -0,0 +1,74 @@
+
+import unittest
+
+from loguru import logger
+
+from animalchess.chess.board import AnimalChessBoard
+from animalchess.chess.player import Player
+from animalchess.engine.search import SearchLimits
+from animalchess.engine.smp import ParallelSearch, gil_enabled
+from animalchess.engine.transposition import StripedTranspositionTable, EXACT
+
+
+class TestParallelSearch(unittest.TestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+        self.board = AnimalChessBoard(Player("Alice"), Player("Bob"))
+
+    def tearDown(self):
+        logger.enable("animalchess")
+
+    def test_striped_table(self):
+        table = StripedTranspositionTable(size=16, num_stripes=4)
+        self.assertFalse(table.store(5, 1, 10, EXACT, None))
+        self.assertTrue(table.store(21, 1, 20, EXACT, None))
+        self.assertEqual(table.probe(21).score, 20)
+        table.clear()
+        self.assertIsNone(table.probe(21))
+
+    def test_threads(self):
+        search = ParallelSearch(num_workers=3, use_threads=True)
+        infos = []
+        result = search.search(self.board, SearchLimits(depth=3), on_info=infos.append)
+        self.assertEqual(result.depth, 3)
+        self.assertEqual([info.depth for info in infos], [1, 2, 3])
+        self.assertIn(result.best_move, set(self.board.iterate_legal_moves(0)))
+        self.assertGreater(result.nodes, infos[-1].nodes)
+
+    def test_processes(self):
+        search = ParallelSearch(num_workers=2, use_threads=False)
+        result = search.search(self.board, SearchLimits(depth=2))
+        self.assertEqual(result.depth, 2)
+        self.assertIn(result.best_move, set(self.board.iterate_legal_moves(0)))
+
+    def test_single_worker(self):
+        result = ParallelSearch(num_workers=1).search(self.board, SearchLimits(depth=2))
+        self.assertEqual(result.depth, 2)
+
+    def test_stop_between_searches(self):
+        for search in [ParallelSearch(num_workers=1), ParallelSearch(num_workers=2, use_threads=True)]:
+            search.stop()
+            self.assertEqual(search.search(self.board, SearchLimits(depth=3)).depth, 3)
+
+    def test_stats(self):
+        for use_threads in [True, False]:
+            search = ParallelSearch(num_workers=2, use_threads=use_threads)
+            result = search.search(self.board, SearchLimits(depth=2))
+            stats = search.stats
+            self.assertEqual(stats.nodes, result.nodes)
+            main_stats = search._engine.stats
+            self.assertGreater(stats.nodes, main_stats.nodes)
+            self.assertGreater(stats.transposition_misses, main_stats.transposition_misses)
+            self.assertGreaterEqual(sum(stats.cutoffs), sum(main_stats.cutoffs))
+            self.assertEqual([iteration.depth for iteration in stats.iterations], [1, 2])
+
+        search = ParallelSearch(num_workers=1)
+        result = search.search(self.board, SearchLimits(depth=2))
+        self.assertEqual(search.stats.nodes, result.nodes)
+
+    def test_default_mode(self):
+        self.assertEqual(ParallelSearch(num_workers=2).use_threads, not gil_enabled())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+
+import io
+import json
+import unittest
+
+from loguru import logger
+
+from animalchess.chess.board import AnimalChessBoard
+from animalchess.chess.player import Player
+from animalchess.engine.search import SearchEngine, SearchLimits
+from animalchess.engine.stats import SearchStats, IterationStats, write_json_lines
+
+
+class TestSearchStats(unittest.TestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+        self.board = AnimalChessBoard(Player("Alice"), Player("Bob"))
+
+    def tearDown(self):
+        logger.enable("animalchess")
+
+    def test_derived_statistics(self):
+        stats = SearchStats(nodes=1000, time=0.5, transposition_hits=30, transposition_misses=70)
+        stats.record_cutoff(0)
+        stats.record_cutoff(0)
+        stats.record_cutoff(3)
+        stats.iterations = [IterationStats(1, 20, 0.01), IterationStats(2, 100, 0.05)]
+        self.assertEqual(stats.nps, 2000)
+        self.assertAlmostEqual(stats.transposition_hit_rate, 0.3)
+        self.assertEqual(stats.cutoffs, [2, 0, 0, 1])
+        self.assertAlmostEqual(stats.first_move_cutoff_rate, 2 / 3)
+        self.assertAlmostEqual(stats.effective_branching_factor, 5.0)
+        self.assertEqual(SearchStats().effective_branching_factor, 0.0)
+
+    def test_search_stats(self):
+        engine = SearchEngine()
+        result = engine.search(self.board, SearchLimits(depth=3))
+        stats = engine.stats
+        self.assertEqual(stats.nodes, result.nodes)
+        self.assertEqual([iteration.depth for iteration in stats.iterations], [1, 2, 3])
+        self.assertEqual(sum(iteration.nodes for iteration in stats.iterations), stats.nodes)
+        self.assertGreater(stats.transposition_misses, 0)
+        self.assertGreater(sum(stats.cutoffs), 0)
+        self.assertGreater(stats.effective_branching_factor, 1.0)
+
+        # searching again hits the entries of the previous search
+        engine.search(self.board, SearchLimits(depth=3))
+        self.assertGreater(engine.stats.transposition_hits, 0)
+
+    def test_json_lines(self):
+        engine = SearchEngine()
+        all_stats = []
+        for depth in [1, 2]:
+            engine.search(self.board, SearchLimits(depth=depth))
+            all_stats.append(engine.stats)
+        output = io.StringIO()
+        write_json_lines(all_stats, output)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(len(records), 2)
+        self.assertEqual(len(records[1]["iterations"]), 2)
+        self.assertEqual(records[1]["nodes"], all_stats[1].nodes)
+        self.assertIn("nps", records[0])
+        self.assertIn("transposition_hit_rate", records[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
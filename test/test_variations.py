@@ -0,0 +1,77 @@
+
+import unittest
+
+from loguru import logger
+
+from animalchess.chess.board import AnimalChessBoard
+from animalchess.chess.player import Player
+from animalchess.chess.utils import AnimalType
+from animalchess.chess.notation import board_to_notation
+from animalchess.chess.variations import VariationTree
+
+
+class TestVariationTree(unittest.TestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+        self.board = AnimalChessBoard(Player("Alice"), Player("Bob"))
+        self.tree = VariationTree(self.board, cache_size=2)
+
+    def tearDown(self):
+        logger.enable("animalchess")
+
+    def test_main_line_and_sidelines(self):
+        root = self.tree.root
+        node1 = self.tree.add_move(root, AnimalType.RAT, (3, 0))
+        node2 = self.tree.add_move(node1, AnimalType.RAT, (5, 6))
+        sideline = self.tree.add_move(root, AnimalType.ELEPHANT, (3, 6))
+        self.assertIs(self.tree.add_move(root, AnimalType.RAT, (3, 0)), node1)
+        self.assertEqual(self.tree.main_line(), [root, node1, node2])
+        self.assertEqual(len(self.tree), 4)
+        self.assertEqual(list(self.tree.iterate_nodes()), [root, node1, node2, sideline])
+
+        self.tree.promote_variation(sideline)
+        self.assertEqual(self.tree.main_line(), [root, sideline])
+
+        self.tree.delete_variation(node1)
+        self.assertEqual(root.children, [sideline])
+        self.assertEqual(len(self.tree), 2)
+        with self.assertRaises(ValueError):
+            self.tree.delete_variation(root)
+
+    def test_boards_are_rebuilt(self):
+        moves = [
+            (AnimalType.RAT, (3, 0)), (AnimalType.RAT, (5, 6)),
+            (AnimalType.RAT, (4, 0)), (AnimalType.RAT, (4, 6)),
+            (AnimalType.RAT, (5, 0))
+        ]
+        node = self.tree.add_line(self.tree.root, moves)
+        expected_board = self.board.clone()
+        for animal, destination in moves:
+            expected_board.move_piece(expected_board.current_player_id, animal, destination)
+        self.assertEqual(node.position_hash, expected_board.position_hash)
+
+        # every node is rebuilt correctly, whatever the state of the small cache
+        for tree_node, path_length in zip(self.tree.main_line(), range(len(moves) + 1)):
+            expected_board = self.board.clone()
+            for animal, destination in moves[:path_length]:
+                expected_board.move_piece(expected_board.current_player_id, animal, destination)
+            board = self.tree.board(tree_node)
+            self.assertEqual(board.position_hash, tree_node.position_hash)
+            self.assertEqual(board_to_notation(board), board_to_notation(expected_board))
+
+        # the returned boards are copies
+        board = self.tree.board(node)
+        board.move_piece(board.current_player_id, AnimalType.RAT, (3, 6))
+        self.assertEqual(self.tree.board(node).position_hash, node.position_hash)
+
+    def test_illegal_move(self):
+        with self.assertRaises(ValueError):
+            self.tree.add_move(self.tree.root, AnimalType.RAT, (4, 0))
+        node = self.tree.add_move(self.tree.root, AnimalType.RAT, (3, 0))
+        with self.assertRaises(ValueError):     # player 0 already moved
+            self.tree.add_move(node, AnimalType.RAT, (4, 0))
+        self.assertEqual(node.path(), [self.tree.root, node])
+
+
+if __name__ == '__main__':
+    unittest.main()
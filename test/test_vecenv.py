@@ -0,0 +1,104 @@
+
+import gc
+import unittest
+from multiprocessing import shared_memory
+
+import numpy as np
+from loguru import logger
+
+from animalchess.chess.actions import NUM_ACTIONS, encode_action
+from animalchess.chess.features import NUM_PLANES
+from animalchess.chess.history import DrawRules
+from animalchess.chess.utils import AnimalType, BOARD_HEIGHT, BOARD_WIDTH
+from animalchess.rl.vecenv import AnimalChessVectorEnv, SubprocessVectorEnv, ILLEGAL_ACTION_REWARD
+
+
+def sample_actions(rng: np.random.Generator, masks: np.ndarray) -> np.ndarray:
+    return np.array([rng.choice(np.flatnonzero(mask)) for mask in masks])
+
+
+class TestVectorEnv(unittest.TestCase):
+    def setUp(self):
+        logger.disable("animalchess")
+
+    def tearDown(self):
+        logger.enable("animalchess")
+
+    def test_reset_and_step(self):
+        env = AnimalChessVectorEnv(3)
+        observations, masks = env.reset()
+        self.assertEqual(observations.shape, (3, NUM_PLANES, BOARD_HEIGHT, BOARD_WIDTH))
+        self.assertEqual(masks.shape, (3, NUM_ACTIONS))
+
+        rng = np.random.default_rng(0)
+        observations, rewards, dones, masks, infos = env.step(sample_actions(rng, masks))
+        self.assertEqual(len(infos), 3)
+        self.assertFalse(dones.any())
+        self.assertTrue(all(board.current_player_id == 1 for board in env.boards))
+
+    def test_illegal_action_and_auto_reset(self):
+        env = AnimalChessVectorEnv(2)
+        env.reset()
+        boards = list(env.boards)
+        legal_action = encode_action(AnimalType.RAT, 1)             # the rat steps forward
+        illegal_action = encode_action(AnimalType.LION, 0)          # off the board
+        _, rewards, dones, _, infos = env.step([legal_action, illegal_action])
+        self.assertEqual(rewards[1], ILLEGAL_ACTION_REWARD)
+        self.assertTrue(dones[1])
+        self.assertTrue(infos[1]["illegal_action"])
+        self.assertEqual(env.boards[1].current_player_id, 0)        # reset
+        self.assertEqual(env.boards[0].current_player_id, 1)
+        self.assertIs(env.boards[1], boards[1])     # reset in place
+        for board, mask in zip(env.boards, env._masks):
+            self.assertEqual(mask.tolist(), board.legal_move_mask().ravel().tolist())
+
+        # action IDs out of range are illegal actions too
+        _, rewards, dones, _, infos = env.step([-1, NUM_ACTIONS])
+        self.assertTrue(np.all(rewards == ILLEGAL_ACTION_REWARD))
+        self.assertTrue(dones.all())
+        self.assertTrue(all(info["illegal_action"] for info in infos))
+
+    def test_games_terminate(self):
+        env = AnimalChessVectorEnv(2, draw_rules=DrawRules(max_plies_without_capture=30))
+        _, masks = env.reset()
+        rng = np.random.default_rng(1)
+        finished = 0
+        for _ in range(200):
+            _, rewards, dones, masks, infos = env.step(sample_actions(rng, masks))
+            finished += dones.sum()
+            for done, reward, info in zip(dones, rewards, infos):
+                if done:
+                    self.assertEqual(reward, 0.0 if info["winner"] is None else 1.0)
+        self.assertGreater(finished, 0)
+
+
+class TestSubprocessVectorEnv(unittest.TestCase):
+    def test_matches_shapes(self):
+        with SubprocessVectorEnv(4, num_workers=2) as env:
+            observations, masks = env.reset()
+            self.assertEqual(observations.shape, (4, NUM_PLANES, BOARD_HEIGHT, BOARD_WIDTH))
+            self.assertTrue(masks.any(axis=1).all())
+            rng = np.random.default_rng(0)
+            for _ in range(3):
+                observations, rewards, dones, masks, infos = env.step(sample_actions(rng, masks))
+            self.assertEqual(len(infos), 4)
+            self.assertTrue((observations[:, -1] == 1).all())     # player 1 to move after three plies
+
+            env.reset()
+            _, rewards, dones, _, infos = env.step([0, NUM_ACTIONS, -1, 1000])
+            self.assertTrue(all(info.get("illegal_action", False) for info in infos[1:]))
+            self.assertTrue(dones[1:].all())
+
+    def test_blocks_freed_without_close(self):
+        env = SubprocessVectorEnv(2, num_workers=1)
+        env.reset()
+        block_names = [block.name for block in env._blocks.values()]
+        del env
+        gc.collect()
+        for block_name in block_names:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name=block_name)
+
+
+if __name__ == '__main__':
+    unittest.main()